@@ -0,0 +1,23 @@
+"""
+Offline benchmarks of the Inkycal render pipeline.
+
+Run all of them (or those whose name contains a pattern) with::
+
+    python -m benchmarks
+    python -m benchmarks -k getbuffer
+
+Save a baseline before a change and compare against it afterwards, the
+command fails if a benchmark got slower than the threshold::
+
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json --threshold 0.25
+
+The benchmarks only use recorded data from ``benchmarks/data`` and generated
+fixtures; connections to anything but localhost are refused. With
+pytest-benchmark installed, ``python -m pytest benchmarks`` runs the same
+benchmarks, otherwise pytest runs each of them once as a smoke test.
+"""
+from benchmarks.harness import Result, Skip, benchmark, names, prepare, register, run
+
+# Importing the suites registers their benchmarks
+from benchmarks import bench_canvas, bench_drivers, bench_ical, bench_palette, bench_pipeline  # noqa: E402,F401
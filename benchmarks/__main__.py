@@ -0,0 +1,41 @@
+"""Command line runner, see ``python -m benchmarks --help``."""
+import argparse
+import sys
+
+from benchmarks import harness
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Offline benchmarks of Inkycal")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    parser.add_argument("--repeat", type=int, default=5, help="timed samples per benchmark")
+    parser.add_argument("--min-time", type=float, default=harness.MIN_SAMPLE_TIME,
+                        help="minimum seconds per sample, short benchmarks are looped")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show log messages of Inkycal")
+    parser.add_argument("--save", metavar="FILE", help="store the results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="compare against results stored with --save")
+    parser.add_argument("--threshold", type=float, default=harness.DEFAULT_THRESHOLD,
+                        help="relative slow-down counted as regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    selected = harness.names(args.pattern)
+    if args.list:
+        print("\n".join(selected))
+        return 0
+
+    results = harness.run(selected, repeat=args.repeat, min_time=args.min_time, verbose=args.verbose)
+
+    if args.save:
+        harness.save(results, args.save)
+    if args.compare:
+        regressions = harness.compare(results, args.compare, args.threshold)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            return 1
+        print(f"\nNo regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
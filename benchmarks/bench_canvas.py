@@ -0,0 +1,59 @@
+"""Text and icon drawing of :class:`inkycal.utils.canvas.Canvas`, used by every module."""
+from benchmarks.harness import benchmark
+from inkycal.utils.canvas import Canvas, _load_font, _wrap
+from inkycal.utils.enums import FONTS
+
+SENTENCE = "Sprint planning with the whole team in the large meeting room on the second floor"
+
+
+def _canvas(size=(480, 200)):
+    return Canvas(size, FONTS.default, 16)
+
+
+@benchmark("canvas.write")
+def canvas_write():
+    canvas = _canvas()
+    return lambda: canvas.write((0, 0), (480, 30), "Mon 20 Oct  09:30  Team stand-up", alignment="left")
+
+
+@benchmark("canvas.write[wrapped]")
+def canvas_write_wrapped():
+    canvas = _canvas()
+    return lambda: canvas.write((0, 0), (240, 200), "\n".join([SENTENCE] * 3), alignment="left")
+
+
+@benchmark("canvas.write[autofit]")
+def canvas_write_autofit():
+    canvas = _canvas()
+    return lambda: canvas.write((0, 0), (480, 70), "18 Oct @ 09:30", autofit=True)
+
+
+@benchmark("canvas.text_wrap")
+def canvas_text_wrap():
+    canvas = _canvas()
+    return lambda: canvas.text_wrap(SENTENCE * 4, max_width=300)
+
+
+@benchmark("canvas.text_wrap[uncached]")
+def canvas_text_wrap_uncached():
+    font = _load_font(FONTS.default.value, 16)
+    return lambda: _wrap(font, SENTENCE * 4, 300)
+
+
+@benchmark("canvas.draw_icon")
+def canvas_draw_icon():
+    canvas = _canvas((480, 100))
+    # weather icons of a daily forecast, as drawn by the Weather module
+    icons = ["\uf00d", "\uf002", "\uf013", "\uf019", "\uf01b"]
+
+    def draw():
+        for column, icon in enumerate(icons):
+            canvas.draw_icon((column * 96, 0), (96, 60), icon)
+
+    return draw
+
+
+@benchmark("canvas.draw_icon[material]")
+def canvas_draw_icon_material():
+    canvas = _canvas((480, 100))
+    return lambda: canvas.draw_icon((0, 0), (40, 40), "\ue878", font=FONTS.material_icons)
@@ -0,0 +1,63 @@
+"""``getbuffer()`` of every display driver at its native resolution, the 12.48" transfer and calibration."""
+from functools import partial
+from unittest.mock import patch
+
+from benchmarks.fixtures import frame
+from benchmarks.harness import Skip, register
+
+from inkycal.display.display import import_driver
+from inkycal.display.supported_models import supported_models
+
+
+def _getbuffer(model: str):
+    try:
+        epd = import_driver(model).EPD()
+    except (ImportError, OSError) as error:
+        # e.g. the 12.48" drivers need their ARM shared library
+        raise Skip(f"{type(error).__name__}: {error}")
+    size = getattr(epd, "width", None), getattr(epd, "height", None)
+    if None in size:
+        size = supported_models[model]
+    image = frame(size)
+    return lambda: epd.getbuffer(image)
+
+
+for _model in sorted(supported_models):
+    register(f"getbuffer[{_model}]", partial(_getbuffer, _model))
+
+
+def _quad_panel_display(bulk: bool = True):
+    """Stream a frame to the four 12.48" controllers through the stub vendor library."""
+    from inkycal.display.drivers import epd_12_in_48, epdconfig_12_in_48
+
+    epd = epd_12_in_48.EPD()
+    buf = epd.getbuffer(frame((epd.width, epd.height)))
+    write_n_bytes = epdconfig_12_in_48._write_n_bytes if bulk else None
+
+    def display():
+        epdconfig_12_in_48.spi.reset()
+        with patch("time.sleep"), patch.object(epdconfig_12_in_48, "_write_n_bytes", write_n_bytes):
+            epd.display(buf)
+
+    return display
+
+
+register("display[epd_12_in_48]", _quad_panel_display)
+register("display[epd_12_in_48,per-byte]", partial(_quad_panel_display, bulk=False))
+
+
+def _calibrate(model: str):
+    """One calibration cycle through the fake backend, i.e. everything except the panel's refresh time."""
+    from inkycal.display import Display
+
+    display = Display(model)
+
+    def calibrate():
+        with patch("time.sleep"):
+            display.calibrate(cycles=1)
+
+    return calibrate
+
+
+register("calibrate[epd_7_in_5_v3_colour]", partial(_calibrate, "epd_7_in_5_v3_colour"))
+register("calibrate[epd_12_in_48_colour]", partial(_calibrate, "epd_12_in_48_colour"))
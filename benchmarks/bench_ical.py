@@ -0,0 +1,52 @@
+"""Parsing and expanding large iCalendars with :class:`inkycal.utils.ical_parser.iCalendar`."""
+import os
+from functools import partial
+
+import arrow
+
+from benchmarks.fixtures import ICS_CALENDAR, generate_ics
+from benchmarks.harness import register
+from inkycal.utils import ical_parser
+from inkycal.utils.ical_parser import iCalendar, event_store
+
+# (single events, recurring events) of the generated calendars
+SIZES = {"small": (200, 10), "large": (2000, 50)}
+
+
+def clear_caches():
+    """Forget all loaded, parsed and expanded calendars."""
+    event_store.clear()
+    with ical_parser._cache_lock:
+        ical_parser._parsed_calendars.clear()
+        ical_parser._expanded_windows.clear()
+
+
+def _write_ics(size: str) -> str:
+    path = os.path.abspath(f"{size}.ics")
+    events, recurring = SIZES[size]
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write(generate_ics(events, recurring))
+    return path
+
+
+def _get_events(path: str, cold: bool, days: int = 30):
+    def get_events():
+        if cold:
+            clear_caches()
+        ical = iCalendar()
+        ical.load_from_file(path)
+        now = arrow.now()
+        return ical.get_events(now.floor("day"), now.shift(days=days), "UTC")
+
+    return get_events
+
+
+def _generated(size: str, cold: bool):
+    return _get_events(_write_ics(size), cold)
+
+
+for _size in SIZES:
+    register(f"ical.get_events[{_size},cold]", partial(_generated, _size, True))
+    register(f"ical.get_events[{_size},warm]", partial(_generated, _size, False))
+
+register("ical.get_events[recorded,cold]", partial(_get_events, ICS_CALENDAR, True))
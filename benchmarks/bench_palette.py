@@ -0,0 +1,19 @@
+"""Palette mapping of images (Image and Slideshow modules, parallel displays)."""
+from functools import partial
+
+from benchmarks.fixtures import frame
+from benchmarks.harness import register
+from inkycal.utils.inky_image import image_to_palette
+
+PALETTES = ("bw", "bwr", "bwy", "16gray")
+
+
+def _image_to_palette(palette: str, dither: bool = True):
+    image = frame((480, 800))
+    return lambda: image_to_palette(image, palette, dither=dither)
+
+
+for _palette in PALETTES:
+    register(f"image_to_palette[{_palette}]", partial(_image_to_palette, _palette))
+
+register("image_to_palette[bwr,no-dither]", partial(_image_to_palette, "bwr", False))
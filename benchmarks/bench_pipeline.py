@@ -0,0 +1,90 @@
+"""The render pipeline of :class:`inkycal.main.Inkycal` and the modules, with recorded data."""
+import os
+from contextlib import ExitStack
+from functools import partial
+from unittest.mock import patch
+
+from benchmarks.fixtures import frame, offline, owm_get_json, owm_responses, settings
+from benchmarks.harness import benchmark, register
+
+from inkycal.main import Inkycal
+
+MODULES = ("Weather", "Agenda", "Calendar", "Feeds")
+
+
+def recorded_data():
+    """Patch everything that would reach the network, see :func:`benchmarks.fixtures.offline`."""
+    stack = ExitStack()
+    stack.enter_context(offline())
+    stack.enter_context(patch("inkycal.utils.openweathermap_wrapper.get_json_from_url",
+                              owm_get_json(owm_responses())))
+    return stack
+
+
+def _inkycal(render: bool = False) -> Inkycal:
+    inkycal = Inkycal(settings(os.getcwd()), render=render)
+    inkycal.write_debug_images = False
+    inkycal.info = "18 Oct @ 09:30  "
+    return inkycal
+
+
+def _module_frames(inkycal: Inkycal) -> dict:
+    """Synthetic module images with the size of every configured module."""
+    images = {}
+    for number in range(1, inkycal._module_number):
+        module = getattr(inkycal, f"module_{number}")
+        size = int(module.width), int(module.height)
+        images[number] = (frame(size, seed=number), frame(size, seed=-number))
+    return images
+
+
+@benchmark("inkycal._assemble")
+def assemble():
+    inkycal = _inkycal()
+    inkycal._module_images = _module_frames(inkycal)
+    return inkycal._assemble
+
+
+@benchmark("inkycal._optimize_im")
+def optimize_im():
+    image = frame((480, 800))
+    return lambda: Inkycal._optimize_im(image)
+
+
+def cycle(memoize: bool = True):
+    """Modules, assembly and rendering with the image_file driver, like one run() cycle.
+
+    Modules with unchanged inputs reuse their images unless ``memoize`` is false.
+    """
+    inkycal = _inkycal(render=True)
+
+    def run_cycle():
+        if not memoize:
+            inkycal._module_memo.clear()
+        with recorded_data():
+            failed = inkycal.process_modules()
+        assert not failed, f"Modules {failed} failed"
+        inkycal._assemble()
+        inkycal.Display.render(*inkycal._display_frames())
+
+    return run_cycle
+
+
+register("inkycal.cycle[image_file]", cycle)
+register("inkycal.cycle[image_file,regenerate]", partial(cycle, memoize=False))
+
+
+def _module(name: str):
+    inkycal = _inkycal()
+    number = MODULES.index(name) + 1
+    module = getattr(inkycal, f"module_{number}")
+
+    def generate():
+        with recorded_data():
+            return module.generate_image()
+
+    return generate
+
+
+for _name in MODULES:
+    register(f"module[{_name}]", partial(_module, _name))
@@ -0,0 +1,10 @@
+"""Shared pytest setup of the benchmarks"""
+import pytest
+
+from benchmarks import harness
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fake_hardware():
+    with harness.fake_hardware():
+        yield
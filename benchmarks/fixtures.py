@@ -0,0 +1,175 @@
+"""
+Recorded and generated inputs for the benchmarks.
+
+``data/`` holds recorded responses (OpenWeatherMap current weather and
+forecast, an RSS feed and an iCalendar). Large iCalendars are generated with
+:func:`generate_ics`. Nothing in here touches the network: :func:`offline`
+refuses every non-loopback connection while a benchmark runs.
+"""
+import json
+import os
+import random
+import socket
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from PIL import Image, ImageDraw
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+RSS_FEED = os.path.join(DATA_PATH, "feed.rss")
+ICS_CALENDAR = os.path.join(DATA_PATH, "calendar.ics")
+
+_LOOPBACK = ("127.0.0.1", "::1", "localhost")
+
+
+def _load_json(name: str):
+    with open(os.path.join(DATA_PATH, name), "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _shift(data, offset: int, keys=("dt", "sunrise", "sunset")):
+    """Add ``offset`` seconds to all timestamps in a (nested) OWM response."""
+    if isinstance(data, dict):
+        return {key: value + offset if key in keys and isinstance(value, int) else _shift(value, offset, keys)
+                for key, value in data.items()}
+    if isinstance(data, list):
+        return [_shift(value, offset, keys) for value in data]
+    return data
+
+
+def owm_responses() -> dict:
+    """Recorded OWM responses by endpoint, moved so the forecast starts at the current hour."""
+    forecast = _load_json("owm_forecast.json")
+    now = int(time.time()) // 3600 * 3600
+    offset = now - forecast["list"][0]["dt"]
+    return {"weather": _shift(_load_json("owm_current.json"), offset), "forecast": _shift(forecast, offset)}
+
+
+def owm_get_json(responses: dict):
+    """Replacement for ``openweathermap_wrapper.get_json_from_url`` serving ``responses``."""
+
+    def get_json(url: str):
+        endpoint = url.split("?", 1)[0].rsplit("/", 1)[-1]
+        if endpoint == "onecall":
+            return {"current": {"uvi": 2.4}}
+        return responses[endpoint]
+
+    return get_json
+
+
+def generate_ics(events: int = 2000, recurring: int = 50, days: int = 365, seed: int = 1) -> str:
+    """Generate an iCalendar with single and recurring events around today.
+
+    Args:
+        events: Number of single events, spread over ``days`` before and after today.
+        recurring: Number of daily, weekly and monthly recurring events.
+        days: Half the width of the time span in days.
+        seed: Seed of the random generator, the output is deterministic for a given day.
+    """
+    rng = random.Random(seed)
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    stamp = today.strftime("%Y%m%dT%H%M%SZ")
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//Inkycal//Benchmark generator//EN"]
+
+    def event(uid, start, end, summary, extra=()):
+        lines.extend(["BEGIN:VEVENT", f"UID:{uid}@inkycal.example", f"DTSTAMP:{stamp}", *start, *end,
+                      f"SUMMARY:{summary}", *extra, "END:VEVENT"])
+
+    for number in range(events):
+        start = today + timedelta(days=rng.randint(-days, days), minutes=15 * rng.randint(24, 84))
+        if rng.random() < 0.1:
+            event(f"single-{number}", [f"DTSTART;VALUE=DATE:{start:%Y%m%d}"],
+                  [f"DTEND;VALUE=DATE:{start + timedelta(days=rng.randint(1, 3)):%Y%m%d}"],
+                  f"All-day event {number}")
+        else:
+            end = start + timedelta(minutes=15 * rng.randint(1, 12))
+            event(f"single-{number}", [f"DTSTART:{start:%Y%m%dT%H%M%SZ}"], [f"DTEND:{end:%Y%m%dT%H%M%SZ}"],
+                  f"Meeting {number}", [f"LOCATION:Room {rng.randint(1, 40)}"])
+
+    rules = ("FREQ=DAILY", "FREQ=WEEKLY;BYDAY=MO,WE,FR", "FREQ=WEEKLY;INTERVAL=2", "FREQ=MONTHLY;BYMONTHDAY=15")
+    for number in range(recurring):
+        start = today - timedelta(days=rng.randint(0, days), minutes=-15 * rng.randint(28, 72))
+        end = start + timedelta(minutes=30)
+        event(f"recurring-{number}", [f"DTSTART:{start:%Y%m%dT%H%M%SZ}"], [f"DTEND:{end:%Y%m%dT%H%M%SZ}"],
+              f"Series {number}", [f"RRULE:{rules[number % len(rules)]}"])
+
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines) + "\r\n"
+
+
+def frame(size, seed: int = 1) -> Image.Image:
+    """A deterministic frame with text, lines, filled shapes and a grey gradient."""
+    rng = random.Random(seed)
+    width, height = size
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    for y in range(0, height // 3, 4):
+        grey = 255 * y // max(1, height // 3)
+        draw.line((0, y, width // 2, y), fill=(grey, grey, grey), width=4)
+    for _ in range(40):
+        left, upper = rng.randrange(width), rng.randrange(height)
+        box = (left, upper, min(width, left + rng.randint(4, 120)), min(height, upper + rng.randint(4, 80)))
+        colour = rng.choice(["black", "red", (128, 128, 128)])
+        if rng.random() < 0.5:
+            draw.rectangle(box, outline=colour, width=2)
+        else:
+            draw.ellipse(box, fill=colour)
+    for line, y in enumerate(range(height // 3, height, 18)):
+        draw.text((8, y), f"{line:02d} The quick brown fox jumps over the lazy dog 0123456789", fill="black")
+    return image
+
+
+@contextmanager
+def offline():
+    """Refuse all non-loopback connections and report the network as available."""
+
+    from inkycal.utils.functions import network_available
+
+    connect = socket.socket.connect
+
+    def guarded_connect(sock, address):
+        if sock.family == getattr(socket, "AF_UNIX", None) or address[0] in _LOOPBACK:
+            return connect(sock, address)
+        raise OSError(f"Network access to {address} is disabled during benchmarks")
+
+    with ExitStack() as stack:
+        stack.enter_context(patch.object(socket.socket, "connect", guarded_connect))
+        stack.enter_context(patch.object(network_available, "probe", return_value=True))
+        network_available.invalidate()
+        yield
+    network_available.invalidate()
+
+
+def settings(path: str, model: str = "image_file", api_key: str = "benchmark") -> str:
+    """Write a settings.json with Weather, Agenda, Calendar and Feeds using the recorded data.
+
+    Returns:
+        str: the path of the written file.
+    """
+    common = {"padding_x": 10, "padding_y": 10, "fontsize": 12, "language": "en"}
+    modules = [
+        {"name": "Weather", "config": {
+            "size": [480, 100], "api_key": api_key, "location": "2825297", "round_temperature": True,
+            "round_windspeed": True, "forecast_interval": "daily", "units": "metric", "hour_format": 24,
+            "use_beaufort": False, **common}},
+        {"name": "Agenda", "config": {
+            "size": [480, 220], "ical_urls": None, "ical_files": ICS_CALENDAR, "date_format": "ddd D MMM",
+            "time_format": "HH:mm", **common}},
+        {"name": "Calendar", "config": {
+            "size": [480, 300], "week_starts_on": "Monday", "show_events": True, "ical_urls": None,
+            "ical_files": ICS_CALENDAR, "date_format": "D MMM", "time_format": "HH:mm", **common}},
+        {"name": "Feeds", "config": {
+            "size": [480, 110], "feed_urls": RSS_FEED, "shuffle_feeds": False, **common}},
+    ]
+    for position, module in enumerate(modules, start=1):
+        module["position"] = position
+    payload = {"model": model, "update_interval": 5, "orientation": 0, "info_section": True,
+               "info_section_height": 70, "calibration_hours": [0, 12, 18], "border_around_modules": True,
+               "modules": modules}
+    settings_path = os.path.join(path, "settings.json")
+    with open(settings_path, "w", encoding="utf-8") as file:
+        json.dump(payload, file, indent=2)
+    return settings_path
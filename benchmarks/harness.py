@@ -0,0 +1,182 @@
+"""
+Minimal benchmark harness used by ``python -m benchmarks``.
+
+A benchmark is registered with a *setup* function which prepares everything
+that should not be timed and returns the callable to time::
+
+    @benchmark("canvas.write")
+    def canvas_write():
+        canvas = Canvas((400, 100), FONTS.default, 16)
+        return lambda: canvas.write((0, 0), (400, 100), "Hello")
+
+Setups raise :class:`Skip` when a benchmark cannot run on this machine,
+e.g. a driver which needs a native library.
+"""
+import io
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+# Seconds each timed sample should at least take, short calls are looped
+MIN_SAMPLE_TIME = 0.02
+
+# A benchmark counts as regressed if its median got this much slower
+DEFAULT_THRESHOLD = 0.25
+
+_registry: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+class Skip(Exception):
+    """Raised by a setup function if the benchmark cannot run here."""
+
+
+class Result(NamedTuple):
+    name: str
+    loops: int
+    samples: List[float]
+
+    @property
+    def best(self) -> float:
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+
+def register(name: str, setup: Callable[[], Callable[[], object]]) -> None:
+    """Register ``setup`` under ``name``, see :func:`benchmark`."""
+    if name in _registry:
+        raise ValueError(f"Benchmark {name} is registered twice")
+    _registry[name] = setup
+
+
+def benchmark(name: str):
+    """Decorator registering a setup function as a benchmark."""
+
+    def decorator(setup):
+        register(name, setup)
+        return setup
+
+    return decorator
+
+
+def names(pattern: Optional[str] = None) -> List[str]:
+    """Names of all registered benchmarks, optionally only those containing ``pattern``."""
+    return sorted(name for name in _registry if not pattern or pattern in name)
+
+
+def prepare(name: str) -> Callable[[], object]:
+    """Run the setup of a benchmark and return the callable to time."""
+    return _registry[name]()
+
+
+@contextmanager
+def scratch_directory():
+    """Run in an empty temporary directory, drivers like ``image_file`` write to the cwd."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="inkycal-bench-") as path:
+        os.chdir(path)
+        try:
+            yield path
+        finally:
+            os.chdir(cwd)
+
+
+@contextmanager
+def fake_hardware():
+    """Select the hardware-free GPIO/SPI backend, the benchmarks never drive a real panel.
+
+    ``epdconfig`` picks its backend when it is first imported, which happens
+    when the first driver benchmark is prepared.
+    """
+    previous = os.environ.get("INKYCAL_EPD_BACKEND")
+    os.environ["INKYCAL_EPD_BACKEND"] = "fake"
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ["INKYCAL_EPD_BACKEND"]
+        else:
+            os.environ["INKYCAL_EPD_BACKEND"] = previous
+
+
+def measure(name: str, function: Callable[[], object], repeat: int = 5,
+            min_time: float = MIN_SAMPLE_TIME) -> Result:
+    """Time ``function``, looping it so every sample takes at least ``min_time`` seconds."""
+    # The first call is a warm-up and calibrates the number of loops
+    start = time.perf_counter()
+    function()
+    single = time.perf_counter() - start
+    loops = max(1, int(min_time / single) if single > 0 else 1)
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        samples.append((time.perf_counter() - start) / loops)
+    return Result(name, loops, samples)
+
+
+@contextmanager
+def quiet():
+    """Silence log records below warnings and the progress printed by the display drivers."""
+    logging.disable(logging.INFO)
+    try:
+        with redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def run(selected: Iterable[str], repeat: int = 5, min_time: float = MIN_SAMPLE_TIME,
+        report: Callable[[str], None] = print, verbose: bool = False) -> Dict[str, Result]:
+    """Run the selected benchmarks and return their results by name."""
+    results = {}
+    with fake_hardware(), scratch_directory():
+        for name in selected:
+            try:
+                with nullcontext() if verbose else quiet():
+                    result = measure(name, prepare(name), repeat, min_time)
+            except Skip as reason:
+                report(f"{name:<44} skipped ({reason})")
+                continue
+            results[name] = result
+            report(f"{name:<44} {result.median * 1000:>10.3f} ms  (best {result.best * 1000:.3f} ms, "
+                   f"{result.loops} loops)")
+    return results
+
+
+def save(results: Dict[str, Result], path: str) -> None:
+    """Store the results as JSON, e.g. as a baseline for :func:`compare`."""
+    payload = {name: {"median": result.median, "best": result.best, "loops": result.loops}
+               for name, result in results.items()}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(payload, file, indent=2, sort_keys=True)
+
+
+def compare(results: Dict[str, Result], baseline_path: str, threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Compare results against a saved baseline.
+
+    Returns:
+        list: One line per benchmark whose median is more than ``threshold``
+        (relative) slower than in the baseline.
+    """
+    with open(baseline_path, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["median"]
+        if before and result.median > before * (1 + threshold):
+            regressions.append(f"{name}: {before * 1000:.3f} ms -> {result.median * 1000:.3f} ms "
+                               f"(+{(result.median / before - 1) * 100:.0f}%)")
+    return regressions
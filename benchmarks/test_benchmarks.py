@@ -0,0 +1,29 @@
+"""
+Runs every benchmark through pytest.
+
+With pytest-benchmark installed its ``benchmark`` fixture does the timing
+(``--benchmark-save``, ``--benchmark-compare``, ...), otherwise every
+benchmark is run once so the suite does not silently break.
+"""
+import pytest
+
+from benchmarks import harness
+
+
+@pytest.fixture(scope="module", autouse=True)
+def scratch_directory():
+    with harness.scratch_directory() as path:
+        yield path
+
+
+@pytest.mark.parametrize("name", harness.names())
+def test_benchmark(name, request):
+    try:
+        function = harness.prepare(name)
+    except harness.Skip as reason:
+        pytest.skip(str(reason))
+
+    if request.config.pluginmanager.hasplugin("benchmark"):
+        request.getfixturevalue("benchmark")(function)
+    else:
+        function()
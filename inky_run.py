@@ -145,6 +145,17 @@ async def clear_display():
     print("finished!")
 
 
+def profile_startup() -> str:
+    """Report the import cost of a cold start with the configured modules"""
+    from inkycal.utils.startup_profile import configured_imports, format_report, profile_imports, startup_statement
+
+    try:
+        settings_data = json.loads(_resolve_settings_path().read_text(encoding="utf-8"))
+    except Exception:
+        settings_data = {}
+    return format_report(profile_imports(startup_statement(configured_imports(settings_data))))
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run Inkycal")
     parser.add_argument(
@@ -153,11 +164,19 @@ def parse_args() -> argparse.Namespace:
         default="run",
         help="run: normal loop, dry-run: one cycle without rendering, clear: one display calibration",
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="report the per-import cost of a cold start with the configured modules and exit",
+    )
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
+    if args.profile_startup:
+        print(profile_startup())
+        sys.exit(0)
     try:
         with single_instance_lock(LOCK_PATH):
             if args.mode == "dry-run":
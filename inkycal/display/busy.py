@@ -0,0 +1,115 @@
+"""
+BUSY-line wait strategies for the E-Paper drivers.
+
+E-Paper controllers hold a BUSY line while they are refreshing, which takes
+anywhere from a few milliseconds to 30+ seconds on colour panels. Instead of
+spinning on the pin at 100% CPU, drivers call :func:`wait_until_idle`, which
+
+- blocks on an edge event (e.g. gpiozero ``wait_for_release``) when available,
+- otherwise polls with an exponential back-off sleep,
+- gives up with :class:`BusyTimeoutError` after a hard timeout.
+
+Every wait is recorded in :data:`telemetry` so the time spent in each refresh
+phase (``init``, ``display``, ``sleep``) can be inspected after a render.
+"""
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from inkycal.utils.inkycal_exceptions import BusyTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Long enough for the slowest colour panels to complete a full refresh
+DEFAULT_TIMEOUT = 120
+
+# Poll interval back-off (seconds) used when no edge event is available
+POLL_INTERVAL_MIN = 0.001
+POLL_INTERVAL_MAX = 0.05
+
+
+class BusyTelemetry:
+    """Keeps the duration of recent BUSY waits, grouped by refresh phase."""
+
+    def __init__(self, maxlen: int = 256):
+        self.phase = "busy"
+        self.records = deque(maxlen=maxlen)
+
+    @contextmanager
+    def track(self, phase: str):
+        """Attribute all waits inside the ``with`` block to ``phase``."""
+        previous, self.phase = self.phase, phase
+        try:
+            yield self
+        finally:
+            self.phase = previous
+
+    def record(self, duration: float, strategy: str) -> None:
+        self.records.append({"phase": self.phase, "strategy": strategy, "seconds": duration})
+
+    def summary(self) -> dict:
+        """Return the total seconds spent waiting per phase."""
+        totals = {}
+        for record in self.records:
+            totals[record["phase"]] = totals.get(record["phase"], 0.0) + record["seconds"]
+        return totals
+
+    def clear(self) -> None:
+        self.records.clear()
+
+
+telemetry = BusyTelemetry()
+
+
+def wait_until_idle(
+        read: Callable[[], int],
+        busy_level: int,
+        sleep: Callable[[float], None] = time.sleep,
+        edge_wait: Optional[Callable[[float], bool]] = None,
+        poke: Optional[Callable[[], None]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+) -> float:
+    """Block until the BUSY line leaves ``busy_level``.
+
+    Args:
+        read: Returns the current level of the BUSY pin.
+        busy_level: Pin level that means "busy" (``1`` or ``0`` depending on controller).
+        sleep: Sleep function taking seconds, used between polls.
+        edge_wait: Optional blocking wait for the idle edge, taking a timeout in
+            seconds and returning ``False`` if it expired.
+        poke: Optional callback run before every poll, for controllers that only
+            update BUSY after a status command (e.g. ``0x71``). Disables ``edge_wait``.
+        timeout: Seconds after which :class:`BusyTimeoutError` is raised.
+
+    Returns:
+        float: Seconds spent waiting.
+    """
+    start = time.monotonic()
+    strategy = "poll"
+
+    if poke:
+        poke()
+
+    if read() == busy_level:
+        if edge_wait is not None and poke is None:
+            strategy = "edge"
+            if not edge_wait(timeout):
+                raise BusyTimeoutError(f"E-Paper still busy after {timeout} seconds")
+        else:
+            interval = POLL_INTERVAL_MIN
+            while True:
+                if time.monotonic() - start > timeout:
+                    raise BusyTimeoutError(f"E-Paper still busy after {timeout} seconds")
+                sleep(interval)
+                interval = min(interval * 2, POLL_INTERVAL_MAX)
+                if poke:
+                    poke()
+                if read() != busy_level:
+                    break
+
+    duration = time.monotonic() - start
+    telemetry.record(duration, strategy)
+    logger.debug(f"e-Paper busy for {duration:.3f}s ({telemetry.phase}, {strategy})")
+    return duration
@@ -19,11 +19,14 @@ methods:
 - ``sleep()``
 """
 
+import time
+from contextlib import contextmanager
 from importlib import import_module
 from typing import Tuple, List, Optional
 
 from PIL import Image
-from inkycal.display.supported_models import supported_models
+from inkycal.display.busy import telemetry
+from inkycal.display.supported_models import get_capabilities, supported_models
 
 
 def import_driver(model: str):
@@ -51,14 +54,16 @@ class Display:
     def __init__(self, epaper_model: str) -> None:
         """Load and initialize the driver for the given E-Paper model."""
 
-        self.supports_colour = "colour" in epaper_model
+        self.timings = {}
+        self._solid_buffers = {}
 
         try:
+            self.capabilities = get_capabilities(epaper_model)
             driver = import_driver(epaper_model)
             self._epaper = driver.EPD()
             self.model_name = epaper_model
 
-        except ImportError:
+        except (KeyError, ImportError):
             raise Exception(
                 f"Display model '{epaper_model}' is not supported. "
                 "Check spelling or supported models list."
@@ -70,6 +75,15 @@ class Display:
                 "Ensure SPI is enabled on your system."
             )
 
+        # Pick the render paths from the driver's capabilities, not from its name
+        self.supports_colour = self.capabilities.colour
+        self.supports_partial_refresh = self.capabilities.partial_refresh
+        self.supports_4gray = self.capabilities.gray4
+
+        config = getattr(driver, "epdconfig", None)
+        if self.capabilities.max_spi_hz and hasattr(config, "set_spi_speed"):
+            config.set_spi_speed(self.capabilities.max_spi_hz)
+
     # ----------------------------------------------------------------------
     # Rendering
     # ----------------------------------------------------------------------
@@ -110,30 +124,120 @@ class Display:
         """
         epaper = self._epaper
 
+        if self.supports_colour and im_colour is None:
+            raise Exception(
+                "im_colour is required for colour E-Paper displays."
+            )
+
+        # BUSY waits are recorded per phase, see busy_times() and timings
+        telemetry.clear()
+        self.timings = {}
+
+        # Pack the buffers before waking up the display
+        with self._timed("getbuffer"):
+            buffers = [epaper.getbuffer(im_black)]
+            if self.supports_colour:
+                buffers.append(epaper.getbuffer(im_colour))
+
         # Initialize and update
         print("Initialising..", end="")
-        epaper.init()
+        with self._timed("init"):
+            epaper.init()
 
         print("Updating display......", end="")
-        if self.supports_colour:
-            if im_colour is None:
-                raise Exception(
-                    "im_colour is required for colour E-Paper displays."
-                )
-            epaper.display(
-                epaper.getbuffer(im_black),
-                epaper.getbuffer(im_colour),
-            )
-        else:
-            epaper.display(epaper.getbuffer(im_black))
+        with self._timed("display"):
+            epaper.display(*buffers)
 
         print("Done")
 
         # Put display into deep sleep to reduce ghosting and power usage
         print("Sending E-Paper to deep sleep...", end="")
-        epaper.sleep()
+        with self._timed("sleep"):
+            epaper.sleep()
+        print("Done")
+        self._split_transfer()
+
+    def render_region(self, im_black: Image.Image, box: Tuple[int, int, int, int]) -> None:
+        """Refresh only a window of the display without a full (flashing) refresh.
+
+        Only the pixels of ``im_black`` inside ``box`` are sent to the display;
+        the rest of the screen keeps its current content.
+
+        Args:
+            im_black (PIL.Image):
+                The complete frame, same size as for :meth:`render`.
+
+            box (tuple):
+                ``(left, upper, right, lower)`` of the window to update in the
+                coordinates of ``im_black``. It is widened to whole bytes on
+                the display's native x-axis.
+
+        Raises:
+            Exception: If the display does not support partial refresh.
+
+        Examples:
+            Refreshing the top 100 pixels of a portrait frame:
+
+            >>> disp = Display("epd_7_in_5_v2")
+            >>> disp.render_region(img, (0, 0, 480, 100))
+        """
+        if not self.supports_partial_refresh:
+            raise Exception(f"Display model '{self.model_name}' does not support partial refresh.")
+
+        from inkycal.display.framebuffer import as_rows, native_box
+
+        epaper = self._epaper
+        left, upper, right, lower = native_box(box, im_black.size, epaper.width, epaper.height)
+        if left >= right or upper >= lower:
+            return
+
+        telemetry.clear()
+        self.timings = {}
+
+        with self._timed("getbuffer"):
+            rows = as_rows(epaper.getbuffer(im_black), epaper.width)
+            window = rows[upper:lower, left // 8:right // 8].tobytes()
+
+        print("Initialising..", end="")
+        with self._timed("init"):
+            epaper.init_part()
+
+        print(f"Updating region ({left}, {upper}, {right}, {lower})......", end="")
+        with self._timed("display"):
+            epaper.display_Partial(window, left, upper, right, lower)
         print("Done")
 
+        print("Sending E-Paper to deep sleep...", end="")
+        with self._timed("sleep"):
+            epaper.sleep()
+        print("Done")
+        self._split_transfer()
+
+    @contextmanager
+    def _timed(self, phase: str):
+        """Track the BUSY waits of ``phase`` and add its wall time to :attr:`timings`."""
+        start = time.perf_counter()
+        try:
+            with telemetry.track(phase):
+                yield
+        finally:
+            self.timings[phase] = self.timings.get(phase, 0.0) + time.perf_counter() - start
+
+    def _split_transfer(self) -> None:
+        """Split the display phase into BUSY wait and transfer (SPI) time."""
+        busy = telemetry.summary()
+        self.timings["busy"] = sum(busy.values())
+        self.timings["spi"] = max(0.0, self.timings.get("display", 0.0) - busy.get("display", 0.0))
+
+    @staticmethod
+    def busy_times() -> dict:
+        """Return the seconds spent waiting on the BUSY line per phase of the last render.
+
+        Returns:
+            dict: e.g. ``{"init": 0.02, "display": 14.8, "sleep": 0.0}``
+        """
+        return telemetry.summary()
+
     # ----------------------------------------------------------------------
     # Calibration
     # ----------------------------------------------------------------------
@@ -159,10 +263,8 @@ class Display:
         epaper = self._epaper
         epaper.init()
 
-        display_size = self.get_display_size(self.model_name)
-
-        white = Image.new("1", display_size, "white")
-        black = Image.new("1", display_size, "black")
+        white = self._solid_buffer("white")
+        black = self._solid_buffer("black")
 
         print("---------- Starting calibration ----------")
 
@@ -170,27 +272,48 @@ class Display:
             # black → colour → white
             for i in range(cycles):
                 print(f"Cycle {i+1}/{cycles}: black...", end=" ")
-                epaper.display(epaper.getbuffer(black), epaper.getbuffer(white))
+                epaper.display(black, white)
 
                 print("colour...", end=" ")
-                epaper.display(epaper.getbuffer(white), epaper.getbuffer(black))
+                epaper.display(white, black)
 
                 print("white...")
-                epaper.display(epaper.getbuffer(white), epaper.getbuffer(white))
+                epaper.display(white, white)
 
         else:
             # black → white
             for i in range(cycles):
                 print(f"Cycle {i+1}/{cycles}: black...", end=" ")
-                epaper.display(epaper.getbuffer(black))
+                epaper.display(black)
 
                 print("white...")
-                epaper.display(epaper.getbuffer(white))
+                epaper.display(white)
 
             epaper.sleep()
 
         print("---------- Calibration complete ----------")
 
+    def clear(self) -> None:
+        """Turn the whole display white and send it to deep sleep."""
+        epaper = self._epaper
+        white = self._solid_buffer("white")
+
+        epaper.init()
+        if self.supports_colour:
+            epaper.display(white, white)
+        else:
+            epaper.display(white)
+        epaper.sleep()
+
+    def _solid_buffer(self, fill: str):
+        """Return the driver buffer of a frame filled with ``fill``, packed only once."""
+        if fill not in self._solid_buffers:
+            frame = Image.new("1", self.get_display_size(self.model_name), fill)
+            buffer = self._epaper.getbuffer(frame)
+            # Immutable, so a driver can't change the cached frame in place
+            self._solid_buffers[fill] = bytes(buffer) if isinstance(buffer, bytearray) else buffer
+        return self._solid_buffers[fill]
+
     # ----------------------------------------------------------------------
     # Display information helpers
     # ----------------------------------------------------------------------
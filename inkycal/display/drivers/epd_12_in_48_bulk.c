@@ -0,0 +1,26 @@
+/*
+ * Bulk SPI write for the Waveshare 12.48" drivers (epdconfig_12_in_48.py).
+ *
+ * The vendor library only exports DEV_SPI_WriteByte(), so streaming a frame
+ * from Python costs one ctypes call per byte (~160 KB per plane). This helper
+ * sends a whole sub-panel region in one call and reuses the vendor's software
+ * SPI timing by calling DEV_SPI_WriteByte() for every byte.
+ *
+ * installer.py builds it on the Raspberry Pi (install/repair), next to
+ * epd_12_in_48_lib_*bit.so. To build it by hand:
+ *
+ *     gcc -shared -fPIC -O2 -o epd_12_in_48_bulk.so epd_12_in_48_bulk.c
+ *
+ * DEV_SPI_WriteByte() is resolved at load time from the vendor library, which
+ * epdconfig_12_in_48.py loads with RTLD_GLOBAL before this one.
+ */
+#include <stdint.h>
+
+extern void DEV_SPI_WriteByte(uint8_t value);
+
+void DEV_SPI_Write_nByte(const uint8_t *data, uint32_t length)
+{
+    for (uint32_t i = 0; i < length; i++) {
+        DEV_SPI_WriteByte(data[i]);
+    }
+}
@@ -29,7 +29,10 @@ THE SOFTWARE.
 
 import time
 
+import numpy as np
+
 from inkycal.display.drivers import epdconfig_12_in_48 as epdconfig
+from inkycal.display.framebuffer import pack_1bpp, as_rows, invert_buffer, solid_bytes
 
 EPD_WIDTH = 1304
 EPD_HEIGHT = 984
@@ -128,108 +131,59 @@ class EPD(object):
         self.SetLut()
 
     def getbuffer(self, image):
-        # logging.debug("bufsiz = ",int(self.width/8) * self.height)
-        buf = [0xFF] * (int(self.width / 8) * self.height)
-        image_monocolor = image.convert('1')
-        imwidth, imheight = image_monocolor.size
-        pixels = image_monocolor.load()
-
-        if (imwidth == self.width and imheight == self.height):
-            for y in range(imheight):
-                for x in range(imwidth):
-                    # Set the bits for the column of pixels at the current position.
-                    if pixels[x, y] == 0:
-                        buf[int((x + y * self.width) / 8)] &= ~(0x80 >> (x % 8))
-        elif (imwidth == self.height and imheight == self.width):
-            for y in range(imheight):
-                for x in range(imwidth):
-                    newx = y
-                    newy = self.height - x - 1
-                    if pixels[x, y] == 0:
-                        buf[int((newx + newy * self.width) / 8)] &= ~(0x80 >> (y % 8))
-        return buf
+        return pack_1bpp(image, self.width, self.height)
 
     def display(self, blackbuf, redbuf):
+        blackbuf = as_rows(blackbuf, self.width)
+        redbuf = as_rows(invert_buffer(redbuf), self.width)
 
         # S2 part 648*492
         self.S2_SendCommand(0x10)
-        for y in range(0, 492):
-            for x in range(0, 81):
-                self.S2_SendData(blackbuf[y * 163 + x])
+        self.SendDataBulk(self.EPD_M2S2_DC_PIN, self.EPD_S2_CS_PIN, blackbuf[0:492, 0:81])
         self.S2_SendCommand(0x13)
-        for y in range(0, 492):
-            for x in range(0, 81):
-                self.S2_SendData(~redbuf[y * 163 + x])
+        self.SendDataBulk(self.EPD_M2S2_DC_PIN, self.EPD_S2_CS_PIN, redbuf[0:492, 0:81])
 
         # M2 part 656*492
         self.M2_SendCommand(0x10)
-        for y in range(0, 492):
-            for x in range(81, 163):
-                self.M2_SendData(blackbuf[y * 163 + x])
+        self.SendDataBulk(self.EPD_M2S2_DC_PIN, self.EPD_M2_CS_PIN, blackbuf[0:492, 81:163])
         self.M2_SendCommand(0x13)
-        for y in range(0, 492):
-            for x in range(81, 163):
-                self.M2_SendData(~redbuf[y * 163 + x])
+        self.SendDataBulk(self.EPD_M2S2_DC_PIN, self.EPD_M2_CS_PIN, redbuf[0:492, 81:163])
 
         # M1 part 648*492
         self.M1_SendCommand(0x10)
-        for y in range(492, 984):
-            for x in range(0, 81):
-                self.M1_SendData(blackbuf[y * 163 + x])
+        self.SendDataBulk(self.EPD_M1S1_DC_PIN, self.EPD_M1_CS_PIN, blackbuf[492:984, 0:81])
         self.M1_SendCommand(0x13)
-        for y in range(492, 984):
-            for x in range(0, 81):
-                self.M1_SendData(~redbuf[y * 163 + x])
+        self.SendDataBulk(self.EPD_M1S1_DC_PIN, self.EPD_M1_CS_PIN, redbuf[492:984, 0:81])
 
         # S1 part 656*492
         self.S1_SendCommand(0x10)
-        for y in range(492, 984):
-            for x in range(81, 163):
-                self.S1_SendData(blackbuf[y * 163 + x])
+        self.SendDataBulk(self.EPD_M1S1_DC_PIN, self.EPD_S1_CS_PIN, blackbuf[492:984, 81:163])
         self.S1_SendCommand(0x13)
-        for y in range(492, 984):
-            for x in range(81, 163):
-                self.S1_SendData(~redbuf[y * 163 + x])
+        self.SendDataBulk(self.EPD_M1S1_DC_PIN, self.EPD_S1_CS_PIN, redbuf[492:984, 81:163])
         self.TurnOnDisplay()
 
     def clear(self):
         """Clear contents of image buffer"""
 
         self.S2_SendCommand(0x10)
-        for y in range(0, 492):
-            for x in range(0, 81):
-                self.S2_SendData(0xff)
+        self.SendDataBulk(self.EPD_M2S2_DC_PIN, self.EPD_S2_CS_PIN, solid_bytes(492 * 81, 0xFF))
         self.S2_SendCommand(0x13)
-        for y in range(0, 492):
-            for x in range(0, 81):
-                self.S2_SendData(0x00)
+        self.SendDataBulk(self.EPD_M2S2_DC_PIN, self.EPD_S2_CS_PIN, solid_bytes(492 * 81, 0x00))
 
         self.M2_SendCommand(0x10)
-        for y in range(0, 492):
-            for x in range(81, 163):
-                self.M2_SendData(0xff)
+        self.SendDataBulk(self.EPD_M2S2_DC_PIN, self.EPD_M2_CS_PIN, solid_bytes(492 * 82, 0xFF))
         self.M2_SendCommand(0x13)
-        for y in range(0, 492):
-            for x in range(81, 163):
-                self.M2_SendData(0x00)
+        self.SendDataBulk(self.EPD_M2S2_DC_PIN, self.EPD_M2_CS_PIN, solid_bytes(492 * 82, 0x00))
 
         self.M1_SendCommand(0x10)
-        for y in range(492, 984):
-            for x in range(0, 81):
-                self.M1_SendData(0xff)
+        self.SendDataBulk(self.EPD_M1S1_DC_PIN, self.EPD_M1_CS_PIN, solid_bytes(492 * 81, 0xFF))
         self.M1_SendCommand(0x13)
-        for y in range(492, 984):
-            for x in range(0, 81):
-                self.M1_SendData(0x00)
+        self.SendDataBulk(self.EPD_M1S1_DC_PIN, self.EPD_M1_CS_PIN, solid_bytes(492 * 81, 0x00))
 
         self.S1_SendCommand(0x10)
-        for y in range(492, 984):
-            for x in range(81, 163):
-                self.S1_SendData(0xff)
+        self.SendDataBulk(self.EPD_M1S1_DC_PIN, self.EPD_S1_CS_PIN, solid_bytes(492 * 82, 0xFF))
         self.S1_SendCommand(0x13)
-        for y in range(492, 984):
-            for x in range(81, 163):
-                self.S1_SendData(0x00)
+        self.SendDataBulk(self.EPD_M1S1_DC_PIN, self.EPD_S1_CS_PIN, solid_bytes(492 * 82, 0x00))
 
         self.TurnOnDisplay()
 
@@ -258,10 +212,17 @@ class EPD(object):
         self.M1M2_SendCommand(0x04)
         time.sleep(0.3)
         self.M1S1M2S2_SendCommand(0x12)
-        self.M1_ReadBusy()
-        self.S1_ReadBusy()
-        self.M2_ReadBusy()
-        self.S2_ReadBusy()
+        self.ReadBusyAll()
+
+    """   Bulk data write to a single controller     """
+
+    def SendDataBulk(self, dc_pin, cs_pin, data):
+        if isinstance(data, np.ndarray):
+            data = data.tobytes()
+        epdconfig.digital_write(dc_pin, 1)
+        epdconfig.digital_write(cs_pin, 0)
+        epdconfig.spi_write_bulk(data)
+        epdconfig.digital_write(cs_pin, 1)
 
     """   M1S1M2S2 Write register address and data     """
 
@@ -370,45 +331,30 @@ class EPD(object):
         epdconfig.digital_write(self.EPD_M1_CS_PIN, 1)
 
     # Busy
+    def ReadBusyAll(self):
+        """Wait for all four controllers at once, they refresh at the same time"""
+        epdconfig.wait_busy_all({
+            self.EPD_M1_BUSY_PIN: lambda: self.M1_SendCommand(0x71),
+            self.EPD_S1_BUSY_PIN: lambda: self.S1_SendCommand(0x71),
+            self.EPD_M2_BUSY_PIN: lambda: self.M2_SendCommand(0x71),
+            self.EPD_S2_BUSY_PIN: lambda: self.S2_SendCommand(0x71),
+        }, busy_level=0)
+        time.sleep(0.2)
+
     def M1_ReadBusy(self):
-        self.M1_SendCommand(0x71)
-        busy = epdconfig.digital_read(self.EPD_M1_BUSY_PIN)
-        busy = not (busy & 0x01)
-        while (busy):
-            self.M1_SendCommand(0x71)
-            busy = epdconfig.digital_read(self.EPD_M1_BUSY_PIN)
-            busy = not (busy & 0x01)
+        epdconfig.wait_busy(self.EPD_M1_BUSY_PIN, busy_level=0, poke=lambda: self.M1_SendCommand(0x71))
         time.sleep(0.2)
 
     def M2_ReadBusy(self):
-        self.M2_SendCommand(0x71)
-        busy = epdconfig.digital_read(self.EPD_M2_BUSY_PIN)
-        busy = not (busy & 0x01)
-        self.M2_SendCommand(0x71)
-        while (busy):
-            self.M2_SendCommand(0x71)
-            busy = epdconfig.digital_read(self.EPD_M2_BUSY_PIN)
-            busy = not (busy & 0x01)
+        epdconfig.wait_busy(self.EPD_M2_BUSY_PIN, busy_level=0, poke=lambda: self.M2_SendCommand(0x71))
         time.sleep(0.2)
 
     def S1_ReadBusy(self):
-        self.S1_SendCommand(0x71)
-        busy = epdconfig.digital_read(self.EPD_S1_BUSY_PIN)
-        busy = not (busy & 0x01)
-        while (busy):
-            self.S1_SendCommand(0x71)
-            busy = epdconfig.digital_read(self.EPD_S1_BUSY_PIN)
-            busy = not (busy & 0x01)
+        epdconfig.wait_busy(self.EPD_S1_BUSY_PIN, busy_level=0, poke=lambda: self.S1_SendCommand(0x71))
         time.sleep(0.2)
 
     def S2_ReadBusy(self):
-        self.S2_SendCommand(0x71)
-        busy = epdconfig.digital_read(self.EPD_S2_BUSY_PIN)
-        busy = not (busy & 0x01)
-        while (busy):
-            self.S2_SendCommand(0x71)
-            busy = epdconfig.digital_read(self.EPD_S2_BUSY_PIN)
-            busy = not (busy & 0x01)
+        epdconfig.wait_busy(self.EPD_S2_BUSY_PIN, busy_level=0, poke=lambda: self.S2_SendCommand(0x71))
         time.sleep(0.2)
 
     lut_vcom1 = [
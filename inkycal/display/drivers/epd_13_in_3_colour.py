@@ -30,6 +30,7 @@ THE SOFTWARE.
 import logging
 
 from inkycal.display.drivers import epdconfig
+from inkycal.display.framebuffer import pack_1bpp, invert_buffer, solid_bytes
 
 # Display resolution
 EPD_WIDTH = 960
@@ -78,15 +79,12 @@ class EPD:
     def send_data2(self, data):
         epdconfig.digital_write(self.dc_pin, 1)
         epdconfig.digital_write(self.cs_pin, 0)
-        epdconfig.SPI.writebytes2(data)
+        epdconfig.spi_write_bulk(data)
         epdconfig.digital_write(self.cs_pin, 1)
 
     def ReadBusy(self):
         logger.debug("e-Paper busy")
-        busy = epdconfig.digital_read(self.busy_pin)
-        while (busy == 1):
-            busy = epdconfig.digital_read(self.busy_pin)
-            epdconfig.delay_ms(20)
+        epdconfig.wait_busy(self.busy_pin, busy_level=1)
         epdconfig.delay_ms(20)
         logger.debug("e-Paper busy release")
 
@@ -156,80 +154,43 @@ class EPD:
         return 0
 
     def getbuffer(self, image):
-        # logger.debug("bufsiz = ",int(self.width/8) * self.height)
-        buf = [0xFF] * (int(self.width / 8) * self.height)
-        image_monocolor = image.convert('1')
-        imwidth, imheight = image_monocolor.size
-        pixels = image_monocolor.load()
-        # logger.debug("imwidth = %d, imheight = %d",imwidth,imheight)
-        if imwidth == self.width and imheight == self.height:
-            logger.debug("Horizontal")
-            for y in range(imheight):
-                for x in range(imwidth):
-                    # Set the bits for the column of pixels at the current position.
-                    if pixels[x, y] == 0:
-                        buf[int((x + y * self.width) / 8)] &= ~(0x80 >> (x % 8))
-        elif imwidth == self.height and imheight == self.width:
-            logger.debug("Vertical")
-            for y in range(imheight):
-                for x in range(imwidth):
-                    newx = y
-                    newy = self.height - x - 1
-                    if pixels[x, y] == 0:
-                        buf[int((newx + newy * self.width) / 8)] &= ~(0x80 >> (y % 8))
-        return buf
+        return pack_1bpp(image, self.width, self.height)
 
     def Clear(self):
         self.send_command(0x24)
-        self.send_data2([0xFF] * (int(self.width / 8) * self.height))
+        self.send_data2(solid_bytes(int(self.width / 8) * self.height, 0xFF))
         self.send_command(0x26)
-        self.send_data2([0x00] * (int(self.width / 8) * self.height))
+        self.send_data2(solid_bytes(int(self.width / 8) * self.height, 0x00))
 
         self.TurnOnDisplay()
 
     def Clear_Base(self):
         self.send_command(0x24)
-        self.send_data2([0xFF] * (int(self.width / 8) * self.height))
+        self.send_data2(solid_bytes(int(self.width / 8) * self.height, 0xFF))
         self.send_command(0x26)
-        self.send_data2([0x00] * (int(self.width / 8) * self.height))
+        self.send_data2(solid_bytes(int(self.width / 8) * self.height, 0x00))
 
         self.TurnOnDisplay()
         self.send_command(0x26)
-        self.send_data2([0xFF] * (int(self.width / 8) * self.height))
+        self.send_data2(solid_bytes(int(self.width / 8) * self.height, 0xFF))
 
     def display(self, blackimage, ryimage):
-        if (self.width % 8 == 0):
-            Width = self.width // 8
-        else:
-            Width = self.width // 8 + 1
-        Height = self.height
         if (blackimage != None):
             self.send_command(0x24)
             self.send_data2(blackimage)
         if (ryimage != None):
-            for j in range(Height):
-                for i in range(Width):
-                    ryimage[i + j * Width] = ~ryimage[i + j * Width]
             self.send_command(0x26)
-            self.send_data2(ryimage)
+            self.send_data2(invert_buffer(ryimage))
 
         self.TurnOnDisplay()
 
     def display_Base(self, blackimage, ryimage):
-        if (self.width % 8 == 0):
-            Width = self.width // 8
-        else:
-            Width = self.width // 8 + 1
-        Height = self.height
         if (blackimage != None):
             self.send_command(0x24)
             self.send_data2(blackimage)
         if (ryimage != None):
-            for j in range(Height):
-                for i in range(Width):
-                    ryimage[i + j * Width] = ~ryimage[i + j * Width]
             self.send_command(0x26)
-            self.send_data2(ryimage)
+            self.send_data2(invert_buffer(ryimage))
 
         self.TurnOnDisplay()
 
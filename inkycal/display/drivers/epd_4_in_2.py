@@ -30,6 +30,7 @@ THE SOFTWARE.
 import logging
 
 from inkycal.display.drivers import epdconfig
+from inkycal.display.framebuffer import pack_1bpp, solid_bytes
 
 # Display resolution
 EPD_WIDTH = 400
@@ -173,11 +174,14 @@ class EPD:
         epdconfig.spi_writebyte([data])
         epdconfig.digital_write(self.cs_pin, 1)
 
+    def send_data2(self, data):
+        epdconfig.digital_write(self.dc_pin, 1)
+        epdconfig.digital_write(self.cs_pin, 0)
+        epdconfig.spi_write_bulk(data)
+        epdconfig.digital_write(self.cs_pin, 1)
+
     def ReadBusy(self):
-        self.send_command(0x71)
-        while (epdconfig.digital_read(self.busy_pin) == 0):  # 0: idle, 1: busy
-            self.send_command(0x71)
-            epdconfig.delay_ms(100)
+        epdconfig.wait_busy(self.busy_pin, busy_level=0, poke=lambda: self.send_command(0x71))
 
     def set_lut(self):
         self.send_command(0x20)  # vcom
@@ -309,28 +313,7 @@ class EPD:
         self.send_data(0x97)
 
     def getbuffer(self, image):
-        # logging.debug("bufsiz = ",int(self.width/8) * self.height)
-        buf = [0xFF] * (int(self.width / 8) * self.height)
-        image_monocolor = image.convert('1')
-        imwidth, imheight = image_monocolor.size
-        pixels = image_monocolor.load()
-        # logging.debug("imwidth = %d, imheight = %d",imwidth,imheight)
-        if (imwidth == self.width and imheight == self.height):
-            logging.debug("Horizontal")
-            for y in range(imheight):
-                for x in range(imwidth):
-                    # Set the bits for the column of pixels at the current position.
-                    if pixels[x, y] == 0:
-                        buf[int((x + y * self.width) / 8)] &= ~(0x80 >> (x % 8))
-        elif (imwidth == self.height and imheight == self.width):
-            logging.debug("Vertical")
-            for y in range(imheight):
-                for x in range(imwidth):
-                    newx = y
-                    newy = self.height - x - 1
-                    if pixels[x, y] == 0:
-                        buf[int((newx + newy * self.width) / 8)] &= ~(0x80 >> (y % 8))
-        return buf
+        return pack_1bpp(image, self.width, self.height)
 
     def getbuffer_4Gray(self, image):
         # logging.debug("bufsiz = ",int(self.width/8) * self.height)
@@ -375,12 +358,10 @@ class EPD:
 
     def display(self, image):
         self.send_command(0x10)
-        for i in range(0, int(self.width * self.height / 8)):
-            self.send_data(0xFF)
+        self.send_data2(solid_bytes(int(self.width * self.height / 8), 0xFF))
 
         self.send_command(0x13)
-        for i in range(0, int(self.width * self.height / 8)):
-            self.send_data(image[i])
+        self.send_data2(image)
 
         self.send_command(0x12)
         self.ReadBusy()
@@ -459,12 +440,10 @@ class EPD:
 
     def Clear(self):
         self.send_command(0x10)
-        for i in range(0, int(self.width * self.height / 8)):
-            self.send_data(0xFF)
+        self.send_data2(solid_bytes(int(self.width * self.height / 8), 0xFF))
 
         self.send_command(0x13)
-        for i in range(0, int(self.width * self.height / 8)):
-            self.send_data(0xFF)
+        self.send_data2(solid_bytes(int(self.width * self.height / 8), 0xFF))
 
         self.send_command(0x12)
         self.ReadBusy()
@@ -30,6 +30,7 @@ THE SOFTWARE.
 import logging
 
 from inkycal.display.drivers import epdconfig
+from inkycal.display.framebuffer import pack_1bpp, invert_buffer
 
 # Display resolution
 EPD_WIDTH = 800
@@ -71,16 +72,12 @@ class EPD:
     def send_data2(self, data):
         epdconfig.digital_write(self.dc_pin, 1)
         epdconfig.digital_write(self.cs_pin, 0)
-        epdconfig.SPI.writebytes2(data)
+        epdconfig.spi_write_bulk(data)
         epdconfig.digital_write(self.cs_pin, 1)
 
     def ReadBusy(self):
         logger.debug("e-Paper busy")
-        self.send_command(0x71)
-        busy = epdconfig.digital_read(self.busy_pin)
-        while (busy == 0):
-            self.send_command(0x71)
-            busy = epdconfig.digital_read(self.busy_pin)
+        epdconfig.wait_busy(self.busy_pin, busy_level=0, poke=lambda: self.send_command(0x71))
         epdconfig.delay_ms(20)
         logger.debug("e-Paper busy release")
 
@@ -128,25 +125,29 @@ class EPD:
         # EPD hardware init end
         return 0
 
+    def init_part(self):
+        if (epdconfig.module_init() != 0):
+            return -1
+        # EPD hardware init start
+        self.reset()
+
+        self.send_command(0X00)  # PANNEL SETTING
+        self.send_data(0x1F)  # KW-3f   KWR-2F	BWROTP 0f	BWOTP 1f
+
+        self.send_command(0x04)  # POWER ON
+        epdconfig.delay_ms(100)
+        self.ReadBusy()
+
+        self.send_command(0xE0)
+        self.send_data(0x02)
+        self.send_command(0xE5)
+        self.send_data(0x6E)
+
+        # EPD hardware init end
+        return 0
+
     def getbuffer(self, image):
-        img = image
-        imwidth, imheight = img.size
-        if (imwidth == self.width and imheight == self.height):
-            img = img.convert('1')
-        elif (imwidth == self.height and imheight == self.width):
-            # image has correct dimensions, but needs to be rotated
-            img = img.rotate(90, expand=True).convert('1')
-        else:
-            logger.warning("Wrong image dimensions: must be " + str(self.width) + "x" + str(self.height))
-            # return a blank buffer
-            return [0x00] * (int(self.width / 8) * self.height)
-
-        buf = bytearray(img.tobytes('raw'))
-        # The bytes need to be inverted, because in the PIL world 0=black and 1=white, but
-        # in the e-paper world 0=white and 1=black.
-        for i in range(len(buf)):
-            buf[i] ^= 0xFF
-        return buf
+        return pack_1bpp(image, self.width, self.height, invert=True)
 
     def display(self, image):
         self.send_command(0x13)
@@ -156,8 +157,34 @@ class EPD:
         epdconfig.delay_ms(100)
         self.ReadBusy()
 
+    def display_Partial(self, image, Xstart, Ystart, Xend, Yend):
+        # image: getbuffer() rows of the window, Xstart and Xend must be multiples of 8
+        self.send_command(0x50)
+        self.send_data(0xA9)
+        self.send_data(0x07)
+
+        self.send_command(0x91)  # enter partial mode
+        self.send_command(0x90)  # resolution setting
+        self.send_data(Xstart // 256)
+        self.send_data(Xstart % 256)  # x-start
+        self.send_data((Xend - 1) // 256)
+        self.send_data((Xend - 1) % 256)  # x-end
+        self.send_data(Ystart // 256)
+        self.send_data(Ystart % 256)  # y-start
+        self.send_data((Yend - 1) // 256)
+        self.send_data((Yend - 1) % 256)  # y-end
+        self.send_data(0x01)
+
+        # partial mode uses the opposite data polarity
+        self.send_command(0x13)
+        self.send_data2(invert_buffer(image))
+
+        self.send_command(0x12)
+        epdconfig.delay_ms(100)
+        self.ReadBusy()
+
     def Clear(self):
-        buf = [0x00] * (int(self.width / 8) * self.height)
+        buf = bytes(int(self.width / 8) * self.height)
         self.send_command(0x10)
         self.send_data2(buf)
         self.send_command(0x13)
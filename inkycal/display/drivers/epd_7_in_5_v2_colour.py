@@ -31,6 +31,7 @@
 import logging
 
 from . import epdconfig
+from inkycal.display.framebuffer import pack_1bpp, invert_buffer, solid_bytes
 
 # Display resolution
 EPD_WIDTH = 800
@@ -72,16 +73,12 @@ class EPD:
     def send_data2(self, data):  # faster
         epdconfig.digital_write(self.dc_pin, 1)
         epdconfig.digital_write(self.cs_pin, 0)
-        epdconfig.spi_writebyte2(data)
+        epdconfig.spi_write_bulk(data)
         epdconfig.digital_write(self.cs_pin, 1)
 
     def ReadBusy(self):
         logger.debug("e-Paper busy")
-        self.send_command(0x71)
-        busy = epdconfig.digital_read(self.busy_pin)
-        while (busy == 0):
-            self.send_command(0x71)
-            busy = epdconfig.digital_read(self.busy_pin)
+        epdconfig.wait_busy(self.busy_pin, busy_level=0, poke=lambda: self.send_command(0x71))
         epdconfig.delay_ms(200)
         logger.debug("e-Paper busy release")
 
@@ -129,31 +126,12 @@ class EPD:
         return 0
 
     def getbuffer(self, image):
-        img = image
-        imwidth, imheight = img.size
-        if imwidth == self.width and imheight == self.height:
-            img = img.convert('1')
-        elif imwidth == self.height and imheight == self.width:
-            # image has correct dimensions, but needs to be rotated
-            img = img.rotate(90, expand=True).convert('1')
-        else:
-            logger.warning("Wrong image dimensions: must be " + str(self.width) + "x" + str(self.height))
-            # return a blank buffer
-            return [0x00] * (int(self.width / 8) * self.height)
-
-        buf = bytearray(img.tobytes('raw'))
-        # The bytes need to be inverted, because in the PIL world 0=black and 1=white, but
-        # in the e-paper world 0=white and 1=black.
-        for i in range(len(buf)):
-            buf[i] ^= 0xFF
-        return buf
+        return pack_1bpp(image, self.width, self.height, invert=True)
 
     def display(self, imageblack, imagered):
         self.send_command(0x10)
         # The black bytes need to be inverted back from what getbuffer did
-        for i in range(len(imageblack)):
-            imageblack[i] ^= 0xFF
-        self.send_data2(imageblack)
+        self.send_data2(invert_buffer(imageblack))
 
         self.send_command(0x13)
         self.send_data2(imagered)
@@ -163,8 +141,8 @@ class EPD:
         self.ReadBusy()
 
     def Clear(self):
-        buf = [0x00] * (int(self.width / 8) * self.height)
-        buf2 = [0xff] * (int(self.width / 8) * self.height)
+        buf = bytes(int(self.width / 8) * self.height)
+        buf2 = solid_bytes(int(self.width / 8) * self.height, 0xFF)
         self.send_command(0x10)
         self.send_data2(buf2)
 
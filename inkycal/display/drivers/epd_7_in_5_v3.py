@@ -30,6 +30,7 @@ THE SOFTWARE.
 
 import logging
 from . import epdconfig
+from inkycal.display.framebuffer import pack_1bpp, solid_bytes
 
 # Display resolution
 EPD_WIDTH = 880
@@ -66,11 +67,15 @@ class EPD:
         epdconfig.spi_writebyte([data])
         epdconfig.digital_write(self.cs_pin, 1)
 
+    def send_data2(self, data):
+        epdconfig.digital_write(self.dc_pin, 1)
+        epdconfig.digital_write(self.cs_pin, 0)
+        epdconfig.spi_write_bulk(data)
+        epdconfig.digital_write(self.cs_pin, 1)
+
     def ReadBusy(self):
         logging.debug("e-Paper busy")
-        busy = epdconfig.digital_read(self.busy_pin)
-        while (busy == 1):
-            busy = epdconfig.digital_read(self.busy_pin)
+        epdconfig.wait_busy(self.busy_pin, busy_level=1)
         epdconfig.delay_ms(200)
 
     def init(self):
@@ -137,36 +142,14 @@ class EPD:
         return 0
 
     def getbuffer(self, image):
-        # logging.debug("bufsiz = ",int(self.width/8) * self.height)
-        buf = [0xFF] * (int(self.width / 8) * self.height)
-        image_monocolor = image.convert('1')
-        imwidth, imheight = image_monocolor.size
-        pixels = image_monocolor.load()
-        # logging.debug("imwidth = %d, imheight = %d",imwidth,imheight)
-        if (imwidth == self.width and imheight == self.height):
-            logging.debug("Vertical")
-            for y in range(imheight):
-                for x in range(imwidth):
-                    # Set the bits for the column of pixels at the current position.
-                    if pixels[x, y] == 0:
-                        buf[int((x + y * self.width) / 8)] &= ~(0x80 >> (x % 8))
-        elif (imwidth == self.height and imheight == self.width):
-            logging.debug("Horizontal")
-            for y in range(imheight):
-                for x in range(imwidth):
-                    newx = y
-                    newy = self.height - x - 1
-                    if pixels[x, y] == 0:
-                        buf[int((newx + newy * self.width) / 8)] &= ~(0x80 >> (y % 8))
-        return buf
+        return pack_1bpp(image, self.width, self.height)
 
     def display(self, image):
         self.send_command(0x4F)
         self.send_data(0x00)
         self.send_data(0x00)
         self.send_command(0x24)
-        for i in range(0, int(self.width * self.height / 8)):
-            self.send_data(image[i])
+        self.send_data2(image)
 
         self.send_command(0x22)
         self.send_data(0xF7)  # Load LUT from MCU(0x32)
@@ -179,12 +162,10 @@ class EPD:
         self.send_data(0x00)
         self.send_data(0x00)
         self.send_command(0x24)
-        for i in range(0, int(self.width * self.height / 8)):
-            self.send_data(0xff)
+        self.send_data2(solid_bytes(int(self.width * self.height / 8), 0xFF))
 
         self.send_command(0x26)
-        for i in range(0, int(self.width * self.height / 8)):
-            self.send_data(0xff)
+        self.send_data2(solid_bytes(int(self.width * self.height / 8), 0xFF))
 
         self.send_command(0x22)
         self.send_data(0xF7)  # Load LUT from MCU(0x32)
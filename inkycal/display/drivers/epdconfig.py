@@ -28,11 +28,28 @@ THE SOFTWARE.
 """
 
 import logging
+import os
 import sys
 import time
+from collections import Counter
+
+from inkycal.display.busy import wait_until_idle, DEFAULT_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
+# spidev refuses transfers larger than its kernel buffer (4096 bytes by default)
+SPIDEV_BUFSIZ_PATH = "/sys/module/spidev/parameters/bufsiz"
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def get_spi_chunk_size():
+    """Return the largest single SPI transfer the spidev driver accepts."""
+    try:
+        with open(SPIDEV_BUFSIZ_PATH) as bufsiz:
+            return int(bufsiz.read().strip())
+    except (OSError, ValueError):
+        return DEFAULT_CHUNK_SIZE
+
 
 class RaspberryPi:
     # Pin definition
@@ -42,6 +59,9 @@ class RaspberryPi:
     BUSY_PIN = 24
     PWR_PIN = 18
 
+    # SPI clock set in module_init(), see set_spi_speed()
+    _spi_hz = 4000000
+
     def __init__(self):
         import spidev
         import gpiozero
@@ -52,6 +72,7 @@ class RaspberryPi:
         # self.GPIO_CS_PIN     = gpiozero.LED(self.CS_PIN)
         self.GPIO_PWR_PIN = gpiozero.LED(self.PWR_PIN)
         self.GPIO_BUSY_PIN = gpiozero.Button(self.BUSY_PIN, pull_up=False)
+        self.chunk_size = get_spi_chunk_size()
 
     def digital_write(self, pin, value):
         if pin == self.RST_PIN:
@@ -90,18 +111,47 @@ class RaspberryPi:
     def delay_ms(self, delaytime):
         time.sleep(delaytime / 1000.0)
 
+    def _busy_edge_wait(self, pin, busy_level):
+        # gpiozero blocks on the pin edge instead of polling
+        if pin != self.BUSY_PIN:
+            return None
+        if busy_level == 1:
+            return self.GPIO_BUSY_PIN.wait_for_release
+        return self.GPIO_BUSY_PIN.wait_for_press
+
+    def wait_busy(self, pin, busy_level, poke=None, timeout=DEFAULT_TIMEOUT):
+        """Block until ``pin`` leaves ``busy_level``, returns the seconds waited."""
+        return wait_until_idle(
+            lambda: self.digital_read(pin), busy_level,
+            sleep=lambda seconds: self.delay_ms(seconds * 1000),
+            edge_wait=self._busy_edge_wait(pin, busy_level),
+            poke=poke, timeout=timeout,
+        )
+
     def spi_writebyte(self, data):
         self.SPI.writebytes(data)
 
     def spi_writebyte2(self, data):
         self.SPI.writebytes2(data)
 
+    def spi_write_bulk(self, data):
+        """Stream a whole buffer in as few transfers as spidev allows."""
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data)
+        view = memoryview(data)
+        for start in range(0, len(view), self.chunk_size):
+            self.spi_writebyte2(view[start:start + self.chunk_size])
+
+    def set_spi_speed(self, hz):
+        """Set the SPI clock used from the next module_init() on."""
+        self._spi_hz = hz
+
     def module_init(self):
         self.GPIO_PWR_PIN.on()
 
         # SPI device, bus = 0, device = 0
         self.SPI.open(0, 0)
-        self.SPI.max_speed_hz = 4000000
+        self.SPI.max_speed_hz = self._spi_hz
         self.SPI.mode = 0b00
         return 0
 
@@ -122,7 +172,64 @@ class RaspberryPi:
             self.GPIO_BUSY_PIN.close()
 
 
-implementation = RaspberryPi()
+class FakeBackend(RaspberryPi):
+    """Hardware-free backend that counts calls and bytes instead of driving GPIO/SPI.
+
+    Select it with ``INKYCAL_EPD_BACKEND=fake`` or ``use_implementation(FakeBackend())``
+    to measure driver overhead without a panel. The BUSY pin toggles on every
+    read so busy-wait loops of either polarity terminate immediately.
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.calls = Counter()
+        self.bytes_written = 0
+        self.delay_total_ms = 0
+        self._busy = 0
+
+    def digital_write(self, pin, value):
+        self.calls["digital_write"] += 1
+
+    def digital_read(self, pin):
+        self.calls["digital_read"] += 1
+        self._busy ^= 1
+        return self._busy
+
+    def delay_ms(self, delaytime):
+        self.calls["delay_ms"] += 1
+        self.delay_total_ms += delaytime
+
+    def _busy_edge_wait(self, pin, busy_level):
+        return None
+
+    def spi_writebyte(self, data):
+        self.calls["spi_writebyte"] += 1
+        self.bytes_written += len(data)
+
+    def spi_writebyte2(self, data):
+        self.calls["spi_writebyte2"] += 1
+        self.bytes_written += len(data)
+
+    def module_init(self):
+        self.calls["module_init"] += 1
+        return 0
+
+    def module_exit(self, cleanup=False):
+        self.calls["module_exit"] += 1
+
+
+def use_implementation(backend):
+    """Export the functions of ``backend`` at module level, e.g. ``epdconfig.spi_writebyte``."""
+    global implementation
+    implementation = backend
+    for func in [x for x in dir(backend) if not x.startswith('_')]:
+        setattr(sys.modules[__name__], func, getattr(backend, func))
+
 
-for func in [x for x in dir(implementation) if not x.startswith('_')]:
-    setattr(sys.modules[__name__], func, getattr(implementation, func))
+if os.environ.get("INKYCAL_EPD_BACKEND") == "fake":
+    use_implementation(FakeBackend())
+else:
+    use_implementation(RaspberryPi())
@@ -29,9 +29,12 @@
 import time
 import os
 import logging
+from collections import Counter
 
 from ctypes import *
 
+from inkycal.display.busy import wait_until_idle, DEFAULT_TIMEOUT
+
 EPD_SCK_PIN   =11
 EPD_MOSI_PIN  =10
 
@@ -56,19 +59,81 @@ find_dirs = [
     '/usr/local/lib',
     '/usr/lib',
 ]
-spi = None
-for find_dir in find_dirs:
-    val = int(os.popen('getconf LONG_BIT').read())
-    logging.debug("System is %d bit" % val)
-    if val == 64:
-        so_filename = os.path.join(find_dir, 'epd_12_in_48_lib_64bit.so')
-    else:
-        so_filename = os.path.join(find_dir, 'epd_12_in_48_lib_32bit.so')
-    if os.path.exists(so_filename):
-        spi = CDLL(so_filename)
-        break
-if spi is None:
-    RuntimeError('Cannot find DEV_Config.so')
+
+# Optional helper with DEV_SPI_Write_nByte(), built from epd_12_in_48_bulk.c by installer.py
+BULK_LIBRARY = 'epd_12_in_48_bulk.so'
+
+
+class StubLibrary:
+    """Hardware-free stand-in for the vendor library with the same C functions.
+
+    Selected with ``INKYCAL_EPD_BACKEND=fake``. Bytes written while a chip
+    select is low are collected per CS pin in :attr:`received`, BUSY pins
+    always read idle (1).
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = Counter()
+        self.levels = {}
+        self.received = {}
+
+    def DEV_ModuleInit(self):
+        self.calls["DEV_ModuleInit"] += 1
+        return 0
+
+    def DEV_ModuleExit(self):
+        self.calls["DEV_ModuleExit"] += 1
+
+    def DEV_Digital_Write(self, pin, value):
+        self.calls["DEV_Digital_Write"] += 1
+        self.levels[pin] = value
+
+    def DEV_Digital_Read(self, pin):
+        self.calls["DEV_Digital_Read"] += 1
+        return 1
+
+    def _receive(self, data):
+        for pin in (EPD_M1_CS_PIN, EPD_S1_CS_PIN, EPD_M2_CS_PIN, EPD_S2_CS_PIN):
+            if self.levels.get(pin, 1) == 0:
+                self.received.setdefault(pin, bytearray()).extend(data)
+
+    def DEV_SPI_WriteByte(self, value):
+        self.calls["DEV_SPI_WriteByte"] += 1
+        self._receive(bytes([value]))
+
+    def DEV_SPI_Write_nByte(self, data, length):
+        self.calls["DEV_SPI_Write_nByte"] += 1
+        self._receive(bytes(data[:length]))
+
+    def DEV_SPI_ReadByte(self, reg):
+        self.calls["DEV_SPI_ReadByte"] += 1
+        return 0
+
+
+def _load_library():
+    """Load the vendor library and, if it was built, the bulk write helper"""
+    if os.environ.get("INKYCAL_EPD_BACKEND") == "fake":
+        return StubLibrary(), None
+    bits = int(os.popen('getconf LONG_BIT').read())
+    logging.debug("System is %d bit" % bits)
+    for find_dir in find_dirs:
+        so_filename = os.path.join(find_dir, f'epd_12_in_48_lib_{64 if bits == 64 else 32}bit.so')
+        if os.path.exists(so_filename):
+            # global, so the helper resolves DEV_SPI_WriteByte() from this library
+            library = CDLL(so_filename, mode=RTLD_GLOBAL)
+            bulk_filename = os.path.join(find_dir, BULK_LIBRARY)
+            return library, CDLL(bulk_filename) if os.path.exists(bulk_filename) else None
+    raise RuntimeError('Cannot find DEV_Config.so')
+
+
+spi, bulk = _load_library()
+
+# One call per buffer if available, else one ctypes call per byte
+_write_n_bytes = getattr(bulk or spi, 'DEV_SPI_Write_nByte', None)
+
 
 def digital_write(pin, value):
     spi.DEV_Digital_Write(pin, value)
@@ -76,8 +141,45 @@ def digital_write(pin, value):
 def digital_read(pin):
     return spi.DEV_Digital_Read(pin)
 
+def wait_busy(pin, busy_level, poke=None, timeout=DEFAULT_TIMEOUT):
+    # No edge events through the vendor library, poll with back-off instead
+    return wait_until_idle(lambda: digital_read(pin) & 0x01, busy_level,
+                           poke=poke, timeout=timeout)
+
 def spi_writebyte(value): 
     spi.DEV_SPI_WriteByte(value)
+
+def spi_write_bulk(data):
+    # Keeps DC/CS asserted for the whole buffer
+    data = bytes(data)
+    if _write_n_bytes is not None:
+        _write_n_bytes(data, len(data))
+        return
+    write = spi.DEV_SPI_WriteByte
+    for value in data:
+        write(value)
+
+
+def wait_busy_all(pokes, busy_level, timeout=DEFAULT_TIMEOUT):
+    """Wait for several controllers at once.
+
+    Args:
+        pokes: Status command callback by BUSY pin, only controllers that are
+            still busy are poked and read again.
+    """
+    pending = dict(pokes)
+
+    def poke():
+        for poke_controller in pending.values():
+            poke_controller()
+
+    def read():
+        for pin in list(pending):
+            if digital_read(pin) & 0x01 != busy_level:
+                del pending[pin]
+        return busy_level if pending else busy_level ^ 1
+
+    return wait_until_idle(read, busy_level, poke=poke, timeout=timeout)
  
 def delay_ms(delaytime):
     time.sleep(delaytime / 1000.0)
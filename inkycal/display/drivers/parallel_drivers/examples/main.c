@@ -1,5 +1,6 @@
 #include "../lib/Config/DEV_Config.h"
 #include "example.h"
+#include "render_service.h"
 #include "../lib/GUI/GUI_BMPfile.h"
 
 #include <math.h>
@@ -63,6 +64,7 @@ int main(int argc, char *argv[])
 
     if (argc != 4){
 		Debug("Usage: sudo ./epd -2.51 0 bmp_filepath\r\n");
+		Debug("   or: sudo ./epd -2.51 0 --serve (resident render service)\r\n");
         Debug("To use the test, please navigate to Inkycal/inkycal/display/drivers/parallel_drivers and then run\r\n");
         Debug("Test: sudo ./epd -2.51 0 test\r\n");
         exit(1);
@@ -111,6 +113,13 @@ int main(int argc, char *argv[])
 
 	EPD_IT8951_Clear_Refresh(Dev_Info, Init_Target_Memory_Addr, INIT_Mode);
 
+    if( strcmp(argv[3], "--serve") == 0){
+        //Stay resident and draw frames sent by Inkycal, see render_service.c
+        int ret = Render_Service(Dev_Info, Init_Target_Memory_Addr);
+        DEV_Module_Exit();
+        return ret;
+    }
+
 
 #if(SHOW_BMP)
     //Show a bmp file
@@ -0,0 +1,113 @@
+/*****************************************************************************
+* | File      	:   render_service.c
+* | Function    :   Resident render service for Inkycal
+* | Info        :
+*   Started with "sudo ./epd -VCOM 0 --serve". Instead of loading one BMP and
+*   exiting, the controller stays initialised and frames are read from POSIX
+*   shared memory, one command per line on stdin:
+*
+*     DRAW <shm name> <x> <y> <w> <h> <bpp> <mode>
+*     CLEAR <mode>
+*     SLEEP
+*     QUIT
+*
+*   Every command is answered on stdout with "OK" or "ERR <reason>".
+******************************************************************************/
+#include "render_service.h"
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+
+static void Reply(const char *line)
+{
+    printf("%s\n", line);
+    fflush(stdout);
+}
+
+static int Draw(char *Name, UWORD X, UWORD Y, UWORD W, UWORD H, UBYTE BitsPerPixel, UWORD Mode,
+                UWORD Panel_Width, UWORD Panel_Height, UDOUBLE Target_Memory_Addr)
+{
+    char Path[80];
+    struct stat Info;
+    UDOUBLE Size = ((UDOUBLE)W * BitsPerPixel + 7) / 8 * H;
+
+    if(BitsPerPixel != 1 && BitsPerPixel != 4 && BitsPerPixel != 8){
+        Reply("ERR unsupported bits per pixel");
+        return -1;
+    }
+    if(X + W > Panel_Width || Y + H > Panel_Height){
+        Reply("ERR window exceeds panel");
+        return -1;
+    }
+    //The controller loads whole 16-bit words
+    UWORD Align = (BitsPerPixel == 1) ? 16 : 16 / BitsPerPixel;
+    if(X % Align != 0 || W % Align != 0){
+        Reply("ERR window is not aligned");
+        return -1;
+    }
+
+    snprintf(Path, sizeof(Path), "/%s", Name);
+    int fd = shm_open(Path, O_RDONLY, 0);
+    if(fd < 0){
+        Reply("ERR cannot open shared memory");
+        return -1;
+    }
+    if(fstat(fd, &Info) != 0 || (UDOUBLE)Info.st_size < Size){
+        close(fd);
+        Reply("ERR short buffer");
+        return -1;
+    }
+    UBYTE *Frame_Buf = mmap(NULL, Size, PROT_READ, MAP_SHARED, fd, 0);
+    close(fd);
+    if(Frame_Buf == MAP_FAILED){
+        Reply("ERR cannot map shared memory");
+        return -1;
+    }
+
+    EPD_IT8951_Area_Refresh(Frame_Buf, X, Y, W, H, BitsPerPixel, Mode, Target_Memory_Addr);
+
+    munmap(Frame_Buf, Size);
+    Reply("OK");
+    return 0;
+}
+
+int Render_Service(IT8951_Dev_Info Dev_Info, UDOUBLE Init_Target_Memory_Addr)
+{
+    char Line[256], Name[64];
+    unsigned int X, Y, W, H, BitsPerPixel, Mode;
+    bool Sleeping = false;
+
+    printf("READY %d %d %d\n", Dev_Info.Panel_W, Dev_Info.Panel_H, A2_Mode);
+    fflush(stdout);
+
+    while(fgets(Line, sizeof(Line), stdin) != NULL){
+        if(Sleeping && strncmp(Line, "SLEEP", 5) != 0 && strncmp(Line, "QUIT", 4) != 0){
+            EPD_IT8951_SystemRun();
+            Sleeping = false;
+        }
+
+        if(sscanf(Line, "DRAW %63s %u %u %u %u %u %u", Name, &X, &Y, &W, &H, &BitsPerPixel, &Mode) == 7){
+            Draw(Name, X, Y, W, H, BitsPerPixel, Mode, Dev_Info.Panel_W, Dev_Info.Panel_H, Init_Target_Memory_Addr);
+        }else if(sscanf(Line, "CLEAR %u", &Mode) == 1){
+            EPD_IT8951_Clear_Refresh(Dev_Info, Init_Target_Memory_Addr, Mode);
+            Reply("OK");
+        }else if(strncmp(Line, "SLEEP", 5) == 0){
+            if(!Sleeping){
+                EPD_IT8951_Sleep();
+                Sleeping = true;
+            }
+            Reply("OK");
+        }else if(strncmp(Line, "QUIT", 4) == 0){
+            Reply("OK");
+            break;
+        }else{
+            Reply("ERR unknown command");
+        }
+    }
+
+    if(!Sleeping){
+        EPD_IT8951_Sleep();
+    }
+    return 0;
+}
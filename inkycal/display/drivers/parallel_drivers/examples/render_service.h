@@ -0,0 +1,11 @@
+#ifndef __RENDER_SERVICE__
+#define __RENDER_SERVICE__
+
+#include "../lib/e-Paper/EPD_IT8951.h"
+#include "../lib/Config/DEV_Config.h"
+
+// Keep the controller initialised and draw frames announced on stdin,
+// see inkycal/display/it8951.py for the protocol
+int Render_Service(IT8951_Dev_Info Dev_Info, UDOUBLE Init_Target_Memory_Addr);
+
+#endif
@@ -919,3 +919,45 @@ void EPD_IT8951_8bp_Refresh(UBYTE *Frame_Buf, UWORD X, UWORD Y, UWORD W, UWORD H
         EPD_IT8951_Display_AreaBuf(X, Y, W, H, GC16_Mode, Target_Memory_Addr);
     }
 }
+
+
+/******************************************************************************
+function :	EPD_IT8951_Area_Refresh
+parameter:  Refresh a window from a packed 1bpp, 4bpp or 8bpp buffer with any
+            waveform mode (GC16 for images, DU/A2 for fast black and white updates)
+******************************************************************************/
+void EPD_IT8951_Area_Refresh(UBYTE* Frame_Buf, UWORD X, UWORD Y, UWORD W, UWORD H, UBYTE BitsPerPixel, UWORD Mode, UDOUBLE Target_Memory_Addr)
+{
+    IT8951_Load_Img_Info Load_Img_Info;
+    IT8951_Area_Img_Info Area_Img_Info;
+
+    if(BitsPerPixel == 1)
+    {
+        EPD_IT8951_1bp_Refresh(Frame_Buf, X, Y, W, H, Mode, Target_Memory_Addr, true);
+        return;
+    }
+
+    EPD_IT8951_WaitForDisplayReady();
+
+    Load_Img_Info.Source_Buffer_Addr = (UDOUBLE)Frame_Buf;
+    Load_Img_Info.Endian_Type = IT8951_LDIMG_L_ENDIAN;
+    Load_Img_Info.Pixel_Format = (BitsPerPixel == 8) ? IT8951_8BPP : IT8951_4BPP;
+    Load_Img_Info.Rotate =  IT8951_ROTATE_0;
+    Load_Img_Info.Target_Memory_Addr = Target_Memory_Addr;
+
+    Area_Img_Info.Area_X = X;
+    Area_Img_Info.Area_Y = Y;
+    Area_Img_Info.Area_W = W;
+    Area_Img_Info.Area_H = H;
+
+    if(BitsPerPixel == 8)
+    {
+        EPD_IT8951_HostAreaPackedPixelWrite_8bp(&Load_Img_Info, &Area_Img_Info);
+    }
+    else
+    {
+        EPD_IT8951_HostAreaPackedPixelWrite_4bp(&Load_Img_Info, &Area_Img_Info, true);
+    }
+
+    EPD_IT8951_Display_AreaBuf(X, Y, W, H, Mode, Target_Memory_Addr);
+}
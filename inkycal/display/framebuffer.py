@@ -0,0 +1,326 @@
+"""
+Framebuffer packing helpers shared by the SPI E-Paper drivers.
+
+Every Waveshare driver used to walk each pixel of the frame in Python to build
+its byte buffer. These helpers do the same work with NumPy:
+
+- convert the frame to 1-bit (same dithering as ``Image.convert("1")``)
+- rotate portrait frames into the panel's native (landscape) orientation
+- pack the pixels into bytes with ``np.packbits``
+
+The returned buffers are bit-identical to the output of the legacy per-pixel
+loops and are returned as ``bytearray`` so they can be indexed like a list or
+handed to ``spidev.writebytes2`` directly.
+"""
+import logging
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+def native_mask(image: Image.Image, width: int, height: int) -> Optional[np.ndarray]:
+    """Return a boolean white-mask of the image in the panel's native orientation.
+
+    Args:
+        image (PIL.Image):
+            The frame to convert. Any mode accepted by ``Image.convert("1")``.
+        width (int):
+            Native panel width in pixels.
+        height (int):
+            Native panel height in pixels.
+
+    Returns:
+        numpy.ndarray | None: A ``(height, width)`` array where ``True`` marks a
+        white pixel, or ``None`` if the image matches neither orientation.
+    """
+    mono = image.convert("1")
+    pixels = np.asarray(mono, dtype=bool)
+
+    if mono.size == (width, height):
+        return pixels
+    if mono.size == (height, width):
+        # Portrait frame: pixel (x, y) ends up at (y, height - x - 1)
+        return np.rot90(pixels)
+
+    logger.warning(f"Wrong image dimensions: must be {width}x{height}")
+    return None
+
+
+def pack_1bpp(image: Image.Image, width: int, height: int, invert: bool = False) -> bytearray:
+    """Pack an image into a 1 bit-per-pixel panel buffer (MSB first).
+
+    Args:
+        image (PIL.Image):
+            The frame to pack, either ``width x height`` or ``height x width``.
+        width (int):
+            Native panel width in pixels.
+        height (int):
+            Native panel height in pixels.
+        invert (bool):
+            By default a set bit means white, which is what most controllers
+            expect. Set to ``True`` for controllers where a set bit means black.
+
+    Returns:
+        bytearray: ``width * height / 8`` bytes. A blank (white) buffer is
+        returned if the image has the wrong dimensions.
+    """
+    size = int(width / 8) * height
+    pixels = native_mask(image, width, height)
+
+    if pixels is None:
+        return bytearray([0x00 if invert else 0xFF]) * size
+
+    if invert:
+        pixels = ~pixels
+
+    return bytearray(np.packbits(pixels.ravel())[:size].tobytes())
+
+
+def pack_2bpp(image: Image.Image, width: int, height: int) -> bytearray:
+    """Pack an image into a 2 bits-per-pixel panel buffer.
+
+    Used by older controllers that take two bits per pixel. White pixels are
+    sent as ``0b11`` and black pixels as ``0b00``.
+
+    Args:
+        image (PIL.Image):
+            The frame to pack, either ``width x height`` or ``height x width``.
+        width (int):
+            Native panel width in pixels.
+        height (int):
+            Native panel height in pixels.
+
+    Returns:
+        bytearray: ``width * height / 4`` bytes. An all-zero buffer is returned
+        if the image has the wrong dimensions.
+    """
+    size = int(width * height / 4)
+    pixels = native_mask(image, width, height)
+
+    if pixels is None:
+        return bytearray(size)
+
+    codes = pixels.ravel().astype(np.uint8) * 0x03
+    codes = np.pad(codes, (0, -len(codes) % 4)).reshape(-1, 4)
+    packed = (codes[:, 0] << 6) | (codes[:, 1] << 4) | (codes[:, 2] << 2) | codes[:, 3]
+    return bytearray(packed[:size].tobytes())
+
+
+def invert_buffer(buffer) -> bytearray:
+    """Return a bitwise-inverted copy of a packed buffer."""
+    return bytearray(np.bitwise_xor(np.frombuffer(bytes(buffer), dtype=np.uint8), 0xFF).tobytes())
+
+
+@lru_cache(maxsize=32)
+def solid_bytes(length: int, value: int) -> bytes:
+    """Return ``length`` bytes of ``value``, e.g. to clear a panel.
+
+    The buffers are immutable and cached, so clearing or calibrating a panel
+    again does not allocate (or convert a list of) a whole frame each time.
+    """
+    return bytes((value,)) * length
+
+
+def _join_nibbles(nibbles: np.ndarray) -> bytearray:
+    """Pack a flat array of 4-bit values into bytes, two pixels per byte."""
+    nibbles = nibbles.astype(np.uint8)
+    return bytearray(((nibbles[0::2] << 4) | nibbles[1::2]).tobytes())
+
+
+def expand_2bpp_to_4bpp(buffer) -> bytearray:
+    """Convert a :func:`pack_2bpp` buffer into the 4 bits-per-pixel format.
+
+    The UC8159 based 7.5" and 5.83" controllers expect one nibble per pixel:
+    ``0x3`` for white, ``0x0`` for black and ``0x4`` for red.
+    """
+    data = np.frombuffer(bytes(buffer), dtype=np.uint8)
+    codes = np.stack([(data >> shift) & 0x03 for shift in (6, 4, 2, 0)], axis=1).ravel()
+    return _join_nibbles(np.where(codes == 0x03, 0x03, np.where(codes == 0x00, 0x00, 0x04)))
+
+
+def merge_planes_4bpp(black, colour) -> bytearray:
+    """Merge a black and a colour :func:`pack_1bpp` buffer into one 4 bits-per-pixel buffer.
+
+    A cleared bit in the colour plane wins over the black plane, so a pixel is
+    sent as red (``0x4``), black (``0x0``) or white (``0x3``).
+    """
+    black_bits = np.unpackbits(np.frombuffer(bytes(black), dtype=np.uint8))
+    colour_bits = np.unpackbits(np.frombuffer(bytes(colour), dtype=np.uint8))
+    return _join_nibbles(np.where(colour_bits == 0, 0x04, np.where(black_bits == 0, 0x00, 0x03)))
+
+
+_QUARTER_TURNS = {1: Image.Transpose.ROTATE_90, 2: Image.Transpose.ROTATE_180, 3: Image.Transpose.ROTATE_270}
+
+
+def rotate_frame(frame, turns: int):
+    """Rotate a frame by ``turns`` quarter turns counter-clockwise.
+
+    One turn puts a portrait frame into the scan order of a landscape panel,
+    exactly like :func:`native_mask` does; two turns flip it by 180°.
+
+    Args:
+        frame (PIL.Image | numpy.ndarray):
+            An image or a ``(rows, columns)`` array, e.g. a plane mask.
+        turns (int):
+            Number of quarter turns.
+
+    Returns:
+        The rotated frame, of the same type. Arrays are returned contiguous.
+    """
+    turns %= 4
+    if isinstance(frame, np.ndarray):
+        return np.ascontiguousarray(np.rot90(frame, turns))
+    return frame.transpose(_QUARTER_TURNS[turns]) if turns else frame
+
+
+def rotate_box(box: Tuple[int, int, int, int], size: Tuple[int, int], turns: int) -> Tuple[int, int, int, int]:
+    """Map a box of a frame of ``size`` to the frame rotated by :func:`rotate_frame`."""
+    left, upper, right, lower = box
+    width, height = size
+    for _ in range(turns % 4):
+        left, upper, right, lower = upper, width - right, lower, width - left
+        width, height = height, width
+    return left, upper, right, lower
+
+
+def native_box(box: Tuple[int, int, int, int], image_size: Tuple[int, int], width: int, height: int
+               ) -> Tuple[int, int, int, int]:
+    """Map a box of a frame to the panel's native orientation, aligned to whole bytes.
+
+    Args:
+        box (tuple):
+            ``(left, upper, right, lower)`` in the coordinates of the frame.
+        image_size (tuple):
+            Size of the frame, either ``(width, height)`` or ``(height, width)``.
+        width (int):
+            Native panel width in pixels.
+        height (int):
+            Native panel height in pixels.
+
+    Returns:
+        tuple: ``(left, upper, right, lower)`` in native coordinates. ``left``
+        and ``right`` are widened to multiples of 8 so the window maps onto
+        whole bytes of a :func:`pack_1bpp` buffer.
+    """
+    left, upper, right, lower = box
+    if tuple(image_size) == (height, width):
+        # Portrait frame: pixel (x, y) ends up at (y, height - x - 1)
+        left, upper, right, lower = upper, height - right, lower, height - left
+    elif tuple(image_size) != (width, height):
+        raise ValueError(f"Wrong image dimensions: must be {width}x{height}")
+
+    left = max(0, left // 8 * 8)
+    right = min(width, -(-right // 8) * 8)
+    return left, max(0, upper), right, min(height, lower)
+
+
+def as_rows(buffer, width: int) -> np.ndarray:
+    """View a packed 1 bit-per-pixel buffer as a ``(rows, width / 8)`` byte array."""
+    return np.frombuffer(bytes(buffer), dtype=np.uint8).reshape(-1, width // 8)
+
+
+def native_gray(image: Image.Image, width: int, height: int) -> Optional[np.ndarray]:
+    """Return the 16 grey levels of the image in the panel's native orientation.
+
+    Used by the IT8951 parallel displays. The luminance is computed exactly like
+    the IT8951 BMP loader (``(R*299 + G*587 + B*114 + 500) / 1000``) and
+    reduced to 4 bits, so ``0x0`` is black and ``0xF`` is white.
+
+    Args:
+        image (PIL.Image):
+            The frame to convert, either ``width x height`` or ``height x width``.
+        width (int):
+            Native panel width in pixels.
+        height (int):
+            Native panel height in pixels.
+
+    Returns:
+        numpy.ndarray | None: A ``(height, width)`` ``uint8`` array of levels,
+        or ``None`` if the image matches neither orientation.
+    """
+    rgb = np.asarray(image.convert("RGB"), dtype=np.uint32)
+    levels = ((rgb[..., 0] * 299 + rgb[..., 1] * 587 + rgb[..., 2] * 114 + 500) // 1000 >> 4).astype(np.uint8)
+
+    if image.size == (width, height):
+        return levels
+    if image.size == (height, width):
+        return np.rot90(levels)
+
+    logger.warning(f"Wrong image dimensions: must be {width}x{height}")
+    return None
+
+
+def pack_4bpp(levels: np.ndarray) -> bytearray:
+    """Pack a ``(rows, columns)`` array of 4-bit levels into an IT8951 4bpp buffer.
+
+    The IT8951 loads images little-endian, so the even pixel of every pair is
+    stored in the low nibble and the odd pixel in the high nibble.
+    """
+    levels = np.ascontiguousarray(levels, dtype=np.uint8)
+    return bytearray((levels[:, 0::2] | (levels[:, 1::2] << 4)).tobytes())
+
+
+def pack_8bpp(levels: np.ndarray) -> bytearray:
+    """Pack a ``(rows, columns)`` array of 4-bit levels into an IT8951 8bpp buffer."""
+    return bytearray((np.ascontiguousarray(levels, dtype=np.uint8) << 4).tobytes())
+
+
+def pack_1bpp_lsb(levels: np.ndarray) -> bytearray:
+    """Pack a ``(rows, columns)`` array of 4-bit levels into an IT8951 1bpp buffer.
+
+    Used with the A2 waveform. Like the vendor library (``Paint_SetPixel``
+    stores ``WHITE >> 7``), levels from ``0x8`` up are sent as a set bit
+    (white) and the first pixel of every byte is its least significant bit.
+    ``columns`` must be a multiple of 8.
+    """
+    return bytearray(np.packbits(np.asarray(levels) >= 0x8, axis=1, bitorder="little").tobytes())
+
+
+def _runs(flags: np.ndarray, gap: int) -> List[Tuple[int, int]]:
+    """Return ``[start, end)`` runs of set flags, joining runs closer than ``gap``."""
+    indices = np.flatnonzero(flags)
+    if not len(indices):
+        return []
+    breaks = np.flatnonzero(np.diff(indices) > gap)
+    starts = np.concatenate(([indices[0]], indices[breaks + 1]))
+    ends = np.concatenate((indices[breaks], [indices[-1]])) + 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def changed_boxes(previous: np.ndarray, current: np.ndarray, align: int = 16, gap: int = 32,
+                  limit: int = 16) -> List[Tuple[int, int, int, int]]:
+    """Find the bounding boxes of the pixels that differ between two frames.
+
+    The frame is first split into bands of changed rows, then every band into
+    runs of changed columns. Runs closer than ``gap`` pixels are joined.
+
+    Args:
+        previous (numpy.ndarray):
+            The frame currently on the display, ``(height, width)``.
+        current (numpy.ndarray):
+            The new frame, same shape.
+        align (int):
+            ``left`` and ``right`` are widened to multiples of this.
+        gap (int):
+            Changed areas closer than this many pixels share one box.
+        limit (int):
+            If more boxes are found, a single box around all changes is returned.
+
+    Returns:
+        list: ``(left, upper, right, lower)`` boxes in array coordinates, empty
+        if the frames are identical.
+    """
+    changed = previous != current
+    width = changed.shape[1]
+    boxes = []
+    for upper, lower in _runs(changed.any(axis=1), gap):
+        for left, right in _runs(changed[upper:lower].any(axis=0), gap):
+            boxes.append((left // align * align, upper, min(width, -(-right // align) * align), lower))
+
+    if len(boxes) > limit:
+        boxes = [(min(box[0] for box in boxes), boxes[0][1], max(box[2] for box in boxes), boxes[-1][3])]
+    return boxes
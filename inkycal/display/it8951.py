@@ -0,0 +1,513 @@
+"""
+Resident render service for the IT8951 based parallel E-Paper displays.
+
+The parallel drivers used to save every frame as ``canvas.bmp`` and start
+``sudo parallel_drivers/epd -VCOM 0 canvas.bmp`` for it, paying a BMP encode,
+an SD card write, a process start and a full controller re-init per refresh.
+
+Instead, the ``epd`` binary is now started once with ``--serve`` and kept
+running. Only the windows that changed since the last frame are packed (4bpp,
+or 1bpp for the A2 waveform, see :func:`plan_update`) with NumPy, copied into a
+POSIX shared memory segment and announced over the binary's stdin with a
+one-line text protocol:
+
+- on start the service prints ``READY <panel width> <panel height> <A2 mode>``
+- ``DRAW <shm name> <x> <y> <w> <h> <bpp> <mode>`` refreshes a window from the
+  shared memory segment
+- ``CLEAR <mode>`` refreshes the whole panel to white
+- ``SLEEP`` puts the controller to sleep, the service stays resident
+- ``QUIT`` stops the service
+
+Every command is answered with ``OK [info]`` or ``ERR <reason>``.
+Lines the service prints that do not start with one of the reply keywords (the
+Waveshare library prints debug output to stdout) are logged and skipped.
+
+A stub service implementing the same protocol without any hardware can be run
+with ``python -m inkycal.display.it8951 --stub 1872x1404``; see
+:func:`stub_command`. It lets the throughput of the Python side be measured on
+any machine.
+"""
+import argparse
+import atexit
+import logging
+import os
+import select
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from multiprocessing import shared_memory
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from inkycal.display.busy import DEFAULT_TIMEOUT
+from inkycal.display.framebuffer import changed_boxes, native_gray, pack_1bpp_lsb, pack_4bpp, pack_8bpp
+from inkycal.settings import Settings
+from inkycal.utils.inkycal_exceptions import RenderServiceError
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+# Waveform modes of the IT8951 (A2 depends on the LUT and is reported by the service)
+INIT_MODE = 0
+DU_MODE = 1
+GC16_MODE = 2
+A2_MODE = 6
+
+# Time the service may take to initialise the controller and clear the panel
+START_TIMEOUT = 60
+
+# The controller loads whole 16-bit words, so windows must start and end on these columns
+WINDOW_ALIGN = {1: 16, 4: 4, 8: 2}
+
+# Where POSIX shared memory segments live on Linux
+SHM_DIR = "/dev/shm"
+
+
+class Frame(NamedTuple):
+    """A packed frame or window, ready to be sent to the render service."""
+    data: bytes
+    x: int
+    y: int
+    width: int
+    height: int
+    bpp: int
+    mode: int
+
+
+def native_levels(image: Image.Image, width: int, height: int, mirror: bool = False) -> np.ndarray:
+    """Return the 16 grey levels of a frame in the panel's native orientation.
+
+    Args:
+        image (PIL.Image):
+            The frame, either ``width x height`` or ``height x width``.
+        width (int):
+            Native panel width in pixels.
+        height (int):
+            Native panel height in pixels.
+        mirror (bool):
+            Mirror the frame horizontally, needed by panels like the 10.3".
+
+    Raises:
+        ValueError: If the image matches neither orientation.
+    """
+    levels = native_gray(image, width, height)
+    if levels is None:
+        raise ValueError(f"Wrong image dimensions: must be {width}x{height}")
+    return levels[:, ::-1] if mirror else levels
+
+
+def pack_window(levels: np.ndarray, box: Tuple[int, int, int, int] = None, bpp: int = 4,
+                mode: int = GC16_MODE) -> Frame:
+    """Pack a window of a native frame for the service.
+
+    Args:
+        levels (numpy.ndarray):
+            The complete frame from :func:`native_levels`.
+        box (tuple):
+            ``(left, upper, right, lower)`` of the window, the whole frame by default.
+        bpp (int):
+            ``1`` (A2 waveform only), ``4`` (default) or ``8`` bits per pixel.
+        mode (int):
+            Waveform mode used for the refresh.
+    """
+    left, upper, right, lower = box or (0, 0, levels.shape[1], levels.shape[0])
+    window = levels[upper:lower, left:right]
+    data = {1: pack_1bpp_lsb, 4: pack_4bpp, 8: pack_8bpp}[bpp](window)
+    return Frame(bytes(data), left, upper, right - left, lower - upper, bpp, mode)
+
+
+def pack_frame(image: Image.Image, width: int, height: int, bpp: int = 4, mode: int = GC16_MODE,
+               mirror: bool = False) -> Frame:
+    """Pack a complete frame for the service, see :func:`native_levels`."""
+    return pack_window(native_levels(image, width, height, mirror), bpp=bpp, mode=mode)
+
+
+def _is_monochrome(levels: np.ndarray) -> bool:
+    return not np.any((levels != 0x0) & (levels != 0xF))
+
+
+def plan_update(previous: Optional[np.ndarray], levels: np.ndarray, a2_mode: int = A2_MODE,
+                max_area: float = 0.5) -> List[Frame]:
+    """Work out the windows and waveforms needed to turn ``previous`` into ``levels``.
+
+    Only the bounding boxes of changed pixels are sent. Each window gets the
+    fastest waveform that can show it cleanly:
+
+    - ``A2`` with a 1bpp buffer if the window is black and white before and after
+      (e.g. a line of non anti-aliased text in the agenda),
+    - ``DU`` with a 4bpp buffer if all changed pixels become black or white,
+    - ``GC16`` with a 4bpp buffer otherwise (images, grey levels).
+
+    A complete ``GC16`` frame is returned if there is no previous frame or if
+    the changed windows cover more than ``max_area`` of the panel.
+    """
+    if previous is None or previous.shape != levels.shape:
+        return [pack_window(levels)]
+
+    boxes = changed_boxes(previous, levels)
+    if sum((right - left) * (lower - upper) for left, upper, right, lower in boxes) > max_area * levels.size:
+        return [pack_window(levels)]
+
+    frames = []
+    for left, upper, right, lower in boxes:
+        new, old = levels[upper:lower, left:right], previous[upper:lower, left:right]
+        if _is_monochrome(new) and _is_monochrome(old):
+            frames.append(pack_window(levels, (left, upper, right, lower), bpp=1, mode=a2_mode))
+        elif _is_monochrome(new[new != old]):
+            # DU only drives the pixels that change, grey neighbours are kept
+            frames.append(pack_window(levels, (left, upper, right, lower), mode=DU_MODE))
+        else:
+            frames.append(pack_window(levels, (left, upper, right, lower)))
+    return frames
+
+
+class RenderService:
+    """Client of a resident IT8951 render service.
+
+    The service process is started lazily on the first call and restarted if it
+    died. A single shared memory segment is reused for all frames.
+
+    Args:
+        command (list):
+            Command line starting the service, e.g. from :func:`service_command`
+            or :func:`stub_command`.
+        timeout (float):
+            Seconds to wait for the reply to a command.
+
+    Example:
+        >>> service = RenderService(stub_command(1872, 1404))
+        >>> service.draw(pack_frame(image, 1872, 1404))
+        'OK ...'
+        >>> service.close()
+    """
+
+    def __init__(self, command: List[str], timeout: float = DEFAULT_TIMEOUT):
+        self.command = list(command)
+        self.timeout = timeout
+        self.panel_size: Optional[Tuple[int, int]] = None
+        self.a2_mode = A2_MODE
+        self.starts = 0
+        self.frames = 0
+        self.bytes_sent = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._pending = b""
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> Tuple[int, int]:
+        """Start the service if it is not running and return the panel size."""
+        with self._lock:
+            return self._start()
+
+    def _start(self) -> Tuple[int, int]:
+        if self.running:
+            return self.panel_size
+
+        self._stop_process()
+        logger.info(f"Starting render service: {' '.join(self.command)}")
+        try:
+            self._process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        except OSError as error:
+            raise RenderServiceError(f"Could not start render service: {error}") from error
+
+        self._pending = b""
+        reply = self._reply(START_TIMEOUT, ("READY",))
+        try:
+            _, panel_width, panel_height, *a2_mode = reply.split()
+            self.panel_size = (int(panel_width), int(panel_height))
+            self.a2_mode = int(a2_mode[0]) if a2_mode else A2_MODE
+        except ValueError as error:
+            raise RenderServiceError(f"Malformed greeting from render service: {reply!r}") from error
+        # The panel is cleared whenever the service (re)starts
+        self.starts += 1
+        return self.panel_size
+
+    def draw(self, frame: Frame) -> str:
+        """Send a frame (or window) and return the service's reply."""
+        with self._lock:
+            self._start()
+            segment = self._segment(len(frame.data))
+            segment.buf[:len(frame.data)] = frame.data
+            reply = self._request(
+                f"DRAW {segment.name} {frame.x} {frame.y} {frame.width} {frame.height} {frame.bpp} {frame.mode}")
+            self.frames += 1
+            self.bytes_sent += len(frame.data)
+            return reply
+
+    def clear(self, mode: int = INIT_MODE) -> str:
+        """Refresh the whole panel to white."""
+        with self._lock:
+            self._start()
+            return self._request(f"CLEAR {mode}")
+
+    def sleep(self) -> None:
+        """Put the controller to sleep, keeping the service resident."""
+        with self._lock:
+            if self.running:
+                self._request("SLEEP")
+
+    def close(self) -> None:
+        """Stop the service and release the shared memory."""
+        with self._lock:
+            if self.running:
+                try:
+                    self._request("QUIT", timeout=5)
+                except RenderServiceError:
+                    pass
+            self._stop_process()
+            if self._shm is not None:
+                self._shm.close()
+                self._shm.unlink()
+                self._shm = None
+
+    def _segment(self, size: int) -> shared_memory.SharedMemory:
+        if self._shm is None or self._shm.size < size:
+            if self._shm is not None:
+                self._shm.close()
+                self._shm.unlink()
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+        return self._shm
+
+    def _request(self, line: str, timeout: Optional[float] = None) -> str:
+        try:
+            self._process.stdin.write(line.encode() + b"\n")
+            self._process.stdin.flush()
+        except (BrokenPipeError, OSError) as error:
+            self._stop_process()
+            raise RenderServiceError(f"Render service is not reachable: {error}") from error
+
+        reply = self._reply(self.timeout if timeout is None else timeout, ("OK", "ERR"))
+        if reply.startswith("ERR"):
+            raise RenderServiceError(f"Render service failed '{line}': {reply[3:].strip()}")
+        return reply
+
+    def _reply(self, timeout: float, keywords: Tuple[str, ...]) -> str:
+        """Read lines until one starts with one of ``keywords``."""
+        deadline = time.monotonic() + timeout
+        stdout = self._process.stdout.fileno()
+        while True:
+            while b"\n" in self._pending:
+                raw, self._pending = self._pending.split(b"\n", 1)
+                line = raw.decode(errors="replace").strip()
+                if line.split(" ", 1)[0] in keywords:
+                    return line
+                if line:
+                    logger.debug(f"render service: {line}")
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._stop_process()
+                raise RenderServiceError(f"Render service did not reply within {timeout} seconds")
+
+            readable, _, _ = select.select([stdout], [], [], remaining)
+            if readable:
+                chunk = os.read(stdout, 4096)
+                if not chunk:
+                    self._stop_process()
+                    raise RenderServiceError("Render service exited unexpectedly")
+                self._pending += chunk
+
+    def _stop_process(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def service_command(vcom: str = None, epd_mode: int = 0) -> List[str]:
+    """Command line of the resident ``epd`` binary of the parallel drivers."""
+    vcom = settings.VCOM if vcom is None else vcom
+    return ["sudo", os.path.join(settings.PARALLEL_DRIVER_PATH, "epd"), f"-{vcom}", str(epd_mode), "--serve"]
+
+
+def stub_command(width: int, height: int, delay: float = 0.0) -> List[str]:
+    """Command line of the hardware-free stub service, see :func:`serve_stub`."""
+    return [sys.executable, "-m", "inkycal.display.it8951", "--stub", f"{width}x{height}", "--delay", str(delay)]
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_service(command: List[str]) -> RenderService:
+    """Return the process-wide :class:`RenderService` for ``command``."""
+    with _services_lock:
+        key = tuple(command)
+        if key not in _services:
+            _services[key] = RenderService(command)
+        return _services[key]
+
+
+@atexit.register
+def _close_services() -> None:
+    for service in list(_services.values()):
+        service.close()
+
+
+class ParallelEPD:
+    """Common driver of the IT8951 parallel displays.
+
+    ``getbuffer`` converts the frame to native grey levels and ``display``
+    sends only what changed since the last frame to the resident render
+    service (see :func:`plan_update`). A complete ``GC16`` refresh is done for
+    the first frame, after the service restarted and after every
+    ``full_refresh_interval`` region updates to clear ghosting.
+
+    If the service cannot be used (e.g. the ``epd`` binary was not rebuilt with
+    ``--serve`` support), the frame is sent the old way: saved as
+    ``canvas.bmp`` and passed to a one-shot ``epd`` call.
+
+    Subclasses set ``width``/``height`` (native panel size) and ``mirror``.
+    """
+    width: int
+    height: int
+    mirror = False
+    regions = True
+    full_refresh_interval = 10
+
+    def __init__(self):
+        self.service = get_service(service_command())
+        self.service_failed = False
+        self._previous: Optional[np.ndarray] = None
+        self._previous_start = 0
+        self._region_updates = 0
+
+    def init(self):
+        pass
+
+    def getbuffer(self, image: Image.Image) -> np.ndarray:
+        return native_levels(image, self.width, self.height, self.mirror)
+
+    def display(self, levels: np.ndarray):
+        """Displays a frame converted by :meth:`getbuffer`"""
+        if not self.service_failed:
+            try:
+                self._display_service(levels)
+                return
+            except RenderServiceError as error:
+                logger.warning(f"{error}. Falling back to one-shot epd calls.")
+                self.service_failed = True
+                self._previous = None
+        self._display_bmp(levels)
+
+    def _display_service(self, levels: np.ndarray):
+        self.service.start()
+        previous = self._previous
+        if (not self.regions or self._previous_start != self.service.starts
+                or self._region_updates >= self.full_refresh_interval):
+            previous = None
+
+        frames = plan_update(previous, levels, a2_mode=self.service.a2_mode)
+        # Forget the frame on the panel until all windows were drawn
+        self._previous = None
+        for frame in frames:
+            self.service.draw(frame)
+
+        is_full = len(frames) == 1 and frames[0].width * frames[0].height == levels.size
+        self._region_updates = 0 if is_full else self._region_updates + 1
+        self._previous, self._previous_start = levels, self.service.starts
+        logger.debug(f"Sent {len(frames)} window(s), {sum(len(frame.data) for frame in frames)} bytes")
+
+    def _display_bmp(self, levels: np.ndarray):
+        path = os.path.join(settings.IMAGE_FOLDER, "canvas.bmp")
+        Image.fromarray(levels * 17).convert("RGB").save(path, "BMP")
+        try:
+            subprocess.run(["sudo", os.path.join(settings.PARALLEL_DRIVER_PATH, "epd"), f"-{settings.VCOM}", "0",
+                            path])
+        except OSError:
+            print("oops, something didn't work right :/")
+
+    def sleep(self):
+        if not self.service_failed:
+            try:
+                self.service.sleep()
+            except RenderServiceError as error:
+                logger.warning(f"Could not put the display to sleep: {error}")
+
+
+def serve_stub(width: int, height: int, delay: float = 0.0, stdin=None, stdout=None) -> None:
+    """Run a hardware-free render service speaking the same protocol as ``epd --serve``.
+
+    Every ``DRAW`` is read from shared memory and answered with
+    ``OK <crc32 of the window> <total frames> <total bytes>`` so clients can
+    check what arrived. ``delay`` simulates the controller's refresh time.
+    """
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+
+    def reply(line: str):
+        stdout.write(line.encode() + b"\n")
+        stdout.flush()
+
+    frames = total = 0
+    reply(f"READY {width} {height} {A2_MODE}")
+    for raw in stdin:
+        parts = raw.decode().split()
+        if not parts:
+            continue
+        command = parts[0]
+        if command == "DRAW" and len(parts) == 8:
+            name, (x, y, w, h, bpp, mode) = parts[1], map(int, parts[2:])
+            size = (w * bpp + 7) // 8 * h
+            if x < 0 or y < 0 or x + w > width or y + h > height:
+                reply(f"ERR window {x},{y},{w},{h} exceeds panel {width}x{height}")
+                continue
+            if bpp not in WINDOW_ALIGN or x % WINDOW_ALIGN[bpp] or w % WINDOW_ALIGN[bpp]:
+                reply(f"ERR window {x},{y},{w},{h} is not aligned for {bpp}bpp")
+                continue
+            try:
+                with open(os.path.join(SHM_DIR, name), "rb") as segment:
+                    data = segment.read(size)
+            except OSError as error:
+                reply(f"ERR {error}")
+                continue
+            if len(data) != size:
+                reply(f"ERR short buffer ({len(data)} of {size} bytes)")
+                continue
+            time.sleep(delay)
+            frames += 1
+            total += size
+            reply(f"OK {zlib.crc32(data):08x} {frames} {total}")
+        elif command == "CLEAR":
+            time.sleep(delay)
+            reply("OK")
+        elif command == "SLEEP":
+            reply("OK")
+        elif command == "QUIT":
+            reply("OK")
+            return
+        else:
+            reply(f"ERR unknown command {command}")
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stub", metavar="WIDTHxHEIGHT", required=True,
+                        help="run the hardware-free stub service for a panel of this size")
+    parser.add_argument("--delay", type=float, default=0.0, help="simulated refresh time in seconds")
+    args = parser.parse_args(argv)
+    width, height = map(int, args.stub.lower().split("x"))
+    serve_stub(width, height, args.delay)
+
+
+if __name__ == "__main__":
+    main()
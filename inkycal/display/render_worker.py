@@ -0,0 +1,105 @@
+"""
+Background rendering for the E-Paper displays.
+
+A full refresh (init, SPI transfer, BUSY wait, sleep) takes 20-40 seconds on
+colour panels. :class:`RenderWorker` runs it in a dedicated thread, so the
+caller, e.g. the asyncio loop of ``Inkycal.run()``, can keep fetching data
+while the panel updates.
+
+Only one frame is kept waiting: submitting a frame while another one has not
+been started yet replaces (cancels) it, as only the newest frame is worth
+showing. A frame that is already being rendered is never interrupted.
+"""
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RenderWorker:
+    """Runs render jobs one after the other in a background thread.
+
+    Args:
+        name (str):
+            Name of the worker thread.
+
+    Examples:
+        >>> worker = RenderWorker()
+        >>> future = worker.submit(lambda: display.render(im_black))
+        >>> await asyncio.wrap_future(future)  # only if the caller must wait
+    """
+
+    def __init__(self, name: str = "render") -> None:
+        self._condition = threading.Condition()
+        self._pending: Optional[Tuple[Future, Callable[[], object]]] = None
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, job: Callable[[], object]) -> Future:
+        """Queue ``job``, replacing a job that is still waiting.
+
+        Returns:
+            concurrent.futures.Future: Result of ``job``. It is cancelled if a
+            newer job is submitted before this one started.
+
+        Raises:
+            RuntimeError: If the worker was closed.
+        """
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("RenderWorker is closed")
+            superseded, self._pending = self._pending, (future, job)
+            self._condition.notify_all()
+
+        if superseded is not None and superseded[0].cancel():
+            logger.info("Dropped a frame which was still waiting for the display, a newer one replaces it")
+        return future
+
+    @property
+    def idle(self) -> bool:
+        """True if no job is running or waiting."""
+        with self._condition:
+            return not self._busy and self._pending is None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until all submitted jobs are done.
+
+        Returns:
+            bool: False if ``timeout`` seconds passed first.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._busy and self._pending is None, timeout)
+
+    def close(self, wait: bool = True) -> None:
+        """Stop the worker after the waiting job (if any) has been rendered."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._closed)
+                if self._pending is None:
+                    return
+                (future, job), self._pending = self._pending, None
+                self._busy = True
+
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(job())
+                    except BaseException as error:
+                        logger.exception("Rendering failed")
+                        future.set_exception(error)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
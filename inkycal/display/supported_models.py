@@ -1,38 +1,109 @@
-supported_models = {
-    "epd_13_in_3": (960, 680),
-    "epd_13_in_3_colour": (960, 680),
-    "epd_12_in_48": (1304, 984),
-    "epd_7_in_5_colour": (640, 384),
-    "9_in_7": (1200, 825),
-    "epd_5_in_83_colour": (600, 448),
-    "epd_12_in_48_colour": (1304, 984),
-    "epd_4_in_2_colour": (400, 300),
-    "epd_7_in_5_v2": (800, 480),
-    "epd_12_in_48_colour_V2": (1304, 984),
-    "epd_7_in_5": (640, 384),
-    "epd_5_in_83_V2": (648, 480),
-    "epd5in83b_V2": (648, 480),
-    "epd_7_in_5_v3": (880, 528),
-    "10_in_3": (1872, 1404),
-    "epd_7_in_5_v2_colour": (800, 480),
-    "epd_4_in_2": (400, 300),
-    "7_in_8": (1872, 1404),
-    "epd_7_in_5_v3_colour": (880, 528),
-    "epd_5_in_83": (600, 448),
-    "image_file": (800, 480),
-    "image_file_12_in_48": (1304, 984),
+"""
+Registry of the supported display models and what their drivers can do.
+
+:class:`Display` reads the capabilities of the selected model to pick its
+render path (colour planes, windowed partial refresh, SPI clock) instead of
+guessing them from the model name.
+"""
+from typing import NamedTuple, Optional, Tuple
+
+# Clock the Waveshare SPI drivers have always been run at
+DEFAULT_SPI_HZ = 4000000
+
+
+class DisplayCapabilities(NamedTuple):
+    """What the driver of a display model supports."""
+
+    # (width, height) in pixels, as listed in the Web-UI
+    resolution: Tuple[int, int]
+    # Bits per pixel of the buffers sent to the panel
+    bit_depth: int = 1
+    # Number of buffers passed to display(), 2 for black + colour panels
+    planes: int = 1
+    # The driver has init_part() and display_Partial(window, x0, y0, x1, y1)
+    partial_refresh: bool = False
+    # The driver has getbuffer_4Gray() and display_4Gray()
+    gray4: bool = False
+    # Orientation of the panel's own pixel rows, "landscape" or "portrait"
+    native_orientation: str = "landscape"
+    # Highest SPI clock the driver is run at, None if the clock is not set by Inkycal
+    max_spi_hz: Optional[int] = DEFAULT_SPI_HZ
+    # Whole planes are streamed in bulk transfers instead of one call per byte
+    bulk_write: bool = True
+    # "spi", "parallel" (IT8951 render service) or "file"
+    interface: str = "spi"
+
+    @property
+    def colour(self) -> bool:
+        """True if the panel shows a colour (red/yellow) plane besides black."""
+        return self.planes > 1
+
+
+_SPI_1BPP = DisplayCapabilities((0, 0))
+_SPI_COLOUR = _SPI_1BPP._replace(planes=2)
+# UC8159 controllers take one nibble per pixel, colour panels merge both planes into it
+_SPI_4BPP = _SPI_1BPP._replace(bit_depth=4)
+_SPI_4BPP_COLOUR = _SPI_4BPP._replace(planes=2)
+# The 12.48" vendor library runs its own (software) SPI clock
+_QUAD_PANEL = _SPI_1BPP._replace(max_spi_hz=None)
+_PARALLEL = DisplayCapabilities((0, 0), bit_depth=4, max_spi_hz=None, bulk_write=False, interface="parallel")
+_FILE = DisplayCapabilities((0, 0), max_spi_hz=None, bulk_write=False, interface="file")
+
+display_capabilities = {
+    "epd_13_in_3": _SPI_1BPP._replace(resolution=(960, 680), gray4=True),
+    "epd_13_in_3_colour": _SPI_COLOUR._replace(resolution=(960, 680)),
+    "epd_12_in_48": _QUAD_PANEL._replace(resolution=(1304, 984)),
+    "epd_7_in_5_colour": _SPI_4BPP_COLOUR._replace(resolution=(640, 384)),
+    "9_in_7": _PARALLEL._replace(resolution=(1200, 825)),
+    "epd_5_in_83_colour": _SPI_4BPP_COLOUR._replace(resolution=(600, 448)),
+    "epd_12_in_48_colour": _QUAD_PANEL._replace(resolution=(1304, 984), planes=2),
+    "epd_4_in_2_colour": _SPI_COLOUR._replace(resolution=(400, 300)),
+    "epd_7_in_5_v2": _SPI_1BPP._replace(resolution=(800, 480), partial_refresh=True),
+    "epd_12_in_48_colour_V2": _QUAD_PANEL._replace(resolution=(1304, 984), planes=2),
+    "epd_7_in_5": _SPI_4BPP._replace(resolution=(640, 384)),
+    "epd_5_in_83_V2": _SPI_1BPP._replace(resolution=(648, 480)),
+    "epd5in83b_V2": _SPI_COLOUR._replace(resolution=(648, 480)),
+    "epd_7_in_5_v3": _SPI_1BPP._replace(resolution=(880, 528)),
+    "10_in_3": _PARALLEL._replace(resolution=(1872, 1404)),
+    "epd_7_in_5_v2_colour": _SPI_COLOUR._replace(resolution=(800, 480)),
+    "epd_4_in_2": _SPI_1BPP._replace(resolution=(400, 300), gray4=True),
+    "7_in_8": _PARALLEL._replace(resolution=(1872, 1404)),
+    "epd_7_in_5_v3_colour": _SPI_COLOUR._replace(resolution=(880, 528)),
+    "epd_5_in_83": _SPI_4BPP._replace(resolution=(600, 448)),
+    "image_file": _FILE._replace(resolution=(800, 480)),
+    "image_file_12_in_48": _FILE._replace(resolution=(1304, 984)),
 }
 
+supported_models = {model: capabilities.resolution for model, capabilities in display_capabilities.items()}
+
+
+def get_capabilities(model_name: str) -> DisplayCapabilities:
+    """Return the capabilities of a supported display model.
+
+    Raises:
+        KeyError: If the model is not supported.
+    """
+    return display_capabilities[model_name]
+
 
 # Keep hardware-specific behavior keyed off the model registry instead of
 # driver file names so new parallel displays can be added in one place.
 parallel_display_models = {
-    "7_in_8",
-    "9_in_7",
-    "10_in_3",
+    model for model, capabilities in display_capabilities.items() if capabilities.interface == "parallel"
 }
 
 
 def is_parallel_display(model_name: str) -> bool:
     """Return True when the selected model uses a parallel display path."""
     return model_name in parallel_display_models
+
+
+# Drivers providing init_part() and display_Partial() for windowed updates
+partial_refresh_models = {
+    model for model, capabilities in display_capabilities.items() if capabilities.partial_refresh
+}
+
+
+def supports_partial_refresh(model_name: str) -> bool:
+    """Return True when the selected model can refresh a window of the screen."""
+    return model_name in partial_refresh_models
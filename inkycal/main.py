@@ -8,10 +8,10 @@ import hashlib
 import json
 import os.path
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Optional
 
 import arrow
-import numpy
 
 import logging
 
@@ -19,16 +19,18 @@ from PIL import Image
 import importlib
 
 from inkycal.display import Display
+from inkycal.display.render_worker import RenderWorker
 from inkycal.display.supported_models import is_parallel_display
 from inkycal.modules import InkycalModuleImporter
 from inkycal.settings import Settings
 from inkycal.utils.canvas import Canvas
 from inkycal.utils.enums import FONTS
 
-from inkycal.utils.functions import get_system_tz, draw_border_2, get_inkycal_version
+from inkycal.utils.functions import get_system_tz, draw_border_2, get_inkycal_version, network_available
 from inkycal.utils.inky_image import Inkyimage as Images
-from inkycal.utils import JSONCache
+from inkycal.utils import JSONCache, ImageSink
 from inkycal.utils.inkycal_exceptions import SettingsFileNotFoundError
+from inkycal.utils.metrics import CycleMetrics, MetricsLog
 
 logger = logging.getLogger(__name__)
 
@@ -122,6 +124,15 @@ class Inkycal:
 
         self.show_border = self.settings.get('border_around_modules', False)
 
+        # Module and canvas images are handed over in memory. Writing them to the
+        # image folder as PNG is only needed for debugging, and done in the background.
+        self.write_debug_images = self.settings.get('write_debug_images', False)
+        self._image_sink = ImageSink(settings.IMAGE_FOLDER)
+        self._module_images = {}
+        self._canvas_black = None
+        self._canvas_colour = None
+        self._planes = None
+
         self.cleanup()
 
         # Load drivers if image should be rendered
@@ -131,7 +142,8 @@ class Inkycal:
             self.Display = Display(self.settings["model"])
 
             # check if colours can be rendered
-            self.supports_colour = True if 'colour' in self.settings['model'] else False
+            self.supports_colour = self.Display.supports_colour
+            self._scan_turns = self._native_turns(self.Display.capabilities, self.settings['orientation'])
             self.optimize = not is_parallel_display(self.settings["model"])
 
             # get calibration hours
@@ -140,6 +152,19 @@ class Inkycal:
             # init calibration state
             self._calibration_state = False
 
+            # Refresh only changed module regions on displays that support it.
+            # A full refresh is forced every `full_refresh_interval` cycles to clear ghosting.
+            self.partial_refresh = self.settings.get('partial_refresh', False) and self.Display.supports_partial_refresh
+            self._full_refresh_interval = self.settings.get('full_refresh_interval', 10)
+            self._partial_refreshes = 0
+            self._last_frame = None
+
+            # The display is refreshed in the background while the next cycle is prepared
+            self._render_worker = RenderWorker()
+            self._render_future = None
+            # first exception of a render which was not raised yet
+            self._render_error = None
+
         # Load and initialise modules specified in the settings file
         self._module_number = 1
 
@@ -181,6 +206,25 @@ class Inkycal:
             except Exception as e:
                 logger.exception(f"Unexpected exception while loading {module_name}: {e}")
 
+        # All modules share one memoized connectivity check per cycle
+        network_available.configure(host=self.settings.get('network_check_host'),
+                                    port=self.settings.get('network_check_port'),
+                                    ttl=self.settings.get('network_check_ttl'))
+
+        # Modules are generated concurrently. Each one has `module_timeout` seconds to finish,
+        # set `module_workers` to 1 to generate them one after the other.
+        self.module_timeout = self.settings.get('module_timeout', 120)
+        workers = self.settings.get('module_workers') or max(1, self._module_number - 1)
+        self._module_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="module")
+        self._module_futures = {}
+
+        # Images of modules reporting an input fingerprint, reused while it does not change
+        self._module_memo = {}
+
+        # Per-phase timings of every cycle, served by the web-ui at /api/metrics
+        self._metrics = CycleMetrics()
+        self._metrics_log = MetricsLog()
+
         # Remove old hashes
         self._remove_hashes(settings.IMAGE_FOLDER)
 
@@ -272,8 +316,10 @@ class Inkycal:
         for each module and initializes the module. Tries to run the module and
         checks if the images could be generated correctly.
 
-        Generated images can be found in the /images folder of Inkycal.
+        Generated images can be found in the image_folder of Inkycal.
         """
+        self.write_debug_images = True
+
         logger.info(f'Selected E-paper display: {self.settings["model"]}')
 
         # store module numbers in here
@@ -282,10 +328,10 @@ class Inkycal:
         # short info for info-section
         self.info = f"{arrow.now().format('D MMM @ HH:mm')}  "
 
+        failed = self.process_modules()
         for number in range(1, self._module_number):
-            name = eval(f"self.module_{number}.name")
-            success = self.process_module(number)
-            if success:
+            name = getattr(self, f"module_{number}").name
+            if number not in failed:
                 logger.debug(f'Image of module {name} generated successfully')
             else:
                 logger.warning(f'Generating image of module {name} failed!')
@@ -297,6 +343,7 @@ class Inkycal:
         del errors
 
         self._assemble()
+        self._image_sink.flush()
 
     def _image_hash(self, _in):
         """Create a md5sum of a path or a bytes stream."""
@@ -322,9 +369,13 @@ class Inkycal:
         with open(path, "w") as o:
             o.write(self._image_hash(_in))
 
-    def _needs_image_update(self, _list):
+    def _needs_image_update(self, _list, metrics=None):
         """Check if any image has been updated or not.
         Input a list of tuples(str, image)."""
+        with (metrics or self._metrics).phase("hash"):
+            return self._compare_image_hashes(_list)
+
+    def _compare_image_hashes(self, _list):
         res = False
         for item in _list:
             _a = self._image_hash(item[0])
@@ -350,18 +401,19 @@ class Inkycal:
         # Get the time of initial run
         runtime = arrow.now()
 
-        # Function to flip images upside down
-        upside_down = lambda image: image.rotate(180, expand=True)
-
         logger.info(f'Inkycal version: v{self._release}')
         logger.info(f'Selected E-paper display: {self.settings["model"]}')
 
         while True:
             logger.info("Starting new cycle...")
+            self._metrics = CycleMetrics()
             current_time = arrow.now(tz=get_system_tz())
             logger.info(f"Timestamp: {current_time.format('HH:mm:ss DD.MM.YYYY')}")
             self.cache_data["counter"] = self.counter
 
+            # Probe the network at most once per cycle
+            network_available.invalidate()
+
             errors = []  # Store module numbers in here
 
             # Short info for info-section
@@ -370,11 +422,12 @@ class Inkycal:
             else:
                 self.info = ""
 
-            for number in range(1, self._module_number):
-                success = self.process_module(number)
-                if not success:
-                    errors.append(number)
-                    self.info += f"im {number}: X  "
+            with self._metrics.phase("modules"):
+                failed = self.process_modules()
+            for number in failed:
+                errors.append(number)
+                self.info += f"im {number}: X  "
+            self._metrics.extra["failed"] = failed
 
             if errors:
                 logger.error("Error/s in modules: %s", ", ".join(str(err) for err in errors))
@@ -394,44 +447,18 @@ class Inkycal:
                     self.info += f"Battery: {self.battery_capacity}% "
 
             # Assemble image from each module - add info section if specified
-            self._assemble()
+            with self._metrics.phase("assemble"):
+                self._assemble()
 
             # Check if image should be rendered
             if self.render:
+                self._raise_render_error()
                 logger.info("Attempting to render image on display...")
-                display = self.Display
-                self._calibration_check()
-                if self._calibration_state:
-                    # After calibration, we have to forcefully rewrite the screen
-                    self._remove_hashes(settings.IMAGE_FOLDER)
-
-                if self.supports_colour:
-                    im_black = Image.open(os.path.join(settings.IMAGE_FOLDER, "canvas.png"))
-                    im_colour = Image.open(os.path.join(settings.IMAGE_FOLDER, "canvas_colour.png"))
-
-                    # Flip the image by 180° if required
-                    if self.settings['orientation'] == 180:
-                        im_black = upside_down(im_black)
-                        im_colour = upside_down(im_colour)
-
-                    # Render the image on the display
-                    if not self.settings.get('image_hash', False) or self._needs_image_update([
-                        (f"{settings.IMAGE_FOLDER}/canvas.png.hash", im_black),
-                        (f"{settings.IMAGE_FOLDER}/canvas_colour.png.hash", im_colour)
-                    ]):
-                        display.render(im_black, im_colour)
-
-                # Part for black-white ePapers
-                else:
-                    im_black = self._merge_bands()
-
-                    # Flip the image by 180° if required
-                    if self.settings['orientation'] == 180:
-                        im_black = upside_down(im_black)
-
-                    if not self.settings.get('image_hash', False) or self._needs_image_update([
-                        (f"{settings.IMAGE_FOLDER}/canvas.png.hash", im_black), ]):
-                        display.render(im_black)
+                # Frames come out in the display's scan order, flipped by 180° if required
+                frames = self._display_frames()
+                self._render_future = self._submit_render(frames, self._metrics)
+            else:
+                self._metrics_log.append(self._metrics)
 
             logger.info(f'No errors since {self.counter} display updates')
             logger.info(f'program started {runtime.humanize()}')
@@ -441,6 +468,7 @@ class Inkycal:
 
             # Exit the loop if run_once is True
             if run_once:
+                await self._wait_for_render()
                 break  # Exit the loop after one full cycle if run_once is True
 
             sleep_time = self.countdown()
@@ -451,6 +479,7 @@ class Inkycal:
                 if result:
                     logger.info(f"Alarm set for {sleep_time_rtc.format('HH:mm:ss')}")
                     if self.shutdown_after_run:
+                        await self._wait_for_render()
                         logger.warning("System shutdown in 5 seconds!")
                         time.sleep(5)
                         self._shutdown_system()
@@ -460,29 +489,184 @@ class Inkycal:
 
             await asyncio.sleep(sleep_time)
 
+    def _submit_render(self, frames, metrics):
+        """Queue the frames of a cycle for the render worker, a frame still waiting is dropped"""
+        # captured now, the next cycle reassembles the canvas while the worker renders
+        regions = self._module_regions()
+        future = self._render_worker.submit(lambda: self._render_frames(frames, regions, metrics))
+        future.add_done_callback(lambda done: self._render_done(done, metrics))
+        return future
+
+    def _render_done(self, future, metrics):
+        """Log the metrics of a cycle once its frames were rendered, dropped or failed"""
+        if future.cancelled():
+            metrics.extra["render"] = "superseded"
+        elif future.exception() is not None:
+            metrics.extra["render"] = "failed"
+            # kept until the next cycle, even if a newer frame was submitted meanwhile
+            if self._render_error is None:
+                self._render_error = future.exception()
+        else:
+            metrics.extra["render"] = "done"
+        self._metrics_log.append(metrics)
+
+    async def _wait_for_render(self):
+        """Wait until the last submitted frames are on the display"""
+        if self._render_future is not None and not self._render_future.cancelled():
+            await asyncio.wait([asyncio.wrap_future(self._render_future)])
+        self._raise_render_error()
+
+    def _raise_render_error(self):
+        """Raise the exception of a failed render, rendering errors stop Inkycal like before"""
+        error, self._render_error = self._render_error, None
+        if error is not None:
+            raise error
+
+    def _render_frames(self, frames, regions, metrics):
+        """Calibrate if due and render the frames of one cycle. Runs in the render worker."""
+        display = self.Display
+        display.timings = {}
+        self._calibration_check()
+        if self._calibration_state:
+            # After calibration, we have to forcefully rewrite the screen
+            self._remove_hashes(settings.IMAGE_FOLDER)
+
+        if self.supports_colour:
+            im_black, im_colour = frames
+
+            # Render the image on the display
+            if not self.settings.get('image_hash', False) or self._needs_image_update([
+                (f"{settings.IMAGE_FOLDER}/canvas.png.hash", im_black),
+                (f"{settings.IMAGE_FOLDER}/canvas_colour.png.hash", im_colour)
+            ], metrics):
+                display.render(im_black, im_colour)
+
+        # Part for black-white ePapers
+        else:
+            im_black, = frames
+
+            if not self.settings.get('image_hash', False) or self._needs_image_update([
+                (f"{settings.IMAGE_FOLDER}/canvas.png.hash", im_black), ], metrics):
+                self._render_black(im_black, regions)
+
+        # getbuffer, init, display (= spi + BUSY), sleep
+        for phase, seconds in display.timings.items():
+            metrics.add(phase, seconds)
+
+    def _render_black(self, im_black, regions):
+        """Render a black-white frame, refreshing only the changed module regions if possible"""
+        display = self.Display
+
+        partial = (self.partial_refresh and self._last_frame is not None and not self._calibration_state
+                   and self._partial_refreshes < self._full_refresh_interval)
+
+        if partial:
+            box = self._dirty_box(self._last_frame, im_black, regions)
+            if box is None:
+                logger.info("No module changed since the last refresh, skipping render")
+                return
+            if box != (0, 0, *im_black.size):
+                logger.info(f"Refreshing changed region {box} only")
+                display.render_region(im_black, box)
+                self._partial_refreshes += 1
+                self._last_frame = im_black
+                return
+
+        display.render(im_black)
+        self._partial_refreshes = 0
+        self._last_frame = im_black
+
+    def _module_regions(self):
+        """Returns the (left, upper, right, lower) box of each module and the info-section
+        in the coordinates of the rendered frame"""
+        from inkycal.display.framebuffer import rotate_box
+
+        width, height = self._canvas_black.size
+        regions = []
+
+        cursor = 0
+        for number in range(1, self._module_number):
+            section_size = [i for i in self.settings['modules'] if i['position'] == number][0]['config']['size']
+            regions.append((0, cursor, width, cursor + section_size[1]))
+            cursor += section_size[1]
+
+        if self.settings['info_section']:
+            regions.append((0, height - self.settings["info_section_height"], width, height))
+
+        # The rendered frame is in the display's scan order
+        return [rotate_box(region, (width, height), self._scan_turns) for region in regions]
+
     @staticmethod
-    def _merge_bands():
-        """Merges black and coloured bands for black-white ePapers
-        returns the merged image
+    def _dirty_box(previous, current, regions):
+        """Returns the bounding box of all regions that differ between two frames.
+        None if the frames are identical, the whole frame if a change lies outside the regions"""
+        full = (0, 0, *current.size)
+        if previous.size != current.size:
+            return full
+
+        import numpy
+
+        changed = (numpy.asarray(previous.convert('RGB')) != numpy.asarray(current.convert('RGB'))).any(axis=2)
+        if not changed.any():
+            return None
+
+        dirty = []
+        for left, upper, right, lower in regions:
+            if changed[upper:lower, left:right].any():
+                dirty.append((left, upper, right, lower))
+            changed[upper:lower, left:right] = False
+
+        if changed.any() or not dirty:
+            return full
+
+        return (min(box[0] for box in dirty), min(box[1] for box in dirty),
+                max(box[2] for box in dirty), max(box[3] for box in dirty))
+
+    @staticmethod
+    def _native_turns(capabilities, orientation):
+        """Quarter turns from the (portrait) composition to the scan order of a display.
+
+        Landscape panels get the frame turned by 90°, ``orientation`` 180 flips it
+        on top. Image file "displays" keep the composed orientation.
+        """
+        landscape = capabilities.interface != "file" and capabilities.native_orientation == "landscape"
+        return (int(orientation) // 90 + landscape) % 4
+
+    def _display_frames(self):
+        """Returns the frames to render, one per plane of the display, in its scan order.
+
+        The planes are rotated as masks, so the drivers get frames matching their
+        native resolution and never have to transpose or flip them.
         """
+        from inkycal.display.framebuffer import rotate_frame
 
-        im1_path = os.path.join(settings.IMAGE_FOLDER, "canvas.png")
-        im2_path = os.path.join(settings.IMAGE_FOLDER, "canvas_colour.png")
+        turns = self._scan_turns
+        if self._planes is not None:
+            black, colour = self._planes
+            planes = (black, colour) if self.supports_colour else (black | colour,)
+            return tuple(Image.fromarray(~rotate_frame(plane, turns)) for plane in planes)
 
-        # If there is an image for black and colour, merge them
-        if os.path.exists(im1_path) and os.path.exists(im2_path):
+        if self.supports_colour:
+            return rotate_frame(self._canvas_black, turns), rotate_frame(self._canvas_colour, turns)
+        return rotate_frame(self._merge_bands(), turns),
 
-            im1 = Image.open(im1_path).convert('RGBA')
-            im2 = Image.open(im2_path).convert('RGBA')
+    def _merge_bands(self):
+        """Merges black and coloured bands of the assembled canvas for black-white ePapers
+        returns the merged image
+        """
 
-            im1 = Images.merge(im1, im2)
+        if self._canvas_black is None:
+            raise ValueError("Inkycal cannot find images to merge, was the canvas assembled?")
 
-        # If there is no image for the coloured-band, return the bw-image
-        elif os.path.exists(im1_path) and not os.path.exists(im2_path):
-            im1 = Image.open(im1_path).convert('RGBA')
+        if self._planes is not None:
+            # Coloured pixels are shown in black
+            return self._plane_image(self._planes[0] | self._planes[1])
 
-        else:
-            raise FileNotFoundError("Inkycal cannot find images to merge")
+        im1 = self._canvas_black.convert('RGBA')
+
+        # If there is an image for the coloured-band, merge it
+        if self._canvas_colour is not None:
+            im1 = Images.merge(im1, self._canvas_colour.convert('RGBA'))
 
         return im1
 
@@ -503,15 +687,14 @@ class Inkycal:
 
         for number in range(1, self._module_number):
 
-            # get the path of the current module's generated images
-            im1_path = os.path.join(settings.IMAGE_FOLDER, f"module{number}_black.png")
-            im2_path = os.path.join(settings.IMAGE_FOLDER, f"module{number}_colour.png")
+            # get the current module's generated images
+            im1, im2 = self._module_images.get(number, (None, None))
 
             # Check if there is an image for the black band
-            if os.path.exists(im1_path):
+            if im1 is not None:
 
                 # Get actual size of image
-                im1 = Image.open(im1_path).convert('RGBA')
+                im1 = im1.convert('RGBA')
                 im1_size = im1.size
 
                 # Get the size of the section
@@ -533,10 +716,10 @@ class Inkycal:
                 im1_cursor += section_size[1]
 
             # Check if there is an image for the coloured band
-            if os.path.exists(im2_path):
+            if im2 is not None:
 
                 # Get actual size of image
-                im2 = Image.open(im2_path).convert('RGBA')
+                im2 = im2.convert('RGBA')
                 im2_size = im2.size
 
                 # Get the size of the section
@@ -570,54 +753,63 @@ class Inkycal:
                 text=self.info
             )
 
-        # optimize the image by mapping colours to pure black and white
+        # optimize the image by mapping both layers to pure black and white
+        self._planes = None
         if self.optimize:
-            canvas.image_black = self._optimize_im(canvas.image_black)
-            canvas.image_colour = self._optimize_im(canvas.image_colour)
+            with self._metrics.phase("optimize"):
+                self._planes = self._dark_mask(canvas.image_black), self._dark_mask(canvas.image_colour)
+                canvas.image_black, canvas.image_colour = (self._plane_image(plane) for plane in self._planes)
 
-        canvas.image_black.save(os.path.join(settings.IMAGE_FOLDER, "canvas.png"), "PNG")
-        canvas.image_colour.save(os.path.join(settings.IMAGE_FOLDER, "canvas_colour.png"), 'PNG')
+        self._canvas_black = canvas.image_black
+        self._canvas_colour = canvas.image_colour
 
-        # Additionally, combine the two images with color
-        def clear_white(img):
-            """Replace all white pixels from image with transparent pixels
-            """
-            x = numpy.asarray(img.convert('RGBA')).copy()
-            x[:, :, 3] = (255 * (x[:, :, :3] != 255).any(axis=2)).astype(numpy.uint8)
-            return Image.fromarray(x)
-
-        # Additionally, combine the two images with color
-        def black_to_colour(img):
-            """Replace all black pixels from image with red pixels
-            """
-            buffer = numpy.array(img.convert('RGB'))
-            red, green = buffer[:, :, 0], buffer[:, :, 1]
-
-            threshold = 220
+        if not self.write_debug_images:
+            return
 
-            # non-white -> red
-            buffer[numpy.logical_and(red <= threshold, green <= threshold)] = [255, 0, 0]
+        self._image_sink.save(canvas.image_black, "canvas.png")
+        self._image_sink.save(canvas.image_colour, "canvas_colour.png")
 
-            return Image.fromarray(buffer)
+        # The full-screen preview is only built for the image folder, in the background
+        planes = self._planes
+        self._image_sink.save_rendered(
+            lambda: self._preview(canvas.image_black, canvas.image_colour, planes), "fullscreen.png")
 
-        # Save full-screen images as well
-        im_black = clear_white(canvas.image_black)
-        im_colour = black_to_colour(canvas.image_colour)
+    @staticmethod
+    def _dark_mask(image, threshold=220):
+        """Return a boolean array of the pixels that are shown on an ePaper layer (grey->black)"""
+        import numpy
 
-        im_colour.paste(im_black, (0, 0), im_black)
-        im_colour.save(os.path.join(settings.IMAGE_FOLDER, 'fullscreen.png'), 'PNG')
+        buffer = numpy.asarray(image if image.mode == 'RGB' else image.convert('RGB'))
+        return (buffer[:, :, 0] <= threshold) & (buffer[:, :, 1] <= threshold)
 
     @staticmethod
-    def _optimize_im(image, threshold=220):
+    def _plane_image(mask):
+        """Black-white RGB image of a mask from _dark_mask()"""
+        return Image.fromarray(~mask).convert('RGB')
+
+    @classmethod
+    def _optimize_im(cls, image, threshold=220):
         """Optimize the image for rendering on ePaper displays"""
+        return cls._plane_image(cls._dark_mask(image, threshold))
 
-        buffer = numpy.array(image.convert('RGB'))
-        red, green = buffer[:, :, 0], buffer[:, :, 1]
+    @classmethod
+    def _preview(cls, im_black, im_colour, planes=None):
+        """Combine both layers to one image, coloured pixels are shown in red"""
+        import numpy
+
+        if planes is not None:
+            black, colour = planes
+            buffer = numpy.full((*black.shape, 3), 255, dtype=numpy.uint8)
+            buffer[black] = 0
+        else:
+            # not optimized (e.g. grayscale displays), keep the grey levels of the black layer
+            buffer = numpy.array(im_black.convert('RGB'))
+            black = (buffer != 255).any(axis=2)
+            colour = cls._dark_mask(im_colour)
 
-        # grey->black
-        buffer[numpy.logical_and(red <= threshold, green <= threshold)] = [0, 0, 0]
-        image = Image.fromarray(buffer)
-        return image
+        # the black layer is drawn on top of the coloured one
+        buffer[colour & ~black] = [255, 0, 0]
+        return Image.fromarray(buffer)
 
     def calibrate(self, cycles=3):
         """Calibrate the E-Paper display
@@ -657,19 +849,85 @@ class Inkycal:
                 logger.error(f"could not remove file: {_file}")
                 pass
 
-    def process_module(self, number) -> bool or Exception:
+    def process_module(self, number) -> bool:
         """Process individual module to generate images and handle exceptions."""
-        module = eval(f'self.module_{number}')
         try:
-            black, colour = module.generate_image()
-            if self.show_border:
-                draw_border_2(im=black, xy=(1, 1), size=(black.width - 2, black.height - 2), radius=5)
-            black.save(os.path.join(settings.IMAGE_FOLDER, f"module{number}_black.png"), "PNG")
-            colour.save(os.path.join(settings.IMAGE_FOLDER, f"module{number}_colour.png"), "PNG")
-            return True
+            black, colour = self._generate_module(number)
         except Exception:
             logger.exception(f"Error in module {number}!")
             return False
+        self._keep_module_images(number, black, colour)
+        return True
+
+    def process_modules(self) -> list:
+        """Generate the images of all modules concurrently.
+
+        Every module has `module_timeout` seconds to finish. A module that fails or
+        misses its deadline keeps the image of its last successful run. Images are
+        always stored under their module number, regardless of which module finished first.
+
+        Returns:
+            list: numbers of the modules that failed or timed out, in ascending order.
+        """
+        numbers = range(1, self._module_number)
+
+        for number in numbers:
+            future = self._module_futures.get(number)
+            if future is not None and not future.done():
+                # Never run the same module instance twice at the same time
+                logger.warning(f"Module {number} is still busy with the previous cycle")
+                continue
+            self._module_futures[number] = self._module_executor.submit(self._generate_module, number)
+
+        futures = [self._module_futures[number] for number in numbers]
+        wait(futures, timeout=self.module_timeout)
+
+        failed = []
+        for number, future in zip(numbers, futures):
+            if not future.done():
+                logger.error(f"Module {number} did not finish within {self.module_timeout} seconds, "
+                             f"using its last image.")
+                failed.append(number)
+                continue
+            try:
+                black, colour = future.result()
+            except Exception:
+                logger.exception(f"Error in module {number}!")
+                failed.append(number)
+                continue
+            self._keep_module_images(number, black, colour)
+        return failed
+
+    def _generate_module(self, number):
+        """Generate the black and colour image of a module, runs in a worker thread.
+
+        Modules reporting an input fingerprint get their previous images back
+        while the fingerprint does not change, see InkycalModule.input_fingerprint().
+        """
+        module = getattr(self, f"module_{number}")
+        input_fingerprint = getattr(module, "input_fingerprint", None)
+        with self._metrics.module(number, module.name) as record:
+            fingerprint = input_fingerprint() if input_fingerprint else None
+            if fingerprint is not None:
+                memo = self._module_memo.get(number)
+                if memo is not None and memo[0] == fingerprint:
+                    logger.debug(f"Inputs of module {number} did not change, reusing its images")
+                    record["memo"] = "hit"
+                    return memo[1], memo[2]
+                record["memo"] = "miss"
+            black, colour = module.generate_image()
+        if self.show_border:
+            draw_border_2(im=black, xy=(1, 1), size=(black.width - 2, black.height - 2), radius=5)
+        if fingerprint is not None:
+            self._module_memo[number] = (fingerprint, black, colour)
+        return black, colour
+
+    def _keep_module_images(self, number, black, colour):
+        """Store the images of a module for the next _assemble()"""
+        self._module_images[number] = (black, colour)
+        if self.write_debug_images:
+            self._image_sink.save(black, f"module{number}_black.png")
+            self._image_sink.save(colour, f"module{number}_colour.png")
 
     def _shutdown_system(self):
         """Shutdown the system"""
@@ -175,7 +175,7 @@ class Simple(InkycalModule):
 
         #   You can use these custom functions to help you create the image:
         # - get_system_tz()       -> Get the system's current timezone
-        # - internet_available()  -> Check if internet is available
+        # - network_available()   -> Check if internet is available
         # - draw_border()         -> Draw a border around the specified area
 
         # If these aren't enough, take a look at python Pillow (imaging library)'s
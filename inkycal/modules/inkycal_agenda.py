@@ -7,7 +7,7 @@ import logging
 import arrow
 from PIL import Image, ImageDraw
 
-from inkycal.modules.template import InkycalModule
+from inkycal.modules.template import InkycalModule, fingerprint
 from inkycal.utils.canvas import Canvas
 from inkycal.utils.enums import FONTS
 from inkycal.utils.functions import get_system_tz
@@ -96,6 +96,32 @@ class Agenda(InkycalModule):
         # give an OK message
         logger.debug(f'{__name__} loaded')
 
+    def _load_events(self, start, end):
+        """Events of all configured iCalendars between start and end, sorted by beginning"""
+        ical = iCalendar()
+        if self.ical_urls:
+            ical.load_url(self.ical_urls)
+
+        if self.ical_files:
+            ical.load_from_file(self.ical_files)
+
+        return ical.get_events(start, end, self.timezone)
+
+    def _max_lines(self, canvas):
+        """Number of lines (dates and events) fitting into all columns"""
+        im_height = int(self.height - (2 * self.padding_top))
+        line_spacing = 1
+        line_height = canvas.get_line_height() + line_spacing
+        return (im_height // line_height) * self.columns
+
+    def input_fingerprint(self):
+        """Today's date and the events shown from today on"""
+        im_size = int(self.width - (2 * self.padding_left)), int(self.height - (2 * self.padding_top))
+        today = arrow.now().floor('day')
+        last_day = today.shift(days=self._max_lines(Canvas(im_size, self.font, self.fontsize)) - 1)
+        events = self._prefetch((today, last_day), lambda: self._load_events(today, last_day))
+        return fingerprint(today, events)
+
     def generate_image(self):
         """Generate image for this module"""
 
@@ -117,7 +143,7 @@ class Agenda(InkycalModule):
         col_width = (im_width - (self.columns - 1) * gutter) // self.columns
         
         lines_per_col = im_height // line_height
-        max_lines = lines_per_col * self.columns
+        max_lines = self._max_lines(canvas)
         
         logger.debug(f'max lines: {max_lines} ({lines_per_col} per column)')
 
@@ -135,22 +161,9 @@ class Agenda(InkycalModule):
             }
             for _ in range(max_lines)]
 
-        # Load icalendar from config
-        ical = iCalendar()
-
-        if self.ical_urls:
-            ical.load_url(self.ical_urls)
-
-        if self.ical_files:
-            ical.load_from_file(self.ical_files)
-
-        # Load events from all icalendar in timerange
-        upcoming_events = ical.get_events(today, agenda_events[-1]['begin'],
-                                            self.timezone)
-
-        # Sort events by beginning time
-        ical.sort()
-        # parser.show_events()
+        # Load events from all icalendars in timerange (unless input_fingerprint() just did)
+        last_day = agenda_events[-1]['begin']
+        upcoming_events = self._prefetched((today, last_day), lambda: self._load_events(today, last_day))
 
         # Set the width for date, time and event titles
         date_strings = [date['begin'].format(self.date_format, locale=self.language) for date in agenda_events]
@@ -288,7 +301,7 @@ class Agenda(InkycalModule):
                     # Time (always 1 line, aligned to top)
                     time = item['begin'].format(self.time_format, locale=self.language)
                     
-                    if not ical.all_day(item):
+                    if not iCalendar.all_day(item):
                         canvas.write(
                             xy=(x_offset + x_time, y_pos),
                             box_size=(time_width, line_height),
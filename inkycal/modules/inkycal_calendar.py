@@ -9,7 +9,7 @@ import logging
 import arrow
 from PIL import ImageFont, Image, ImageDraw
 
-from inkycal.modules.template import InkycalModule
+from inkycal.modules.template import InkycalModule, fingerprint
 from inkycal.utils.canvas import Canvas
 from inkycal.utils.enums import FONTS
 from inkycal.utils.functions import get_system_tz, draw_border
@@ -93,6 +93,40 @@ class Calendar(InkycalModule):
         """Flatten the values."""
         return [x for y in values for x in y]
 
+    def _load_events(self, now):
+        """Events of this month (for the day markers) and of the next four weeks"""
+        # pylint: disable=import-outside-toplevel
+        from inkycal.utils.ical_parser import iCalendar
+
+        # fetch events from given iCalendars
+        self.ical = iCalendar()
+        parser = self.ical
+
+        if self.ical_urls:
+            parser.load_url(self.ical_urls)
+        if self.ical_files:
+            parser.load_from_file(self.ical_files)
+
+        # timeline for filtering events within this month
+        month_start = arrow.get(now.floor('month'))
+        month_end = arrow.get(now.ceil('month'))
+
+        # Filter events for full month (even past ones) for drawing event icons
+        month_events = parser.get_events(month_start, month_end, self.timezone)
+
+        # Filter upcoming events until 4 weeks in the future
+        parser.clear_events()
+        upcoming_events = parser.get_events(now, now.shift(weeks=4), self.timezone)
+        return month_events, upcoming_events
+
+    def input_fingerprint(self):
+        """Today's date and, if shown, the events of this month and the next four weeks"""
+        now = arrow.now(tz=self.timezone)
+        if not self.show_events:
+            return fingerprint(now.date())
+        events = self._prefetch(now.floor('minute'), lambda: self._load_events(now))
+        return fingerprint(now.date(), events)
+
     def generate_image(self):
         """Generate image for this module"""
 
@@ -287,22 +321,8 @@ class Calendar(InkycalModule):
 
             # logger.debug(f"event_lines {event_lines}")
 
-            # timeline for filtering events within this month
-            month_start = arrow.get(now.floor('month'))
-            month_end = arrow.get(now.ceil('month'))
-
-            # fetch events from given iCalendars
-            self.ical = iCalendar()
-            parser = self.ical
-
-            if self.ical_urls:
-                parser.load_url(self.ical_urls)
-            if self.ical_files:
-                parser.load_from_file(self.ical_files)
-
-            # Filter events for full month (even past ones) for drawing event icons
-            month_events = parser.get_events(month_start, month_end, self.timezone)
-            parser.sort()
+            # fetch events from given iCalendars (unless input_fingerprint() just did)
+            month_events, upcoming_events = self._prefetched(now.floor('minute'), lambda: self._load_events(now))
             self.month_events = month_events
 
             # Initialize days_with_events as an empty list
@@ -335,9 +355,6 @@ class Calendar(InkycalModule):
                         radius=6
                     )
 
-            # Filter upcoming events until 4 weeks in the future
-            parser.clear_events()
-            upcoming_events = parser.get_events(now, now.shift(weeks=4), self.timezone)
             self._upcoming_events = upcoming_events
 
             # delete events which won't be able to fit (more events than lines)
@@ -392,7 +409,7 @@ class Calendar(InkycalModule):
                             )
 
                             # Check if event is all day
-                            if parser.all_day(event):
+                            if iCalendar.all_day(event):
                                 canvas.write(
                                     xy=(date_width, event_lines[cursor][1]),
                                     box_size= (event_width_l, line_height),
@@ -5,14 +5,14 @@ Copyright by aceinnolab
 import logging
 import re
 
-from inkycal.modules.template import InkycalModule
+from inkycal.modules.template import InkycalModule, fingerprint
 
 from random import shuffle
 
 import feedparser
 
 from inkycal.utils.canvas import Canvas
-from inkycal.utils.functions import internet_available
+from inkycal.utils.functions import network_available
 from inkycal.utils.inkycal_exceptions import NetworkNotReachableError
 
 logger = logging.getLogger(__name__)
@@ -72,6 +72,24 @@ class Feeds(InkycalModule):
         if not isinstance(self.shuffle_feeds, bool):
             print('shuffle_feeds has to be a boolean: True/False')
 
+    def _load_feeds(self):
+        """Entries of all feeds as "•title: summary" lines"""
+        parsed_feeds = []
+        for feeds in self.feed_urls:
+            text = feedparser.parse(feeds)
+            for posts in text.entries:
+                if "summary" in posts:
+                    summary = posts["summary"]
+                    parsed_feeds.append(f"•{posts.title}: {re.sub('<[^<]+?>', '', posts.summary)}")
+                # if "description" in posts:
+        return parsed_feeds
+
+    def input_fingerprint(self):
+        """The feed entries, unless they are shuffled every cycle"""
+        if self.shuffle_feeds:
+            return None
+        return fingerprint(self._prefetch("feeds", self._load_feeds))
+
     def generate_image(self):
         """Generate image for this module"""
 
@@ -84,7 +102,7 @@ class Feeds(InkycalModule):
         canvas = Canvas(im_size, self.font, self.fontsize)
 
         # Check if internet is available
-        if internet_available():
+        if network_available():
             logger.debug('Connection test passed')
         else:
             logger.error("Network not reachable. Please check your connection.")
@@ -104,15 +122,8 @@ class Feeds(InkycalModule):
         line_positions = [
             (0, spacing_top + _ * line_height) for _ in range(max_lines)]
 
-        # Create list containing all feeds from all urls
-        parsed_feeds = []
-        for feeds in self.feed_urls:
-            text = feedparser.parse(feeds)
-            for posts in text.entries:
-                if "summary" in posts:
-                    summary = posts["summary"]
-                    parsed_feeds.append(f"•{posts.title}: {re.sub('<[^<]+?>', '', posts.summary)}")
-                # if "description" in posts:
+        # Create list containing all feeds from all urls (unless input_fingerprint() just did)
+        parsed_feeds = self._prefetched("feeds", self._load_feeds)
 
         if parsed_feeds:
             parsed_feeds = [i.split("\n") for i in parsed_feeds]
@@ -20,7 +20,7 @@ from PIL import ImageFont
 from PIL import ImageOps
 
 from inkycal.icons.weather_icons.weather_icons import get_weather_icon
-from inkycal.utils.functions import get_system_tz, internet_available
+from inkycal.utils.functions import get_system_tz, network_available
 from inkycal.utils.inkycal_exceptions import NetworkNotReachableError
 from inkycal.utils.openweathermap_wrapper import OpenWeatherMap
 from inkycal.utils.inky_image import image_to_palette
@@ -602,7 +602,7 @@ class Fullweather(InkycalModule):
         logger.info(f"Image size: {im_size}")
 
         # Check if internet is available
-        if internet_available():
+        if network_available():
             logger.info("Connection test passed")
         else:
             raise NetworkNotReachableError
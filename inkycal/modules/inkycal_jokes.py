@@ -10,11 +10,9 @@ from PIL import Image
 
 from inkycal.modules.template import InkycalModule
 
-
-import requests
-
+from inkycal.utils import http_client
 from inkycal.utils.canvas import Canvas
-from inkycal.utils.functions import internet_available
+from inkycal.utils.functions import network_available
 from inkycal.utils.inkycal_exceptions import NetworkNotReachableError
 
 # Show less logging for request module
@@ -52,7 +50,7 @@ class Jokes(InkycalModule):
         canvas = Canvas(im_size, font=self.font, font_size=self.fontsize)
 
         # Check if internet is available
-        if internet_available():
+        if network_available():
             logger.debug('Connection test passed')
         else:
             logger.error("Network not reachable. Please check your connection.")
@@ -78,7 +76,7 @@ class Jokes(InkycalModule):
         # Get the actual joke
         url = "https://icanhazdadjoke.com"
         header = {"accept": "text/plain"}
-        response = requests.get(url, headers=header)
+        response = http_client.get(url, headers=header)
         response.encoding = 'utf-8'  # Change encoding to UTF-8
         joke = response.text.rstrip()  # use to remove newlines
         logger.debug(f"joke: {joke}")
@@ -5,9 +5,11 @@ Copyright by aceinnolab
 """
 import logging
 
-import requests
+from io import BytesIO
+
 from PIL import Image
 
+from inkycal.utils import http_client
 from inkycal.utils.inky_image import Inkyimage as Images
 from inkycal.modules.template import InkycalModule
 
@@ -99,8 +101,9 @@ class Inkyserver(InkycalModule):
         # else use POST request
         else:
             # Get the response image
-            response = Image.open(requests.post(
-                self.path, json=self.path_body, stream=True).raw)
+            response = http_client.post(self.path, json=self.path_body)
+            response.raise_for_status()
+            response = Image.open(BytesIO(response.content))
 
             # initialize custom image class with response
             im = Images(response)
@@ -4,10 +4,11 @@ Copyright by aceinnolab
 """
 import glob
 import logging
+import os
 
 # PIL has a class named Image, use alias for Inkyimage -> Images
 from inkycal.utils.inky_image import Inkyimage as Images, image_to_palette
-from inkycal.modules.template import InkycalModule
+from inkycal.modules.template import InkycalModule, fingerprint
 from inkycal.utils import JSONCache
 
 logger = logging.getLogger(__name__)
@@ -79,6 +80,11 @@ class Slideshow(InkycalModule):
         # give an OK message
         logger.debug(f'{__name__} loaded')
 
+    def input_fingerprint(self):
+        """The image shown next, it only repeats if the folder has a single image"""
+        path = self.images[0] if self._first_run else self.images[1 % len(self.images)]
+        return fingerprint(path, os.path.getmtime(path))
+
     def generate_image(self):
         """Generate image for this module"""
 
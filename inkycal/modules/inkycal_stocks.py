@@ -16,7 +16,7 @@ import os
 from PIL import Image
 
 from inkycal.utils.canvas import Canvas
-from inkycal.utils.functions import internet_available, render_line_chart
+from inkycal.utils.functions import network_available, render_line_chart
 from inkycal.modules.template import InkycalModule
 
 import yfinance as yf
@@ -74,7 +74,7 @@ class Stocks(InkycalModule):
             os.mkdir(tmpPath)
 
         # Check if internet is available
-        if internet_available():
+        if network_available():
             logger.info('Connection test passed')
         else:
             raise Exception('Network could not be reached :/')
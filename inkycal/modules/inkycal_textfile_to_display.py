@@ -8,14 +8,12 @@ Copyright by aceinnolab
 """
 import logging
 
-import certifi
-import requests
-
 from PIL import Image
 
 from inkycal.modules.template import InkycalModule
+from inkycal.utils import http_client
 from inkycal.utils.canvas import Canvas
-from inkycal.utils.functions import internet_available
+from inkycal.utils.functions import network_available
 from inkycal.utils.inkycal_exceptions import NetworkNotReachableError
 
 logger = logging.getLogger(__name__)
@@ -73,12 +71,11 @@ class TextToDisplay(InkycalModule):
         if self.make_request:
             logger.info("Detected http path, making request")
             # Check if internet is available
-            if internet_available():
+            if network_available():
                 logger.info('Connection test passed')
             else:
                 raise NetworkNotReachableError
-            response = requests.get(self.filepath, timeout=15, verify=certifi.where())
-            response.raise_for_status()
+            response = http_client.get_cached(self.filepath, timeout=15)
             file_content = response.text
         else:
             # Create list containing all lines
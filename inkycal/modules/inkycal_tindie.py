@@ -8,11 +8,11 @@ import json
 import logging
 
 import arrow
-import requests
 
 from inkycal.modules.template import InkycalModule
+from inkycal.utils import http_client
 from inkycal.utils.canvas import Canvas
-from inkycal.utils.functions import internet_available
+from inkycal.utils.functions import network_available
 from inkycal.utils.inkycal_exceptions import NetworkNotReachableError
 
 # Show less logging for request module
@@ -49,7 +49,7 @@ class Tindie(InkycalModule):
         canvas = Canvas(im_size=im_size, font=self.font, font_size=self.fontsize)
 
         # Check if internet is available
-        if internet_available():
+        if network_available():
             logger.info('Connection test passed')
         else:
             logger.error("Network not reachable. Please check your connection.")
@@ -75,7 +75,7 @@ class Tindie(InkycalModule):
         # Make the API call
         url = f"https://www.tindie.com/api/v1/order/?format=json&username={self.username}&api_key={self.api_key}"
         header = {"accept": "text/json"}
-        response = requests.get(url, headers=header, params={"shipped": "false", "limit": "50"})
+        response = http_client.get(url, headers=header, params={"shipped": "false", "limit": "50"})
         if response.status_code != 200:
             logger.error(f"Failed to get orders, status code: {response.status_code}, reason: {response.reason}.")
             logger.error(f"response: {response.text}")
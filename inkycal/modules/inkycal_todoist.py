@@ -18,7 +18,7 @@ from todoist_api_python.api import TodoistAPI
 import requests.exceptions
 
 from inkycal.utils.canvas import Canvas
-from inkycal.utils.functions import internet_available
+from inkycal.utils.functions import network_available
 
 logger = logging.getLogger(__name__)
 
@@ -215,7 +215,7 @@ class Todoist(InkycalModule):
         canvas = Canvas(im_size=im_size, font=self.font, font_size=self.fontsize)
 
         # Check if internet is available
-        if not internet_available():
+        if not network_available():
             logger.error("Network not reachable. Trying to use cached data.")
             cached_data = self._load_cache()
             if cached_data:
@@ -8,10 +8,10 @@ import math
 import arrow
 from inkycal.utils.canvas import Canvas
 from inkycal.utils.enums import FONTS
-from inkycal.utils.functions import get_system_tz, internet_available, draw_border
+from inkycal.utils.functions import get_system_tz, network_available, draw_border
 from inkycal.utils.inkycal_exceptions import NetworkNotReachableError
 from inkycal.utils.openweathermap_wrapper import OpenWeatherMap
-from inkycal.modules.template import InkycalModule
+from inkycal.modules.template import InkycalModule, fingerprint
 
 logger = logging.getLogger(__name__)
 logger.setLevel(level=logging.INFO)
@@ -136,6 +136,41 @@ class Weather(InkycalModule):
         # give an OK message
         logger.debug(f"{__name__} loaded")
 
+    @staticmethod
+    def get_moon_phase(now):
+        """Calculate the current (approximate) moon phase
+
+        Returns:
+            The corresponding moonphase-icon.
+        """
+
+        dec = decimal.Decimal
+        diff = now - arrow.get(2001, 1, 1)
+        days = dec(diff.days) + (dec(diff.seconds) / dec(86400))
+        lunations = dec("0.20439731") + (days * dec("0.03386319269"))
+        position = lunations % dec(1)
+        index = math.floor((position * dec(8)) + dec("0.5"))
+        return {
+            0: '\uf095',
+            1: '\uf099',
+            2: '\uf09c',
+            3: '\uf0a0',
+            4: '\uf0a3',
+            5: '\uf0a7',
+            6: '\uf0aa',
+            7: '\uf0ae'
+        }[int(index) & 7]
+
+    def _load_weather(self):
+        """Current weather and the hourly forecasts"""
+        logging.debug('looking up location by ID')
+        return self.owm.get_current_weather(), self.owm.get_weather_forecast()
+
+    def input_fingerprint(self):
+        """Today's date (for the daily forecasts), the moon phase and the OWM data"""
+        now = arrow.utcnow().to(self.timezone)
+        return fingerprint(now.date(), self.get_moon_phase(now), self._prefetch("weather", self._load_weather))
+
     def generate_image(self):
         """Generate image for this module"""
 
@@ -149,36 +184,12 @@ class Weather(InkycalModule):
         canvas = Canvas(im_size=im_size, font=self.font, font_size=self.fontsize)
 
         # Check if internet is available
-        if internet_available():
+        if network_available():
             logger.debug('Connection test passed')
         else:
             logger.error("Network not reachable. Please check your connection.")
             raise NetworkNotReachableError
 
-        def get_moon_phase():
-            """Calculate the current (approximate) moon phase
-
-            Returns:
-                The corresponding moonphase-icon.
-            """
-
-            dec = decimal.Decimal
-            diff = now - arrow.get(2001, 1, 1)
-            days = dec(diff.days) + (dec(diff.seconds) / dec(86400))
-            lunations = dec("0.20439731") + (days * dec("0.03386319269"))
-            position = lunations % dec(1)
-            index = math.floor((position * dec(8)) + dec("0.5"))
-            return {
-                0: '\uf095',
-                1: '\uf099',
-                2: '\uf09c',
-                3: '\uf0a0',
-                4: '\uf0a3',
-                5: '\uf0a7',
-                6: '\uf0aa',
-                7: '\uf0ae'
-            }[int(index) & 7]
-
         def is_negative(temp: str):
             """Check if temp is below freezing point of water (0°C/32°F)
             returns True if temp below freezing point, else False"""
@@ -304,10 +315,8 @@ class Weather(InkycalModule):
         icon_fc4 = (col7, row1 + row_height) # noqa
         temp_fc4 = (col7, row3) # noqa
 
-        # Create current-weather and weather-forecast objects
-        logging.debug('looking up location by ID')
-        current_weather = self.owm.get_current_weather()
-        weather_forecasts = self.owm.get_weather_forecast()
+        # Create current-weather and weather-forecast objects (unless input_fingerprint() just did)
+        current_weather, weather_forecasts = self._prefetched("weather", self._load_weather)
 
         # Set decimals
         dec_temp = 0 if self.round_temperature == True else 1
@@ -380,7 +389,7 @@ class Weather(InkycalModule):
         logging.debug(f'getting wind speed in {self.windDispUnit}')
         wind = f"{current_weather['wind']:.{dec_wind}f} {self.windDispUnit}"
 
-        moon_phase = get_moon_phase()
+        moon_phase = self.get_moon_phase(now)
 
         # Fill weather details in col 1 (current weather icon)
         canvas.draw_icon(
@@ -11,7 +11,7 @@ from typing import Optional
 from PIL import Image
 
 from inkycal.settings import Settings
-from inkycal.utils.functions import internet_available
+from inkycal.utils.functions import network_available
 from inkycal.utils.inky_image import Inkyimage as Images, image_to_palette
 from inkycal.modules.template import InkycalModule
 
@@ -308,7 +308,7 @@ class Webshot(InkycalModule):
         im_colour = Image.new('RGB', size=im_size, color='white')
 
         # Check if internet is available
-        if internet_available():
+        if network_available():
             logger.info('Connection test passed')
         else:
             logger.error("Network not reachable. Please check your connection.")
@@ -10,7 +10,7 @@ from PIL import Image
 
 from inkycal.settings import Settings
 from inkycal.utils.canvas import Canvas
-from inkycal.utils.functions import internet_available
+from inkycal.utils.functions import network_available
 from inkycal.utils.inky_image import Inkyimage as Image2, image_to_palette
 from inkycal.modules.template import InkycalModule
 
@@ -78,7 +78,7 @@ class Xkcd(InkycalModule):
         canvas = Canvas(im_size, font=self.font, font_size=self.fontsize)
 
         # Check if internet is available
-        if internet_available():
+        if network_available():
             logger.info('Connection test passed')
         else:
             logger.error("Network not reachable. Please check your connection.")
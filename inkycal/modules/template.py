@@ -1,11 +1,17 @@
 """Inkycal module template"""
 import abc
+import hashlib
 
 from PIL import ImageFont
 
 from inkycal.utils.enums import FONTS
 
 
+def fingerprint(*values) -> str:
+    """Digest of the given values (compared by their repr), see InkycalModule.input_fingerprint()"""
+    return hashlib.sha1(repr(values).encode("utf-8")).hexdigest()
+
+
 class InkycalModule(metaclass=abc.ABCMeta):
     """Generic base class for inkycal modules"""
 
@@ -65,6 +71,30 @@ class InkycalModule(metaclass=abc.ABCMeta):
         raise NotImplementedError(
             'The developers were too lazy to implement this function')
 
+    def input_fingerprint(self):
+        """Fingerprint of everything the next generate_image() call would draw.
+
+        Inkycal calls this right before generate_image() and reuses the images
+        of the previous run if the fingerprint did not change. Modules opt in by
+        returning e.g. fingerprint(today, events); the default None regenerates
+        every cycle. Data fetched here can be handed over to generate_image()
+        with _prefetch() and _prefetched(), so it is only fetched once.
+        """
+        return None
+
+    def _prefetch(self, key, load):
+        """Return load() and keep it for the next _prefetched() call with the same key"""
+        value = load()
+        self._prefetched_data = (key, value)
+        return value
+
+    def _prefetched(self, key, load):
+        """Return what _prefetch() kept for key, or load() if nothing was kept"""
+        prefetched, self._prefetched_data = getattr(self, "_prefetched_data", None), None
+        if prefetched is not None and prefetched[0] == key:
+            return prefetched[1]
+        return load()
+
     @classmethod
     def get_config(cls):
         # Do not change
@@ -1,2 +1,3 @@
 from .pisugar import PiSugar
-from .json_cache import JSONCache
\ No newline at end of file
+from .json_cache import JSONCache
+from .image_sink import ImageSink
@@ -1,8 +1,10 @@
 """canvas.py"""
-from typing import Tuple, Literal, Optional
+from typing import Callable, Tuple, Literal, Optional, NamedTuple
+import hashlib
 import logging
+import os
 
-import numpy
+import PIL
 from PIL import ImageFont, Image, ImageDraw
 
 from inkycal.utils.enums import FONTS
@@ -15,6 +17,284 @@ def _load_font(font_path, size):
 
 logger = logging.getLogger(__name__)
 
+# Number of text layouts (wrapped lines and their metrics) kept by write()
+LAYOUT_CACHE_SIZE = 1024
+
+# Font sizes are searched up to this size
+MAX_FONT_SIZE = 2048
+
+# Number of rasterized icons kept by draw_icon()
+ICON_CACHE_SIZE = 256
+
+# Directory where rasterized icons are also stored across restarts, disabled if unset
+ICON_CACHE_DIR = os.environ.get("INKYCAL_ICON_CACHE_DIR")
+
+
+@lru_cache(maxsize=4096)
+def _text_bbox(font_path, size, text: str) -> Tuple[int, int, int, int]:
+    """Bounding box of text at a font size, kept per (font, size, text) across calls."""
+    return _load_font(font_path, size).getbbox(text)
+
+
+def _text_size(font_path, size, text: str) -> Tuple[int, int]:
+    """(width, height) of the bounding box of text at a font size."""
+    left, top, right, bottom = _text_bbox(font_path, size, text)
+    return right - left, bottom - top
+
+
+def _first_size(fits: Callable[[int], bool], start: int) -> int:
+    """Smallest font size >= start for which ``fits(size)`` is true.
+
+    Text metrics grow with the font size, so the size is found with an
+    exponential search followed by a binary search: O(log n) measurements
+    instead of one per point. Gives up at MAX_FONT_SIZE.
+    """
+    if fits(start):
+        return start
+    low, high = start, max(start * 2, start + 1)
+    while not fits(high):
+        if high >= MAX_FONT_SIZE:
+            return MAX_FONT_SIZE
+        low, high = high, min(high * 2, MAX_FONT_SIZE)
+    # fits(low) is false, fits(high) is true
+    while high - low > 1:
+        middle = (low + high) // 2
+        if fits(middle):
+            high = middle
+        else:
+            low = middle
+    return high
+
+
+@lru_cache(maxsize=64)
+def _glyph_advances(font_path, size) -> Optional[dict]:
+    """Per-font table of glyph advances, filled as characters are measured.
+
+    Only used with Pillow's basic layout, where the width of a string is the
+    sum of the advances of its characters. Returns None for complex (raqm)
+    layout, where shaping and kerning make widths non-additive.
+    """
+    if _load_font(font_path, size).layout_engine != ImageFont.Layout.BASIC:
+        return None
+    return {}
+
+
+def _text_length(font, advances, text: str) -> float:
+    """Width of text like ``font.getlength(text)``, summing glyph advances if possible."""
+    if advances is None:
+        return font.getlength(text)
+    length = 0.0
+    for char in text:
+        advance = advances.get(char)
+        if advance is None:
+            advance = advances[char] = font.getlength(char)
+        length += advance
+    return length
+
+
+def _wrap(font, text: str, max_width: int) -> Tuple[str, ...]:
+    """Split text into lines no wider than max_width, see Canvas.text_wrap()."""
+    advances = _glyph_advances(font.path, font.size)
+    lines = []
+    current_line = ""
+    current_width = 0.0
+
+    for word in text.split(" "):
+        # Test candidate line
+        proposed = (current_line + " " + word).strip()
+
+        # Measure only the new word if the line just grows by it
+        if current_line and advances is not None and proposed == f"{current_line} {word}":
+            width = current_width + _text_length(font, advances, " " + word)
+        else:
+            width = _text_length(font, advances, proposed)
+
+        if width <= max_width:
+            # Word fits — extend current line
+            current_line, current_width = proposed, width
+        else:
+            # Word does not fit
+            if not current_line:
+                # Word itself too long: force-break
+                lines.append(word)
+            else:
+                # Push current line and start a new one
+                lines.append(current_line)
+                current_line, current_width = word, _text_length(font, advances, word)
+
+    # Add final line
+    if current_line:
+        lines.append(current_line)
+
+    return tuple(lines)
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _cached_wrap(font_path, size, text: str, max_width: int) -> Tuple[str, ...]:
+    return _wrap(_load_font(font_path, size), text, max_width)
+
+
+class TextLayout(NamedTuple):
+    """Font size, wrapped lines and metrics of a text block laid out by Canvas.write()."""
+    size: int
+    lines: Tuple[str, ...]
+    heights: Tuple[int, ...]
+    widths: Tuple[int, ...]
+    spacing: int
+    height: int
+
+
+def _fit_font_size(font_path, box_h: int, fill_height: float) -> int:
+    """Largest font size whose "Ag" sample stays below fill_height of the box (min. 8)."""
+    target = int(box_h * fill_height)
+    # always start from a fixed size so shrinking boxes don't inherit a stale large size
+    size = _first_size(lambda size: _text_size(font_path, size, "Ag")[1] >= target, 10)
+    return size - 1 if size > 8 else size
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def text_layout(font_path, size: Optional[int], text: str, box_size: Tuple[int, int], fill_width: float = 1.0,
+                fill_height: float = 0.8) -> TextLayout:
+    """Lay out (possibly multi-line) text in a box, cached by all arguments.
+
+    Args:
+        font_path: Path of the font.
+        size: Font size, or None to pick the largest size filling ``fill_height`` of the box.
+        text: Text, may contain ``\\n``.
+        box_size: (width, height) of the box.
+        fill_width: Part of the box width lines may use.
+        fill_height: Part of the box height a line should fill when ``size`` is None.
+
+    Returns:
+        TextLayout: Lines which do not fit in the box height are dropped.
+    """
+    box_w, box_h = box_size
+    if size is None:
+        size = _fit_font_size(font_path, box_h, fill_height)
+    font = _load_font(font_path, size)
+
+    # Split text into logical lines and wrap each of them to the box width
+    lines = []
+    for line in text.split("\n"):
+        lines.extend(_cached_wrap(font_path, size, line, int(box_w * fill_width)))
+
+    bboxes = [font.getbbox(line) for line in lines]
+    heights = [bbox[3] - bbox[1] for bbox in bboxes]
+    widths = [bbox[2] - bbox[0] for bbox in bboxes]
+
+    # add minimal line spacing (you can tune this)
+    spacing = int(font.size * 0.2)
+    total_h = sum(heights) + spacing * (len(lines) - 1)
+
+    # If text block too tall → truncate bottom lines
+    while total_h > box_h and lines:
+        lines.pop()
+        widths.pop()
+        total_h -= heights.pop() + spacing
+
+    return TextLayout(size, tuple(lines), tuple(heights), tuple(widths), spacing, total_h)
+
+
+def _rasterize_icon(font_path, icon: str, box_size: Tuple[int, int], fill_ratio: float,
+                    rotation: float) -> Optional[Image.Image]:
+    box_w, box_h = box_size
+
+    # --- Determine max usable size ---
+    def overflows(size):
+        w, h = _text_size(font_path, size, icon)
+        return w >= box_w * fill_ratio or h >= box_h * fill_ratio
+
+    size = max(8, _first_size(overflows, 8) - 1)
+
+    font_final = _load_font(font_path, size)
+
+    # --- TEMP CANVAS FOR PIXEL ANALYSIS ---
+    temp_w = box_w * 2
+    temp_h = box_h * 2
+
+    # 1) Render icon for ALPHA extraction
+    temp_alpha = Image.new("L", (temp_w, temp_h), 0)
+    dA = ImageDraw.Draw(temp_alpha)
+    dA.text((temp_w // 2, temp_h // 2), icon, fill=255, font=font_final, anchor="mm")
+
+    # Convert to numpy
+    import numpy as np
+    arr = np.asarray(temp_alpha)
+
+    # Detect ink pixels
+    mask = arr > 10  # threshold to keep fill
+
+    if not mask.any():
+        return None
+
+    ys, xs = np.where(mask)
+    min_x, max_x = xs.min(), xs.max()
+    min_y, max_y = ys.min(), ys.max()
+
+    ink_w = max_x - min_x + 1
+    ink_h = max_y - min_y + 1
+
+    # Extract the alpha mask for that region
+    mask_region = temp_alpha.crop((min_x, min_y, max_x + 1, max_y + 1))
+
+    # --- 2) Render icon again as RGB fill (full-strength black) ---
+    temp_rgb = Image.new("RGB", (temp_w, temp_h), "white")
+    dR = ImageDraw.Draw(temp_rgb)
+    dR.text((temp_w // 2, temp_h // 2), icon, fill="black", font=font_final, anchor="mm")
+
+    rgb_region = temp_rgb.crop((min_x, min_y, max_x + 1, max_y + 1))
+
+    # --- 3) Combine into RGBA for final paste ---
+    layer = Image.new("RGBA", (box_w, box_h), (0, 0, 0, 0))
+
+    paste_x = (box_w - ink_w) // 2
+    paste_y = (box_h - ink_h) // 2
+
+    layer.paste(rgb_region, (paste_x, paste_y), mask_region)
+
+    if rotation:
+        layer = layer.rotate(rotation, expand=True)
+
+    return layer
+
+
+def _icon_file(font_path, icon: str, box_size: Tuple[int, int], fill_ratio: float, rotation: float) -> str:
+    """Path of a persisted icon in ICON_CACHE_DIR, a new Pillow version renders them again."""
+    key = f"{os.path.basename(font_path)}|{icon!r}|{box_size}|{fill_ratio}|{rotation}|{PIL.__version__}"
+    return os.path.join(ICON_CACHE_DIR, f"icon-{hashlib.sha1(key.encode('utf-8')).hexdigest()}.png")
+
+
+@lru_cache(maxsize=ICON_CACHE_SIZE)
+def icon_bitmap(font_path, icon: str, box_size: Tuple[int, int], fill_ratio: float = 0.90,
+                rotation: float = 0) -> Optional[Image.Image]:
+    """Ink-cropped RGBA bitmap of an icon centred in box_size, as pasted by Canvas.draw_icon().
+
+    Bitmaps are cached by (font, icon, box, fill_ratio, rotation) and, if
+    ICON_CACHE_DIR is set, stored there as PNG. The returned image is shared
+    and must not be modified.
+
+    Returns:
+        Image or None if the icon has no ink in this font.
+    """
+    path = _icon_file(font_path, icon, box_size, fill_ratio, rotation) if ICON_CACHE_DIR else None
+    if path and os.path.exists(path):
+        try:
+            with Image.open(path) as stored:
+                return stored.convert("RGBA")
+        except OSError:
+            logger.warning(f"Could not read cached icon {path}, rendering it again")
+
+    layer = _rasterize_icon(font_path, icon, box_size, fill_ratio, rotation)
+
+    if path and layer is not None:
+        try:
+            os.makedirs(ICON_CACHE_DIR, exist_ok=True)
+            layer.save(f"{path}.tmp", format="PNG")
+            os.replace(f"{path}.tmp", path)
+        except OSError:
+            logger.warning(f"Could not store icon in {ICON_CACHE_DIR}")
+    return layer
+
 
 class Canvas:
     """Canvas class of Inkycal. Set this up once and use to draw text on a PIL Image."""
@@ -67,89 +347,35 @@ class Canvas:
         box_x, box_y = xy
         box_w, box_h = box_size
 
-        font_path = self.font_enum.value
-        font = self._font
-        size = 10  # always start from a fixed size so shrinking boxes don't inherit a stale large size
-
         # ----------------------------
-        # 1) Auto-fit the font size
+        # 1) Auto-fit the font size, wrap and measure (cached)
         # ----------------------------
         if autofit or (fill_width != 1.0) or (fill_height != 0.8):
-            size = max(8, size)
-            while True:
-                font = _load_font(font_path, size)
-
-                # measure test height with 1-line sample
-                sample_h = font.getbbox("Ag")[3] - font.getbbox("Ag")[1]
-
-                if sample_h >= int(box_h * fill_height):
-                    if size > 8:
-                        size -= 1
-                    font = _load_font(font_path, size)
-                    break
-
-                size += 1
+            layout = text_layout(self.font_enum.value, None, text, (box_w, box_h), fill_width, fill_height)
+            self._font_size = layout.size
+            self._font = _load_font(self.font_enum.value, layout.size)
+        else:
+            layout = text_layout(self._font.path, self._font.size, text, (box_w, box_h), fill_width, fill_height)
 
-            self._font_size = size
-            self._font = font
-
-        # ----------------------------
-        # 2) Split text into logical lines
-        # ----------------------------
-        logical_lines = text.split("\n")
-
-        # ----------------------------
-        # 3) Wrap each line to the box width
-        # ----------------------------
-        wrapped_lines: list[str] = []
-        for line in logical_lines:
-            wrapped_lines.extend(self.text_wrap(line, max_width=int(box_w * fill_width)))
-
-        if not wrapped_lines:
-            return
-
-        # ----------------------------
-        # 4) Measure combined height
-        # ----------------------------
-        line_heights = []
-        total_h = 0
-
-        for line in wrapped_lines:
-            bbox = font.getbbox(line)
-            h = bbox[3] - bbox[1]
-            line_heights.append(h)
-            total_h += h
-
-        # add minimal line spacing (you can tune this)
-        line_spacing = int(font.size * 0.2)
-        total_h += line_spacing * (len(wrapped_lines) - 1)
-
-        # If text block too tall → truncate bottom lines
-        while total_h > box_h and wrapped_lines:
-            removed = wrapped_lines.pop()
-            removed_h = line_heights.pop()
-            total_h -= (removed_h + line_spacing)
-
-        if not wrapped_lines:
+        font = self._font
+        if not layout.lines:
             return
 
         # ----------------------------
-        # 5) Vertical centering
+        # 2) Vertical centering
         # ----------------------------
-        cy = box_y + (box_h - total_h) // 2
+        cy = box_y + (box_h - layout.height) // 2
 
         # ----------------------------
-        # 6) Create transparent layer and draw lines
+        # 3) Create transparent layer and draw lines
         # ----------------------------
         space = Image.new("RGBA", (box_w, box_h), (0, 0, 0, 0))
         draw = ImageDraw.Draw(space)
 
         py = 0
-        for line, lh in zip(wrapped_lines, line_heights):
+        for line, lh, line_w in zip(layout.lines, layout.heights, layout.widths):
 
             # horizontal alignment
-            line_w = font.getbbox(line)[2] - font.getbbox(line)[0]
-
             if alignment == "center":
                 px = (box_w - line_w) // 2
             elif alignment == "left":
@@ -160,10 +386,10 @@ class Canvas:
                 px = (box_w - line_w) // 2
 
             draw.text((px, py), line, fill="black", font=font)
-            py += lh + line_spacing
+            py += lh + layout.spacing
 
         # ----------------------------
-        # 7) Rotation + paste
+        # 4) Rotation + paste
         # ----------------------------
         if rotation:
             space = space.rotate(rotation, expand=True)
@@ -187,33 +413,7 @@ class Canvas:
             A list of strings, each representing one wrapped line.
         """
 
-        font = self._font
-        words = text.split(" ")
-        lines = []
-        current_line = ""
-
-        for word in words:
-            # Test candidate line
-            proposed = (current_line + " " + word).strip()
-
-            if font.getlength(proposed) <= max_width:
-                # Word fits — extend current line
-                current_line = proposed
-            else:
-                # Word does not fit
-                if not current_line:
-                    # Word itself too long: force-break
-                    lines.append(word)
-                else:
-                    # Push current line and start a new one
-                    lines.append(current_line)
-                    current_line = word
-
-        # Add final line
-        if current_line:
-            lines.append(current_line)
-
-        return lines
+        return list(_cached_wrap(self._font.path, self._font.size, text, max_width))
 
     def auto_fontsize(self, max_height: int, sample_text: str = "Ag", target_ratio: float = 0.80) -> None:
         """
@@ -229,27 +429,16 @@ class Canvas:
             None — self.font and self._font_size are updated.
         """
 
-        best_size = 1
         target_height = max_height * target_ratio
+        font_path = self.font_enum.value
 
-        # Start from the current size
-        size = self._font_size
-
-        # Increment font size until height overshoots target
-        while True:
-            font = _load_font(self.font_enum.value, size)
-            bbox = font.getbbox(sample_text)
-            height = bbox[3] - bbox[1]
-
-            if height > target_height:
-                break
-
-            best_size = size
-            size += 1
+        # Start from the current size, find the first size overshooting the target
+        start = self._font_size
+        size = _first_size(lambda size: _text_size(font_path, size, sample_text)[1] > target_height, start)
+        best_size = size - 1 if size > start else 1
 
         # Load the chosen font size
         self._font_size = best_size
-        font_path = self.font_enum.value
         self._font = _load_font(font_path, best_size)
 
     def get_line_height(self, sample_text: str = "Ag") -> int:
@@ -295,73 +484,12 @@ class Canvas:
             font: Optional[FONTS] = None,
     ) -> None:
 
-        box_x, box_y = xy
-        box_w, box_h = box_size
-
         # Select icon font
         font_enum = font or FONTS.weather_icons
-        font_path = font_enum.value
-
-        # --- Determine max usable size ---
-        size = 8
-        while True:
-            test_font = _load_font(font_path, size)
-            bbox = test_font.getbbox(icon)
-            w = bbox[2] - bbox[0]
-            h = bbox[3] - bbox[1]
-            if w >= box_w * fill_ratio or h >= box_h * fill_ratio:
-                size = max(8, size - 1)
-                break
-            size += 1
-
-        font_final = _load_font(font_path, size)
-
-        # --- TEMP CANVAS FOR PIXEL ANALYSIS ---
-        temp_w = box_w * 2
-        temp_h = box_h * 2
-
-        # 1) Render icon for ALPHA extraction
-        temp_alpha = Image.new("L", (temp_w, temp_h), 0)
-        dA = ImageDraw.Draw(temp_alpha)
-        dA.text((temp_w // 2, temp_h // 2), icon, fill=255, font=font_final, anchor="mm")
-
-        # Convert to numpy
-        import numpy as np
-        arr = np.asarray(temp_alpha)
-
-        # Detect ink pixels
-        mask = arr > 10  # threshold to keep fill
-
-        if not mask.any():
-            return
-
-        ys, xs = np.where(mask)
-        min_x, max_x = xs.min(), xs.max()
-        min_y, max_y = ys.min(), ys.max()
-
-        ink_w = max_x - min_x + 1
-        ink_h = max_y - min_y + 1
-
-        # Extract the alpha mask for that region
-        mask_region = temp_alpha.crop((min_x, min_y, max_x + 1, max_y + 1))
-
-        # --- 2) Render icon again as RGB fill (full-strength black) ---
-        temp_rgb = Image.new("RGB", (temp_w, temp_h), "white")
-        dR = ImageDraw.Draw(temp_rgb)
-        dR.text((temp_w // 2, temp_h // 2), icon, fill="black", font=font_final, anchor="mm")
-
-        rgb_region = temp_rgb.crop((min_x, min_y, max_x + 1, max_y + 1))
-
-        # --- 3) Combine into RGBA for final paste ---
-        layer = Image.new("RGBA", (box_w, box_h), (0, 0, 0, 0))
 
-        paste_x = (box_w - ink_w) // 2
-        paste_y = (box_h - ink_h) // 2
-
-        layer.paste(rgb_region, (paste_x, paste_y), mask_region)
-
-        if rotation:
-            layer = layer.rotate(rotation, expand=True)
+        layer = icon_bitmap(font_enum.value, icon, tuple(box_size), fill_ratio, rotation or 0)
+        if layer is None:
+            return
 
         # Paste to black layer
         self.image_black.paste(layer, xy, layer)
@@ -378,6 +506,8 @@ class Canvas:
         Light pixels → white
         Threshold-based cleanup prevents blurry thick red shapes.
         """
+        import numpy
+
         arr = numpy.asarray(img.convert("RGB")).copy()
 
         red = arr[:, :, 0]
@@ -399,6 +529,8 @@ class Canvas:
         Convert dark pixels to red with alpha transparency.
         Uses optimized thresholding for more accurate previews.
         """
+        import numpy
+
         arr = numpy.asarray(img.convert("RGBA")).copy()
 
         # dark = colored pixel (0,0,0) after optimization
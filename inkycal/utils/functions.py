@@ -11,6 +11,8 @@ modules, during setup, or anywhere Inkycal requires common functionality.
 
 import logging
 import math
+import socket
+import threading
 import time
 import traceback
 from importlib.metadata import PackageNotFoundError, version as pkg_version
@@ -18,7 +20,6 @@ from pathlib import Path
 from typing import Tuple, Sequence
 
 import arrow
-import requests
 import tzlocal
 from PIL import Image, ImageDraw
 
@@ -78,6 +79,8 @@ def internet_available() -> bool:
         ... else:
         ...     print("Offline!")
     """
+    import requests
+
     for attempt in range(3):
         try:
             requests.get("https://google.com", timeout=5)
@@ -89,6 +92,73 @@ def internet_available() -> bool:
     return False
 
 
+class ConnectivityCheck:
+    """Connectivity check shared by all modules.
+
+    Instead of one HTTPS request per module, a single DNS lookup and TCP
+    connect to ``host:port`` is made and the result is reused for ``ttl``
+    seconds. Concurrent callers wait for the same probe.
+
+    Use the shared instance :data:`network_available` like a function.
+
+    Example:
+        >>> network_available.configure(host="1.1.1.1", port=53)
+        >>> if network_available():
+        ...     print("Online!")
+    """
+
+    def __init__(self, host: str = "google.com", port: int = 443, ttl: float = 60, timeout: float = 3,
+                 attempts: int = 2) -> None:
+        self.host = host
+        self.port = port
+        self.ttl = ttl
+        self.timeout = timeout
+        self.attempts = attempts
+        self._lock = threading.Lock()
+        self._checked_at = None
+        self._online = False
+
+    def configure(self, host: str = None, port: int = None, ttl: float = None) -> None:
+        """Change the probed host, port or TTL. Unset values are left unchanged."""
+        with self._lock:
+            if host:
+                self.host = host
+            if port:
+                self.port = int(port)
+            if ttl is not None:
+                self.ttl = ttl
+            self._checked_at = None
+
+    def invalidate(self) -> None:
+        """Forget the last result, e.g. at the start of a new update cycle."""
+        with self._lock:
+            self._checked_at = None
+
+    def probe(self) -> bool:
+        """Resolve and connect to the configured host, bypassing the cache."""
+        for attempt in range(self.attempts):
+            try:
+                with socket.create_connection((self.host, self.port), timeout=self.timeout):
+                    return True
+            except OSError as e:
+                logger.debug(f"Connectivity probe {attempt + 1}/{self.attempts} to {self.host}:{self.port} failed: {e}")
+                if attempt + 1 < self.attempts:
+                    time.sleep(1)
+        return False
+
+    def __call__(self, force: bool = False) -> bool:
+        with self._lock:
+            if force or self._checked_at is None or time.monotonic() - self._checked_at > self.ttl:
+                self._online = self.probe()
+                self._checked_at = time.monotonic()
+                if not self._online:
+                    logger.warning(f"Network could not be reached ({self.host}:{self.port})")
+            return self._online
+
+
+network_available = ConnectivityCheck()
+
+
 # ------------------------------------------------------------------------------
 # Drawing Helpers
 # ------------------------------------------------------------------------------
@@ -0,0 +1,148 @@
+"""
+Inkycal HTTP client
+Shared requests session used by all modules and utils:
+
+- keep-alive connection pooling, so repeated requests reuse one TLS connection
+- a default timeout on every request and retries with back-off for idempotent requests
+- an on-disk conditional GET cache (ETag / Last-Modified) for large, rarely
+  changing payloads such as iCalendar feeds and images
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import certifi
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from inkycal.settings import Settings
+from inkycal.utils.metrics import timed_fetch
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+DEFAULT_TIMEOUT = 20
+HTTP_CACHE_PATH = os.path.join(settings.CACHE_PATH, "http")
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class _TimeoutSession(requests.Session):
+    """Session which applies DEFAULT_TIMEOUT unless a timeout is given.
+
+    The time spent in every request is attributed to the calling module's
+    ``fetch`` phase (see :mod:`inkycal.utils.metrics`).
+    """
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        with timed_fetch():
+            return super().request(method, url, **kwargs)
+
+
+def get_session() -> requests.Session:
+    """Returns the shared session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            # once retries are used up the last response is returned, callers check its status
+            retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                            allowed_methods=frozenset(["GET", "HEAD"]), raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retries)
+            session = _TimeoutSession()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.verify = certifi.where()
+            _session = session
+    return _session
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """HTTP GET through the shared session, accepts the same arguments as ``requests.get``."""
+    return get_session().get(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """HTTP POST through the shared session, accepts the same arguments as ``requests.post``."""
+    return get_session().post(url, **kwargs)
+
+
+def _cache_paths(url: str, auth=None):
+    # credentials are part of the key (never stored), different users may see different content
+    key = hashlib.sha256(f"{url}|{auth[0] if auth else ''}".encode()).hexdigest()
+    base = os.path.join(HTTP_CACHE_PATH, key)
+    return f"{base}.json", f"{base}.body"
+
+
+def _read_entry(meta_path: str, body_path: str):
+    try:
+        with open(meta_path, "r", encoding="utf-8") as meta_file:
+            meta = json.load(meta_file)
+        with open(body_path, "rb") as body_file:
+            return meta, body_file.read()
+    except (OSError, ValueError):
+        return None, None
+
+
+def _write_entry(meta_path: str, body_path: str, meta: dict, body: bytes):
+    os.makedirs(HTTP_CACHE_PATH, exist_ok=True)
+    # write to a temporary file first, so a concurrent reader never sees half a file
+    for path, data, mode in ((body_path, body, "wb"), (meta_path, json.dumps(meta).encode(), "wb")):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, mode) as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+
+
+def get_cached(url: str, **kwargs) -> requests.Response:
+    """HTTP GET which revalidates a cached copy instead of downloading it again.
+
+    The last response body is kept in the cache folder together with its
+    ``ETag`` and ``Last-Modified`` headers. If the server answers the
+    conditional request with ``304 Not Modified``, the cached body is returned
+    as a regular ``200`` response with ``response.from_cache`` set to ``True``.
+
+    Args:
+        url (str): the URL to fetch.
+        **kwargs: passed on to ``requests.get``, e.g. ``auth`` or ``headers``.
+
+    Returns:
+        requests.Response: the (possibly cached) response. Errors are raised
+        with ``raise_for_status()``.
+    """
+    meta_path, body_path = _cache_paths(url, kwargs.get("auth"))
+    meta, body = _read_entry(meta_path, body_path)
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if meta:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = get(url, headers=headers, **kwargs)
+
+    if response.status_code == 304 and meta:
+        logger.debug(f"{url} not modified, using cached copy")
+        response.status_code = 200
+        response._content = body
+        response.encoding = meta.get("encoding")
+        response.from_cache = True
+        return response
+
+    response.raise_for_status()
+    response.from_cache = False
+
+    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    if etag or last_modified:
+        try:
+            _write_entry(meta_path, body_path,
+                         {"url": url, "etag": etag, "last_modified": last_modified, "encoding": response.encoding},
+                         response.content)
+        except OSError:
+            logger.warning(f"Could not cache response of {url}", exc_info=True)
+    return response
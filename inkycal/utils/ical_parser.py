@@ -3,14 +3,19 @@ Inkycal iCalendar parsing module
 Copyright by aceinnolab
 """
 import arrow
+import hashlib
 import logging
+import os
+import threading
 import time
+import weakref
+from collections import OrderedDict, defaultdict
 
-import certifi
-import requests
 import recurring_ical_events
 from icalendar import Calendar
 
+from inkycal.utils import http_client
+
 """               ---info about iCalendars---
 • all day events start at midnight, ending at midnight of the next day
 • iCalendar saves all event timings in UTC -> need to be converted into local
@@ -21,6 +26,176 @@ from icalendar import Calendar
 
 logger = logging.getLogger(__name__)
 
+# Parsed calendars and their expanded events are cached across cycles, keyed by
+# the hash of the raw iCalendar data. An unchanged feed is neither re-parsed nor
+# re-expanded; a sliding time window only expands the days that are new.
+CACHE_SIZE = 16
+
+# Expanded events which ended this long before the requested window are dropped
+MAX_LOOKBACK_DAYS = 62
+
+_cache_lock = threading.Lock()
+_parsed_calendars = OrderedDict()
+_expanded_windows = OrderedDict()
+# one lock per expanded window, so unrelated calendars are expanded concurrently.
+# A lock lives as long as a request holds it and is never evicted while in use.
+_window_locks = weakref.WeakValueDictionary()
+
+
+def _remember(cache, key, value):
+    """Store value in an LRU cache (an OrderedDict) limited to CACHE_SIZE entries."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def parse_ical(data):
+    """Parse iCalendar data (str or bytes), reusing the result for identical data.
+    Returns a tuple of (content hash, icalendar.Calendar)"""
+    raw = data.encode('utf-8') if isinstance(data, str) else data
+    ical_hash = hashlib.sha256(raw).hexdigest()
+
+    with _cache_lock:
+        calendar = _parsed_calendars.get(ical_hash)
+        if calendar is not None:
+            _parsed_calendars.move_to_end(ical_hash)
+            logger.debug('iCalendar unchanged, using parsed copy')
+            return ical_hash, calendar
+
+    calendar = Calendar.from_ical(data)
+    with _cache_lock:
+        _remember(_parsed_calendars, ical_hash, calendar)
+    return ical_hash, calendar
+
+
+class _ExpandedWindow:
+    """Events of one calendar expanded between start and end"""
+
+    def __init__(self, start):
+        self.start = start
+        self.end = start
+        self.events = {}
+
+
+def _expand(ical, t_start, t_end, timezone):
+    """Expand (recurring) events of ical between t_start and t_end.
+    Returns a list of (occurrence key, formatted event) tuples"""
+
+    # Recurring events time-span has to be in this format:
+    # "%Y%m%dT%H%M%SZ" (python strftime)
+    fmt = lambda date: (date.year, date.month, date.day, date.hour,
+                        date.minute, date.second)
+
+    return [
+        ((str(events.get('UID')), str(events.get('DTSTART').dt), str(events.get('SUMMARY'))), {
+            'title': events.get('SUMMARY').lstrip() if events.get('SUMMARY') else "",
+
+            'begin': arrow.get(events.get('DTSTART').dt).to(timezone) if (
+                    arrow.get(events.get('dtstart').dt).format('HH:mm') != '00:00')
+            else arrow.get(events.get('DTSTART').dt).replace(tzinfo=timezone),
+
+            'end': arrow.get(events.get("DTEND").dt).to(timezone) if (
+                    arrow.get(events.get('dtstart').dt).format('HH:mm') != '00:00')
+            else arrow.get(events.get('DTEND').dt).replace(tzinfo=timezone)
+
+        }) for events in recurring_ical_events.of(ical).between(fmt(t_start), fmt(t_end))]
+
+
+def _expand_cached(ical_hash, ical, t_start, t_end, timezone):
+    """Like _expand, but only expands the part of the timeline not seen before"""
+    key = (ical_hash, timezone)
+    with _cache_lock:
+        window_lock = _window_locks.setdefault(key, threading.Lock())
+
+    # only requests for the same calendar wait for each other, the global lock
+    # is not held while expanding
+    with window_lock:
+        with _cache_lock:
+            window = _expanded_windows.get(key)
+
+        # Start over if the requested timeline does not touch the cached one
+        if window is None or t_end < window.start or t_start > window.end:
+            window = _ExpandedWindow(t_start)
+
+        missing = []
+        if t_start < window.start:
+            missing.append((t_start, window.start))
+        if t_end > window.end:
+            missing.append((window.end, t_end))
+
+        for start, end in missing:
+            logger.debug(f'expanding events from {start} to {end}')
+            window.events.update(_expand(ical, start, end, timezone))
+        window.start, window.end = min(window.start, t_start), max(window.end, t_end)
+
+        # Forget events long gone so the window does not grow forever
+        horizon = t_start.shift(days=-MAX_LOOKBACK_DAYS)
+        if window.start < horizon:
+            window.events = {k: e for k, e in window.events.items() if e['end'] > horizon}
+            window.start = horizon
+
+        with _cache_lock:
+            _remember(_expanded_windows, key, window)
+
+        return [dict(event) for event in window.events.values()
+                if event['begin'] < t_end and (event['end'] > t_start or event['begin'] >= t_start)]
+
+
+class EventStore:
+    """Process-wide store of iCalendar sources, shared by all modules.
+
+    Each URL or file is fetched and parsed at most once every ``ttl`` seconds,
+    even if several modules (e.g. Agenda and Calendar) request it at the same
+    time. Together with the expanded-event cache, overlapping timelines of
+    different modules cost a single download and a single expansion per cycle.
+    """
+
+    def __init__(self, ttl: float = 30):
+        self.ttl = ttl
+        self._sources = {}
+        self._locks = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+
+    def _load(self, key, fetch, version=None):
+        """Return (content hash, calendar) of a source, fetching it only if its
+        entry expired or its version (e.g. the modification time of a file) changed"""
+        with self._lock:
+            source_lock = self._locks[key]
+
+        # concurrent requests for the same source wait for a single fetch
+        with source_lock:
+            entry = self._sources.get(key)
+            if entry and entry[1] == version and time.monotonic() - entry[0] < self.ttl:
+                return entry[2], entry[3]
+            ical_hash, calendar = parse_ical(fetch())
+            self._sources[key] = (time.monotonic(), version, ical_hash, calendar)
+            return ical_hash, calendar
+
+    def load_url(self, url, username=None, password=None):
+        """Return (content hash, calendar) of an iCalendar URL"""
+        auth = None if (username is None) and (password is None) else (username, password)
+        return self._load(('url', url, username), lambda: str(http_client.get_cached(url, auth=auth).text))
+
+    def load_file(self, path):
+        """Return (content hash, calendar) of an iCalendar file, re-read when modified"""
+        path = os.path.abspath(path)
+
+        def read():
+            with open(path, mode='r') as ical_file:
+                return ical_file.read()
+
+        return self._load(('file', path), read, version=os.stat(path).st_mtime_ns)
+
+    def clear(self):
+        """Forget all sources, the next request fetches them again"""
+        with self._lock:
+            self._sources.clear()
+            self._locks.clear()
+
+
+event_store = EventStore()
+
 
 class iCalendar:
     """iCalendar parsing moudule for inkycal.
@@ -29,6 +204,16 @@ class iCalendar:
     def __init__(self):
         self.icalendars = []
         self.parsed_events = []
+        # content hash of each loaded calendar, by id()
+        self._hashes = {}
+
+    def _add(self, data):
+        """Parse (or reuse) iCalendar data and return the calendar"""
+        return self._remember_hash(*parse_ical(data))
+
+    def _remember_hash(self, ical_hash, ical):
+        self._hashes[id(ical)] = ical_hash
+        return ical
 
     def load_url(self, url, username=None, password=None):
         """Input a string or list of strings containing valid iCalendar URLs
@@ -36,35 +221,11 @@ class iCalendar:
         add username and password to access protected files
         """
 
-        def auth_ical(url, uname, passwd):
-            """Authorisation helper for protected ical files"""
-
-            response = requests.get(
-                url,
-                auth=(uname, passwd),
-                timeout=20,
-                verify=certifi.where(),
-            )
-            response.raise_for_status()
-            ical = Calendar.from_ical(str(response.text))
-            return ical
-
+        # Calendars are fetched through the shared event store
         if type(url) == list:
-            if (username is None) and (password is None):
-                ical = []
-                for each_url in url:
-                    response = requests.get(each_url, timeout=20, verify=certifi.where())
-                    response.raise_for_status()
-                    ical.append(Calendar.from_ical(str(response.text)))
-            else:
-                ical = [auth_ical(each_url, username, password) for each_url in url]
+            ical = [self._remember_hash(*event_store.load_url(each_url, username, password)) for each_url in url]
         elif type(url) == str:
-            if (username is None) and (password is None):
-                response = requests.get(url, timeout=20, verify=certifi.where())
-                response.raise_for_status()
-                ical = [Calendar.from_ical(str(response.text))]
-            else:
-                ical = [auth_ical(url, username, password)]
+            ical = [self._remember_hash(*event_store.load_url(url, username, password))]
         else:
             raise Exception(f"Input: '{url}' is not a string or list!")
 
@@ -79,14 +240,10 @@ class iCalendar:
         """
         if isinstance(filepath, list):
             for path in filepath:
-                with open(path, mode='r') as ical_file:
-                    ical = (Calendar.from_ical(ical_file.read()))
-                    self.icalendars.append(ical)
+                self.icalendars.append(self._remember_hash(*event_store.load_file(path)))
 
         elif isinstance(filepath, str):
-            with open(filepath, mode='r') as ical_file:
-                ical = (Calendar.from_ical(ical_file.read()))
-                self.icalendars.append(ical)
+            self.icalendars.append(self._remember_hash(*event_store.load_file(filepath)))
         else:
             raise Exception(f"Input: '{filepath}' is not a string or list!")
 
@@ -107,37 +264,13 @@ class iCalendar:
         else:
             raise Exception('Please input a valid arrow (time) object!')
 
-        # parse non-recurring events
-
-        # Recurring events time-span has to be in this format:
-        # "%Y%m%dT%H%M%SZ" (python strftime)
-        fmt = lambda date: (date.year, date.month, date.day, date.hour,
-                            date.minute, date.second)
-
-        t_start_recurring = fmt(t_start)
-        t_end_recurring = fmt(t_end)
-
-        # Fetch recurring events
-        recurring_events = (recurring_ical_events.of(ical).between(
-            t_start_recurring, t_end_recurring)
-            for ical in self.icalendars)
-
-        events = (
-            {
-                'title': events.get('SUMMARY').lstrip() if events.get('SUMMARY') else "",
-
-                'begin': arrow.get(events.get('DTSTART').dt).to(timezone) if (
-                        arrow.get(events.get('dtstart').dt).format('HH:mm') != '00:00')
-                else arrow.get(events.get('DTSTART').dt).replace(tzinfo=timezone),
-
-                'end': arrow.get(events.get("DTEND").dt).to(timezone) if (
-                        arrow.get(events.get('dtstart').dt).format('HH:mm') != '00:00')
-                else arrow.get(events.get('DTEND').dt).replace(tzinfo=timezone)
-
-            } for ical in recurring_events for events in ical)
-
-        # if any recurring events were found, add them to parsed_events
-        if events: self.parsed_events += list(events)
+        # Fetch (recurring) events, expanding only what is not cached yet
+        for ical in self.icalendars:
+            ical_hash = self._hashes.get(id(ical))
+            if ical_hash is None:
+                self.parsed_events += [event for _, event in _expand(ical, t_start, t_end, timezone)]
+            else:
+                self.parsed_events += _expand_cached(ical_hash, ical, t_start, t_end, timezone)
 
         # Sort events by their beginning date
         self.sort()
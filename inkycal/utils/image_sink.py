@@ -0,0 +1,44 @@
+"""Image sink
+Writes the images generated in each cycle to disk in a background thread, so the
+render pipeline never waits for PNG encoding or the SD card.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+class ImageSink:
+    def __init__(self, folder: str):
+        self.folder = folder
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-sink")
+        self._pending = []
+
+    def save(self, image: Image.Image, filename: str):
+        """Queue a copy of the image to be saved as PNG in the sink's folder."""
+        self._pending = [future for future in self._pending if not future.done()]
+        self._pending.append(self._executor.submit(self._write, image.copy(), filename))
+
+    def save_rendered(self, render: Callable[[], Image.Image], filename: str):
+        """Queue an image which is only created by ``render()`` in the background, e.g. a preview.
+
+        ``render`` must not depend on state that changes after this call.
+        """
+        self._pending = [future for future in self._pending if not future.done()]
+        self._pending.append(self._executor.submit(lambda: self._write(render(), filename)))
+
+    def _write(self, image: Image.Image, filename: str):
+        try:
+            image.save(os.path.join(self.folder, filename), "PNG")
+        except OSError:
+            logger.exception(f"Could not write {filename} to {self.folder}")
+
+    def flush(self):
+        """Block until all queued images have been written."""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
@@ -7,13 +7,13 @@ Copyright by aceinnolab
 """
 import logging
 import os
+from io import BytesIO
 from typing import Literal
 
-import numpy
 import PIL
-import requests
 from PIL import Image
 
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,8 +46,10 @@ class Inkyimage:
         # Try to open the image if it exists and is an image file
         try:
             if path.startswith("http"):
+                from inkycal.utils import http_client
+
                 logger.info("loading image from URL")
-                image = Image.open(requests.get(path, stream=True).raw)
+                image = Image.open(BytesIO(http_client.get_cached(path).content))
             else:
                 logger.info("loading image from local path")
                 image = Image.open(path)
@@ -183,6 +185,8 @@ class Inkyimage:
         Convert any non-white pixels to red with transparency.
         Used for generating preview images that simulate colour e-paper.
         """
+        import numpy
+
         arr = numpy.asarray(img.convert("RGBA")).copy()
 
         # Detect all non-white pixels (RGB != 255,255,255)
@@ -304,6 +308,8 @@ def image_to_palette(
         r_col, g_col, b_col = rgb
         # print(f'r:{r_col} g:{g_col} b:{b_col}')
 
+        import numpy
+
         # Create an image buffer for black pixels
         buffer1 = numpy.array(quantized_im)
 
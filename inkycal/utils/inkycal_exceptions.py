@@ -13,3 +13,15 @@ class NetworkNotReachableError(Exception):
     def __init__(self, message="Inkycal could not establish a connection to the web"):
         self.message = message
         super().__init__(self.message)
+
+
+class BusyTimeoutError(Exception):
+    def __init__(self, message="The E-Paper display did not release its BUSY line in time"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class RenderServiceError(Exception):
+    def __init__(self, message="The E-Paper render service is not available"):
+        self.message = message
+        super().__init__(self.message)
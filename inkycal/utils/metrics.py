@@ -0,0 +1,185 @@
+"""Cycle metrics
+Records where the time of each Inkycal cycle goes (module fetch/render, assembly,
+optimisation, hash check, getbuffer, SPI transfer, BUSY waits, sleep) together
+with the peak RSS and per-module memory deltas. One JSON line per cycle is kept
+in a rolling ``metrics.jsonl`` under ``settings.CACHE_PATH``.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+from inkycal.settings import Settings
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX only
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+METRICS_FILE = os.path.join(settings.CACHE_PATH, "metrics.jsonl")
+
+# Number of cycles kept in the metrics file
+MAX_RECORDS = 500
+
+_local = threading.local()
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes, 0 if unknown."""
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes, 0 if unknown."""
+    if resource is None:
+        return 0
+    # ru_maxrss is reported in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def record_fetch(seconds: float) -> None:
+    """Attribute network time to the module running in the current thread (if any)."""
+    module = getattr(_local, "module", None)
+    if module is not None:
+        module["fetch"] += seconds
+
+
+@contextmanager
+def timed_fetch():
+    """Time a network request for :func:`record_fetch`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_fetch(time.perf_counter() - start)
+
+
+class CycleMetrics:
+    """Timings of one cycle, filled in by the render pipeline."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.phases = {}
+        self.modules = {}
+        self.extra = {}
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        """Add the duration of the ``with`` block to phase ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    @contextmanager
+    def module(self, number: int, name: str):
+        """Time a module's ``generate_image()`` in the current (worker) thread.
+
+        Network requests made through :mod:`inkycal.utils.http_client` while the
+        block runs are counted as ``fetch``, the rest as ``render``. The memory
+        delta is approximate since modules run concurrently.
+        """
+        record = {"name": name, "fetch": 0.0}
+        previous, _local.module = getattr(_local, "module", None), record
+        rss, start = current_rss(), time.perf_counter()
+        try:
+            yield record
+        finally:
+            total = time.perf_counter() - start
+            _local.module = previous
+            record["render"] = max(0.0, total - record["fetch"])
+            record["total"] = total
+            record["rss_delta"] = current_rss() - rss
+            with self._lock:
+                self.modules[str(number)] = record
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "timestamp": self.started,
+                "duration": time.perf_counter() - self._start,
+                "phases": {phase: round(seconds, 6) for phase, seconds in self.phases.items()},
+                "modules": {number: {key: round(value, 6) if isinstance(value, float) else value
+                                     for key, value in record.items()}
+                            for number, record in self.modules.items()},
+                "peak_rss": peak_rss(),
+                **self.extra,
+            }
+
+
+class MetricsLog:
+    """Rolling JSONL file of :class:`CycleMetrics`, one line per cycle."""
+
+    def __init__(self, path: Optional[str] = None, max_records: int = MAX_RECORDS):
+        self.path = path or METRICS_FILE
+        self.max_records = max_records
+        self._lock = threading.Lock()
+
+    def append(self, metrics: CycleMetrics) -> dict:
+        record = metrics.as_dict()
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as file:
+                    file.write(json.dumps(record, sort_keys=True) + "\n")
+                self._truncate()
+            except OSError:
+                logger.exception(f"Could not write metrics to {self.path}")
+        return record
+
+    def _truncate(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as file:
+            lines = file.readlines()
+        # Rewrite only once the file is 10% over the limit
+        if len(lines) <= self.max_records * 1.1:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as file:
+            file.writelines(lines[-self.max_records:])
+        os.replace(tmp, self.path)
+
+    def read(self, limit: Optional[int] = None) -> List[dict]:
+        """Return the most recent records, oldest first."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return []
+        records = []
+        for line in lines[-limit:] if limit else lines:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return records
+
+
+def summarize(records: List[dict]) -> dict:
+    """Average seconds per phase and the highest peak RSS over ``records``."""
+    totals = {}
+    for record in records:
+        for phase, seconds in record.get("phases", {}).items():
+            totals[phase] = totals.get(phase, 0.0) + seconds
+    return {
+        "cycles": len(records),
+        "phases": {phase: round(seconds / len(records), 6) for phase, seconds in totals.items()},
+        "peak_rss": max((record.get("peak_rss", 0) for record in records), default=0),
+    }
@@ -11,9 +11,10 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Literal
 
-import requests
 from dateutil import tz
 
+from inkycal.utils import http_client
+
 # Type annotations for strict typing
 TEMP_UNITS = Literal["celsius", "fahrenheit"]
 WIND_UNITS = Literal["meters_sec", "km_hour", "miles_hour", "knots", "beaufort"]
@@ -33,7 +34,7 @@ def is_timestamp_within_range(timestamp: datetime, start_time: datetime, end_tim
 
 def get_json_from_url(request_url):
     """Performs an HTTP GET request and returns the parsed JSON response."""
-    response = requests.get(request_url)
+    response = http_client.get(request_url)
     if not response.ok:
         raise AssertionError(
             f"Failure getting weather: code {response.status_code}. Reason: {response.text}"
@@ -0,0 +1,118 @@
+"""
+Cold-start import profile of Inkycal.
+
+On a Pi Zero, every module imported before the first cycle costs noticeable
+time (and battery when ``shutdown_after_run`` is used). This helper runs a
+fresh interpreter with ``python -X importtime`` and reports what each import
+costs, e.g. via ``python3 inky_run.py --profile-startup``.
+
+Heavy third-party packages (numpy, requests, matplotlib, ...) are imported by
+the code that needs them, and modules are only imported when they are
+configured, so ``import inkycal.main`` alone stays within
+:data:`IMPORT_BUDGET` and :data:`TIME_BUDGET`.
+"""
+import subprocess
+import sys
+import time
+from typing import Iterable, List, NamedTuple
+
+from inkycal.modules import InkycalModuleImporter
+from inkycal.settings import project_root
+
+# Packages which must not be imported by `import inkycal.main` alone
+HEAVY_IMPORTS = ("numpy", "requests", "matplotlib", "pandas", "yfinance", "icalendar")
+
+# Upper bounds for `import inkycal.main`. The time budget holds on a development
+# machine and is only tested with INKYCAL_STARTUP_TIMING=1.
+IMPORT_BUDGET = 350
+TIME_BUDGET = 1.0
+
+
+class ImportRecord(NamedTuple):
+    """Cost of one import as reported by ``-X importtime``."""
+    name: str
+    self_seconds: float
+    cumulative_seconds: float
+    depth: int
+
+
+class StartupProfile(NamedTuple):
+    records: List[ImportRecord]
+    wall_seconds: float
+
+    @property
+    def import_seconds(self) -> float:
+        """Total time spent importing (sum of all top-level imports)."""
+        return sum(record.cumulative_seconds for record in self.records if record.depth == 0)
+
+    @property
+    def modules(self) -> List[str]:
+        return [record.name for record in self.records]
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parse the stderr output of ``python -X importtime``."""
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            records.append(ImportRecord(
+                name=name.strip(),
+                self_seconds=int(self_us) / 1e6,
+                cumulative_seconds=int(cumulative_us) / 1e6,
+                depth=(len(name) - len(name.lstrip()) - 1) // 2,
+            ))
+        except ValueError:
+            # header line ("self [us] | cumulative | imported package")
+            continue
+    return records
+
+
+def profile_imports(statement: str = "import inkycal.main", python: str = sys.executable) -> StartupProfile:
+    """Run ``statement`` in a fresh interpreter and return the cost of every import.
+
+    Raises:
+        RuntimeError: If the statement fails.
+    """
+    start = time.perf_counter()
+    result = subprocess.run([python, "-X", "importtime", "-c", statement], capture_output=True, text=True,
+                            cwd=project_root)
+    wall_seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Profiling '{statement}' failed: {result.stderr.strip().splitlines()[-1:]}")
+    return StartupProfile(parse_importtime(result.stderr), wall_seconds)
+
+
+def configured_imports(settings: dict) -> List[str]:
+    """Return the python modules of all modules configured in settings.json."""
+    paths = []
+    for module in settings.get("modules", []):
+        try:
+            paths.append(InkycalModuleImporter[module["name"]].value.rsplit(".", 1)[0])
+        except KeyError:
+            continue
+    return paths
+
+
+def startup_statement(module_paths: Iterable[str] = ()) -> str:
+    """Statement importing Inkycal and the given modules, like a cold start does."""
+    return "; ".join(["import inkycal.main", *(f"import {path}" for path in module_paths)])
+
+
+def format_report(profile: StartupProfile, top: int = 25) -> str:
+    """Format the most expensive imports as a table."""
+    lines = [
+        f"Cold start: {profile.wall_seconds:.3f}s wall, {profile.import_seconds:.3f}s importing "
+        f"{len(profile.records)} modules",
+        "",
+        f"{'cumulative [s]':>14}  {'self [s]':>9}  module",
+    ]
+    for record in sorted(profile.records, key=lambda r: r.cumulative_seconds, reverse=True)[:top]:
+        lines.append(f"{record.cumulative_seconds:>14.4f}  {record.self_seconds:>9.4f}  "
+                     f"{'  ' * record.depth}{record.name}")
+    heavy = [name for name in HEAVY_IMPORTS if name in profile.modules]
+    if heavy:
+        lines += ["", f"Heavy packages imported at startup: {', '.join(heavy)}"]
+    return "\n".join(lines)
@@ -22,6 +22,7 @@ from zoneinfo import available_timezones
 from inkycal.display.supported_models import is_parallel_display, supported_models
 from inkycal.settings import Settings
 from inkycal.utils.functions import get_inkycal_version
+from inkycal.utils.metrics import MetricsLog, summarize
 
 settings = Settings()
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -248,6 +249,16 @@ def _hardware_details() -> Dict[str, str]:
     }
 
 
+def _metrics_details(query: Dict[str, List[str]]) -> Dict[str, object]:
+    """Recent cycle metrics (``?limit=N``, default 50) and their averages."""
+    try:
+        limit = max(1, int(query.get("limit", ["50"])[0]))
+    except ValueError:
+        limit = 50
+    records = MetricsLog().read(limit)
+    return {"summary": summarize(records), "records": records}
+
+
 def _list_logs() -> List[Path]:
     candidates: List[Path] = []
     for path in [Path(settings.LOG_PATH), PROJECT_ROOT]:
@@ -1175,6 +1186,10 @@ class InkycalWebUiHandler(BaseHTTPRequestHandler):
             self._send_json(_hardware_details())
             return
 
+        if parsed.path == "/api/metrics":
+            self._send_json(_metrics_details(urllib.parse.parse_qs(parsed.query)))
+            return
+
         if parsed.path == "/paypal-qr.png":
             qr_path = _ensure_paypal_qr(PAYPAL_URL)
             if qr_path and qr_path.exists():
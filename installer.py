@@ -25,6 +25,9 @@ except ImportError:  # pragma: no cover - non-POSIX only
 
 APT_PACKAGES_FILE = "apt_packages.txt"
 WIRINGPI_REPO_URL = "https://github.com/WiringPi/WiringPi"
+DRIVERS_DIR = Path("inkycal") / "display" / "drivers"
+SPI_BULK_SOURCE = "epd_12_in_48_bulk.c"
+SPI_BULK_LIBRARY = "epd_12_in_48_bulk.so"
 
 PIP_INDEX_ARGS = [
     "--index-url", "https://www.piwheels.org/simple",
@@ -328,6 +331,7 @@ def install_or_repair(ctx: InstallerContext) -> None:
         print(f"Warning: apt dependency step failed: {error}")
 
     install_wiringpi(ctx)
+    build_spi_bulk_helper(ctx)
     setup_swap(ctx, prompt=True)
 
     if not ctx.venv_dir.exists():
@@ -365,6 +369,26 @@ def install_wiringpi(ctx: InstallerContext) -> None:
     save_state(ctx, "wiringpi", "ok")
 
 
+def build_spi_bulk_helper(ctx: InstallerContext) -> None:
+    if sys.platform != "linux":
+        print("Skipping 12.48\" SPI helper build on non-Linux host.")
+        return
+
+    # Lets the 12.48" drivers send a whole sub-panel in one call instead of one call per byte
+    print('Building SPI bulk write helper (speeds up 12.48" displays)...')
+    drivers_dir = ctx.repo_root / DRIVERS_DIR
+    try:
+        result = run_command(
+            ["gcc", "-shared", "-fPIC", "-O2", "-o", SPI_BULK_LIBRARY, SPI_BULK_SOURCE],
+            cwd=drivers_dir,
+        )
+        print_command_result(result)
+    except Exception as error:
+        print(f"Warning: SPI helper build failed, 12.48\" displays fall back to byte-wise writes: {error}")
+        return
+    save_state(ctx, "spi_bulk_helper", "ok")
+
+
 def update_inkycal(ctx: InstallerContext) -> None:
     print("Updating Inkycal repository...")
     try:
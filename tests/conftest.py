@@ -0,0 +1,22 @@
+"""Shared pytest setup of the tests"""
+import os
+
+_previous_backend = None
+
+
+def pytest_configure(config):
+    """Select the hardware-free GPIO/SPI backend before any test module is imported.
+
+    ``epdconfig`` picks its backend when it is first imported, several test
+    modules import it (or a driver) at module level.
+    """
+    global _previous_backend
+    _previous_backend = os.environ.get("INKYCAL_EPD_BACKEND")
+    os.environ["INKYCAL_EPD_BACKEND"] = "fake"
+
+
+def pytest_unconfigure(config):
+    if _previous_backend is None:
+        os.environ.pop("INKYCAL_EPD_BACKEND", None)
+    else:
+        os.environ["INKYCAL_EPD_BACKEND"] = _previous_backend
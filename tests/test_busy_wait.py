@@ -0,0 +1,84 @@
+"""
+Tests for the E-Paper BUSY wait strategies
+"""
+import unittest
+
+from inkycal.display.busy import wait_until_idle, telemetry, POLL_INTERVAL_MAX
+from inkycal.display.drivers import epdconfig
+from inkycal.utils.inkycal_exceptions import BusyTimeoutError
+
+
+class BusyPin:
+    """Pin that reports busy for a fixed number of reads."""
+
+    def __init__(self, busy_reads, busy_level=1):
+        self.busy_reads = busy_reads
+        self.busy_level = busy_level
+        self.reads = 0
+
+    def read(self):
+        self.reads += 1
+        return self.busy_level if self.reads <= self.busy_reads else 1 - self.busy_level
+
+
+class TestBusyWait(unittest.TestCase):
+
+    def setUp(self):
+        telemetry.clear()
+        self.sleeps = []
+
+    def test_idle_pin_does_not_sleep(self):
+        pin = BusyPin(0)
+        wait_until_idle(pin.read, 1, sleep=self.sleeps.append)
+        self.assertEqual(self.sleeps, [])
+        self.assertEqual(pin.reads, 1)
+
+    def test_poll_backs_off(self):
+        pin = BusyPin(10, busy_level=0)
+        wait_until_idle(pin.read, 0, sleep=self.sleeps.append)
+        self.assertEqual(len(self.sleeps), 10)
+        self.assertEqual(self.sleeps, sorted(self.sleeps))
+        self.assertEqual(self.sleeps[-1], POLL_INTERVAL_MAX)
+
+    def test_poke_runs_before_every_read(self):
+        pin = BusyPin(3)
+        pokes = []
+        wait_until_idle(pin.read, 1, sleep=self.sleeps.append, poke=lambda: pokes.append(pin.reads))
+        self.assertEqual(pokes, [0, 1, 2, 3])
+
+    def test_edge_wait_is_used(self):
+        pin = BusyPin(100)
+        timeouts = []
+        wait_until_idle(pin.read, 1, sleep=self.sleeps.append, edge_wait=lambda t: timeouts.append(t) or True,
+                        timeout=5)
+        self.assertEqual(timeouts, [5])
+        self.assertEqual(self.sleeps, [])
+        self.assertEqual(telemetry.records[-1]["strategy"], "edge")
+
+    def test_timeout(self):
+        pin = BusyPin(10 ** 9)
+        with self.assertRaises(BusyTimeoutError):
+            wait_until_idle(pin.read, 1, sleep=lambda s: None, timeout=0.01)
+        with self.assertRaises(BusyTimeoutError):
+            wait_until_idle(pin.read, 1, edge_wait=lambda t: False, timeout=0.01)
+
+    def test_telemetry_per_phase(self):
+        with telemetry.track("display"):
+            wait_until_idle(BusyPin(2).read, 1, sleep=lambda s: None)
+        wait_until_idle(BusyPin(0).read, 1)
+        self.assertEqual(set(telemetry.summary()), {"display", "busy"})
+        self.assertEqual(len(telemetry.records), 2)
+
+    def test_fake_backend_driver_wait(self):
+        backend = epdconfig.FakeBackend()
+        self.addCleanup(epdconfig.use_implementation, epdconfig.implementation)
+        epdconfig.use_implementation(backend)
+        from inkycal.display.drivers import epd_7_in_5_v3
+        epd = epd_7_in_5_v3.EPD()
+        epd.ReadBusy()
+        self.assertEqual(len(telemetry.records), 1)
+        self.assertGreaterEqual(backend.calls["digital_read"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
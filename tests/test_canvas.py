@@ -65,6 +65,37 @@ class TestCanvas(unittest.TestCase):
         non_white = any(px != (255, 255, 255) for px in img.get_flattened_data())
         self.assertTrue(non_white)
 
+    def test_text_wrap_matches_font_length(self):
+        """Lines measured with the glyph advance table must fit like with font.getlength()."""
+        from inkycal.utils.canvas import _wrap
+
+        font = self.canvas._font
+        text = "Sprint planning with the whole team, in the large room on floor 2 (WiFi: guest)"
+        for max_width in (30, 80, 150, 400):
+            lines = _wrap(font, text, max_width)
+            self.assertEqual(" ".join(lines), text)
+            for line in lines:
+                if " " in line:
+                    self.assertLessEqual(font.getlength(line), max_width)
+
+    def test_layout_cache(self):
+        """Writing the same text again reuses its layout."""
+        from inkycal.utils.canvas import text_layout
+
+        text_layout.cache_clear()
+        self.canvas.write((0, 0), (100, 40), "Hello world")
+        self.canvas.write((0, 50), (100, 40), "Hello world")
+        info = text_layout.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+        # autofit results are cached too and still update the canvas' font size
+        self.canvas.write((0, 0), (100, 40), "Hello", autofit=True)
+        size = self.canvas.font_size
+        self.canvas.set_font_size(12)
+        self.canvas.write((0, 0), (100, 40), "Hello", autofit=True)
+        self.assertEqual(self.canvas.font_size, size)
+        self.assertEqual(self.canvas._font.size, size)
+
     def test_auto_fontsize(self):
         """Font should scale up but stay below height constraint."""
         initial_size = self.canvas.font_size
@@ -75,8 +106,34 @@ class TestCanvas(unittest.TestCase):
         self.assertGreaterEqual(new_size, initial_size)
         self.assertLess(new_size, 100)  # sanity cap
 
+    def test_size_search_matches_linear_search(self):
+        """The binary size search must pick the same sizes as stepping one point at a time."""
+        from inkycal.utils.canvas import _first_size, _fit_font_size, _load_font, _text_size
+
+        def linear(fits, start):
+            size = start
+            while not fits(size):
+                size += 1
+            return size
+
+        font_path = self.canvas.font_enum.value
+        for box_h in (5, 12, 27, 40, 96, 200):
+            target = int(box_h * 0.8)
+            bbox = lambda size: _load_font(font_path, size).getbbox("Ag")  # noqa: E731
+            old = linear(lambda size: bbox(size)[3] - bbox(size)[1] >= target, 10)
+            self.assertEqual(_fit_font_size(font_path, box_h, 0.8), old - 1 if old > 8 else old)
+
+            for start in (1, 12, 30):
+                canvas = Canvas((200, 200), font=FONTS.noto_sans_ui_bold, font_size=start)
+                canvas.auto_fontsize(max_height=box_h)
+                fits = lambda size: _text_size(canvas.font_enum.value, size, "Ag")[1] > box_h * 0.8  # noqa: E731
+                old = linear(fits, start)
+                self.assertEqual(canvas.font_size, old - 1 if old > start else 1)
+
+        self.assertEqual(_first_size(lambda size: False, 8), 2048)
+
     @patch("inkycal.utils.canvas.ImageDraw.Draw")
-    @patch("inkycal.utils.canvas.numpy.asarray")
+    @patch("numpy.asarray")
     @patch("inkycal.utils.canvas.Image.new")
     @patch("inkycal.utils.canvas._load_font.__wrapped__")
     def test_draw_icon_calls_draw(
@@ -107,6 +164,34 @@ class TestCanvas(unittest.TestCase):
         # --- Verify draw engine was used ---
         self.assertTrue(mock_draw.called)
 
+    def test_icon_bitmap_cache(self):
+        """Drawing an icon again pastes the cached bitmap, optionally stored on disk."""
+        import os
+        import tempfile
+        from inkycal.utils import canvas as canvas_module
+
+        canvas_module.icon_bitmap.cache_clear()
+        self.canvas.draw_icon((0, 0), (40, 40), "\uf00d", colour="colour")
+        first = self.canvas.image_black.copy()
+
+        canvas = Canvas(self.size, font=FONTS.noto_sans_semicondensed, font_size=12)
+        canvas.draw_icon((0, 0), [40, 40], "\uf00d", colour="colour")
+        self.assertEqual(canvas_module.icon_bitmap.cache_info().hits, 1)
+        self.assertEqual(canvas.image_black.tobytes(), first.tobytes())
+        self.assertEqual(canvas.image_colour.tobytes(), self.canvas.image_colour.tobytes())
+
+        with tempfile.TemporaryDirectory() as path, patch.object(canvas_module, "ICON_CACHE_DIR", path):
+            canvas_module.icon_bitmap.cache_clear()
+            stored = canvas_module.icon_bitmap(FONTS.weather_icons.value, "\uf00d", (40, 40))
+            self.assertEqual(len(os.listdir(path)), 1)
+
+            canvas_module.icon_bitmap.cache_clear()
+            with patch.object(canvas_module, "_rasterize_icon") as rasterize:
+                loaded = canvas_module.icon_bitmap(FONTS.weather_icons.value, "\uf00d", (40, 40))
+            rasterize.assert_not_called()
+            self.assertEqual(loaded.tobytes(), stored.tobytes())
+        canvas_module.icon_bitmap.cache_clear()
+
     def test_optimize_for_red_preview(self):
         """Dark pixels should become black, bright pixels remain white."""
         test_img = Image.new("RGB", (10, 10), "white")
@@ -0,0 +1,176 @@
+"""
+Tests for the bulk SPI data path of the E-Paper drivers, using the fake epdconfig backend
+"""
+import ctypes
+import math
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from importlib import import_module
+from unittest.mock import patch
+
+import numpy as np
+
+from PIL import Image
+
+from inkycal.display.drivers import epdconfig
+
+
+class TestBulkTransfer(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = epdconfig.FakeBackend(chunk_size=4096)
+        self.addCleanup(epdconfig.use_implementation, epdconfig.implementation)
+        epdconfig.use_implementation(self.backend)
+
+    def _render(self, model, colour):
+        epd = import_module(f"inkycal.display.drivers.{model}").EPD()
+        im = Image.new("1", (epd.height, epd.width), "white")
+        epd.init()
+        self.backend.reset_stats()
+        if colour:
+            epd.display(epd.getbuffer(im), epd.getbuffer(im))
+        else:
+            epd.display(epd.getbuffer(im))
+        return epd
+
+    def test_frame_is_streamed_in_chunks(self):
+        epd = self._render("epd_7_in_5_v3_colour", colour=True)
+        plane = epd.width * epd.height // 8
+
+        self.assertEqual(self.backend.calls["spi_writebyte2"], 2 * math.ceil(plane / 4096))
+        self.assertGreaterEqual(self.backend.bytes_written, 2 * plane)
+        # A per-byte transfer toggles DC and CS for every single byte
+        self.assertLess(self.backend.calls["digital_write"], 100)
+
+    def test_all_spi_drivers_use_bulk_path(self):
+        models = {
+            "epd_4_in_2": False, "epd_4_in_2_colour": True, "epd_5_in_83": False,
+            "epd_5_in_83_V2": False, "epd_5_in_83_colour": True, "epd5in83b_V2": True,
+            "epd_7_in_5": False, "epd_7_in_5_colour": True, "epd_7_in_5_v2": False,
+            "epd_7_in_5_v2_colour": True, "epd_7_in_5_v3": False, "epd_7_in_5_v3_colour": True,
+            "epd_13_in_3": False, "epd_13_in_3_colour": True,
+        }
+        for model, colour in models.items():
+            with self.subTest(model=model):
+                epd = self._render(model, colour)
+                self.assertGreaterEqual(self.backend.bytes_written, epd.width * epd.height // 8)
+                self.assertLess(self.backend.calls["spi_writebyte"], 100)
+
+
+class TestSolidFrames(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = epdconfig.FakeBackend(chunk_size=4096)
+        self.addCleanup(epdconfig.use_implementation, epdconfig.implementation)
+        epdconfig.use_implementation(self.backend)
+
+    def test_calibrate_packs_each_frame_once(self):
+        from inkycal.display import Display
+
+        for model, refreshes in (("epd_7_in_5_v3", 6), ("epd_7_in_5_v3_colour", 9)):
+            with self.subTest(model=model):
+                display = Display(model)
+                epd = display._epaper
+                with patch.object(epd, "getbuffer", wraps=epd.getbuffer) as getbuffer, \
+                        patch.object(epd, "display") as show:
+                    display.calibrate(cycles=3)
+                    display.clear()
+                self.assertEqual(getbuffer.call_count, 2)
+                self.assertEqual(show.call_count, refreshes + 1)
+
+                size = display.get_display_size(model)
+                black = epd.getbuffer(Image.new("1", size, "black"))
+                white = epd.getbuffer(Image.new("1", size, "white"))
+                self.assertEqual(show.call_args_list[0].args[0], black)
+                self.assertEqual(show.call_args_list[-1].args[0], white)
+
+    def test_clear_sends_constant_frames(self):
+        from inkycal.display.framebuffer import solid_bytes
+
+        epd = import_module("inkycal.display.drivers.epd_7_in_5_v3").EPD()
+        epd.init()
+        self.backend.reset_stats()
+        epd.Clear()
+        self.assertGreaterEqual(self.backend.bytes_written, 2 * epd.width * epd.height // 8)
+        self.assertIs(solid_bytes(epd.width * epd.height // 8, 0xFF),
+                      solid_bytes(epd.width * epd.height // 8, 0xFF))
+
+
+class TestQuadPanel(unittest.TestCase):
+    """The 12.48" drivers with the stub vendor library of epdconfig_12_in_48"""
+
+    def setUp(self):
+        from inkycal.display.drivers import epdconfig_12_in_48
+        self.config = epdconfig_12_in_48
+        self.assertIsInstance(self.config.spi, self.config.StubLibrary)
+        patcher = patch("time.sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_regions_are_sent_in_one_call_each(self):
+        for model, colour in (("epd_12_in_48", False), ("epd_12_in_48_colour", True),
+                              ("epd_12_in_48_colour_V2", True)):
+            with self.subTest(model=model):
+                epd = import_module(f"inkycal.display.drivers.{model}").EPD()
+                epd.init()
+                rng = np.random.default_rng(1)
+                image = Image.fromarray(rng.integers(0, 2, (epd.height, epd.width), dtype=np.uint8) * 255).convert("1")
+                buf = epd.getbuffer(image)
+                rows = np.frombuffer(buf, dtype=np.uint8).reshape(epd.height, -1)
+
+                self.config.spi.reset()
+                if colour:
+                    epd.display(buf, epd.getbuffer(Image.new("1", (epd.width, epd.height), "white")))
+                else:
+                    epd.display(buf)
+
+                spi = self.config.spi
+                self.assertEqual(spi.calls["DEV_SPI_Write_nByte"], 8 if colour else 4)
+                self.assertLess(spi.calls["DEV_SPI_WriteByte"], 100)
+                regions = {
+                    self.config.EPD_M1_CS_PIN: rows[492:984, 0:81], self.config.EPD_S1_CS_PIN: rows[492:984, 81:163],
+                    self.config.EPD_M2_CS_PIN: rows[0:492, 81:163], self.config.EPD_S2_CS_PIN: rows[0:492, 0:81],
+                }
+                for pin, region in regions.items():
+                    # command byte (0x10 or 0x13), then the region of the black plane
+                    self.assertEqual(bytes(spi.received[pin][1:1 + region.size]), region.tobytes())
+
+    def test_busy_waits_overlap(self):
+        reads = {5: [0, 0, 1], 19: [1], 27: [0, 1], 24: [0, 0, 0, 1]}
+        pokes = []
+        with patch.object(self.config, "digital_read", side_effect=lambda pin: reads[pin].pop(0)):
+            self.config.wait_busy_all({pin: (lambda pin=pin: pokes.append(pin)) for pin in reads}, busy_level=0)
+        self.assertEqual(pokes.count(24), 4)
+        self.assertEqual(pokes.count(19), 1)
+        self.assertTrue(all(not levels for levels in reads.values()))
+
+    @unittest.skipIf(shutil.which("gcc") is None, "needs gcc")
+    def test_bulk_helper(self):
+        """Build the C helper against a stub vendor library and write through it"""
+        source = os.path.join(os.path.dirname(self.config.__file__), "epd_12_in_48_bulk.c")
+        stub = (
+            "#include <stdint.h>\n"
+            "static uint8_t out[1024]; static uint32_t count;\n"
+            "void DEV_SPI_WriteByte(uint8_t value) { out[count++ % 1024] = value; }\n"
+            "uint32_t written(void) { return count; }\n"
+            "uint8_t byte_at(uint32_t i) { return out[i]; }\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "stub.c"), "w") as file:
+                file.write(stub)
+            for name, path in (("stub", os.path.join(tmp, "stub.c")), ("bulk", source)):
+                subprocess.run(["gcc", "-shared", "-fPIC", "-o", os.path.join(tmp, f"{name}.so"), path], check=True)
+            vendor = ctypes.CDLL(os.path.join(tmp, "stub.so"), mode=ctypes.RTLD_GLOBAL)
+            bulk = ctypes.CDLL(os.path.join(tmp, "bulk.so"))
+
+            with patch.object(self.config, "_write_n_bytes", bulk.DEV_SPI_Write_nByte):
+                self.config.spi_write_bulk(np.arange(200, dtype=np.uint8))
+        self.assertEqual(vendor.written(), 200)
+        self.assertEqual([vendor.byte_at(i) for i in (0, 1, 199)], [0, 1, 199])
+
+
+if __name__ == "__main__":
+    unittest.main()
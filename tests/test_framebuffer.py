@@ -0,0 +1,221 @@
+"""
+Tests for the vectorized E-Paper framebuffer packing
+"""
+import random
+import unittest
+
+from PIL import Image, ImageDraw
+
+from inkycal.display.framebuffer import (
+    pack_1bpp, pack_2bpp, invert_buffer, expand_2bpp_to_4bpp, merge_planes_4bpp, as_rows,
+    native_gray, pack_4bpp, pack_8bpp, pack_1bpp_lsb, changed_boxes
+)
+import numpy as np
+
+
+def legacy_getbuffer(image, width, height):
+    """Per-pixel reference implementation previously used by the SPI drivers."""
+    buf = [0xFF] * (int(width / 8) * height)
+    image_monocolor = image.convert('1')
+    imwidth, imheight = image_monocolor.size
+    pixels = image_monocolor.load()
+    if imwidth == width and imheight == height:
+        for y in range(imheight):
+            for x in range(imwidth):
+                if pixels[x, y] == 0:
+                    buf[int((x + y * width) / 8)] &= ~(0x80 >> (x % 8))
+    elif imwidth == height and imheight == width:
+        for y in range(imheight):
+            for x in range(imwidth):
+                newx = y
+                newy = height - x - 1
+                if pixels[x, y] == 0:
+                    buf[int((newx + newy * width) / 8)] &= ~(0x80 >> (y % 8))
+    return buf
+
+
+def legacy_getbuffer_2bpp(image, width, height):
+    """Per-pixel reference implementation of the 2 bits-per-pixel drivers."""
+    buf = [0x00] * int(width * height / 4)
+    image_monocolor = image.convert('1')
+    imwidth, imheight = image_monocolor.size
+    pixels = image_monocolor.load()
+    if imwidth == width and imheight == height:
+        for y in range(imheight):
+            for x in range(imwidth):
+                if pixels[x, y] < 64:
+                    buf[int((x + y * width) / 4)] &= ~(0xC0 >> (x % 4 * 2))
+                else:
+                    buf[int((x + y * width) / 4)] |= 0xC0 >> (x % 4 * 2)
+    elif imwidth == height and imheight == width:
+        for y in range(imheight):
+            for x in range(imwidth):
+                newx = y
+                newy = height - x - 1
+                if pixels[x, y] < 64:
+                    buf[int((newx + newy * width) / 4)] &= ~(0xC0 >> (y % 4 * 2))
+                else:
+                    buf[int((newx + newy * width) / 4)] |= 0xC0 >> (y % 4 * 2)
+    return buf
+
+
+def legacy_expand_2bpp(image):
+    """Per-byte 2bpp -> 4bpp conversion previously done in the UC8159 display()."""
+    out = []
+    for temp1 in image:
+        for _ in range(2):
+            temp2 = 0x03 if (temp1 & 0xC0) == 0xC0 else 0x00 if (temp1 & 0xC0) == 0x00 else 0x04
+            temp2 = (temp2 << 4) & 0xFF
+            temp1 = (temp1 << 2) & 0xFF
+            temp2 |= 0x03 if (temp1 & 0xC0) == 0xC0 else 0x00 if (temp1 & 0xC0) == 0x00 else 0x04
+            temp1 = (temp1 << 2) & 0xFF
+            out.append(temp2)
+    return out
+
+
+def legacy_merge_planes(imageblack, imagered):
+    """Per-byte black/red -> 4bpp conversion previously done in the UC8159 display()."""
+    def nibble(black, red):
+        return 0x04 if (red & 0x80) == 0x00 else 0x00 if (black & 0x80) == 0x00 else 0x03
+
+    out = []
+    for temp1, temp2 in zip(imageblack, imagered):
+        for _ in range(4):
+            temp3 = (nibble(temp1, temp2) << 4) & 0xFF
+            temp1, temp2 = (temp1 << 1) & 0xFF, (temp2 << 1) & 0xFF
+            temp3 |= nibble(temp1, temp2)
+            temp1, temp2 = (temp1 << 1) & 0xFF, (temp2 << 1) & 0xFF
+            out.append(temp3)
+    return out
+
+
+def legacy_it8951_4bpp(image):
+    """Per-pixel reference of the IT8951 BMP loader (GUI_ReadBmp + Paint_SetPixel)."""
+    width, height = image.size
+    buf = [0xFF] * (width // 2 * height)
+    pixels = image.convert("RGB").load()
+    for y in range(height):
+        for x in range(width):
+            r, g, b = pixels[x, y]
+            gray = (r * 299 + g * 587 + b * 114 + 500) // 1000
+            addr = x * 4 // 8 + y * (width // 2)
+            buf[addr] &= ~(0xF0 >> (7 - (x * 4 + 3) % 8)) & 0xFF
+            buf[addr] |= (gray & 0xF0) >> (7 - (x * 4 + 3) % 8)
+    return buf
+
+
+def legacy_it8951_1bpp(levels):
+    """Per-pixel reference of the IT8951 1bpp Paint_SetPixel, white is a set bit."""
+    height, width = levels.shape
+    buf = [0xFF] * (width // 8 * height)
+    for y in range(height):
+        for x in range(width):
+            color = 0xFF if levels[y, x] >= 0x8 else 0x00
+            addr = x // 8 + y * (width // 8)
+            buf[addr] &= ~(0x01 << (x % 8)) & 0xFF
+            buf[addr] |= (color >> 7) << (x % 8)
+    return buf
+
+
+def sample_image(size):
+    """Build an RGB test frame with text-like shapes and a grey gradient."""
+    random.seed(size[0] * size[1])
+    im = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(im)
+    for _ in range(40):
+        x0, y0 = random.randrange(size[0]), random.randrange(size[1])
+        draw.rectangle((x0, y0, x0 + random.randrange(1, 30), y0 + random.randrange(1, 20)), fill="black")
+    for x in range(size[0] // 2):
+        grey = int(255 * x / (size[0] // 2))
+        draw.line((x, 0, x, size[1] // 4), fill=(grey, grey, grey))
+    return im
+
+
+class TestFramebuffer(unittest.TestCase):
+    width, height = 400, 240
+
+    def test_pack_1bpp_horizontal_matches_legacy(self):
+        im = sample_image((self.width, self.height))
+        self.assertEqual(bytes(pack_1bpp(im, self.width, self.height)),
+                         bytes(legacy_getbuffer(im, self.width, self.height)))
+
+    def test_pack_1bpp_vertical_matches_legacy(self):
+        im = sample_image((self.height, self.width))
+        self.assertEqual(bytes(pack_1bpp(im, self.width, self.height)),
+                         bytes(legacy_getbuffer(im, self.width, self.height)))
+
+    def test_pack_1bpp_inverted(self):
+        im = sample_image((self.height, self.width))
+        buf = pack_1bpp(im, self.width, self.height)
+        self.assertEqual(pack_1bpp(im, self.width, self.height, invert=True), invert_buffer(buf))
+
+    def test_pack_1bpp_wrong_size_is_blank(self):
+        im = Image.new("RGB", (10, 10), "black")
+        self.assertEqual(set(pack_1bpp(im, self.width, self.height)), {0xFF})
+        self.assertEqual(set(pack_1bpp(im, self.width, self.height, invert=True)), {0x00})
+
+    def test_pack_2bpp_matches_legacy(self):
+        for size in ((self.width, self.height), (self.height, self.width)):
+            im = sample_image(size)
+            self.assertEqual(bytes(pack_2bpp(im, self.width, self.height)),
+                             bytes(legacy_getbuffer_2bpp(im, self.width, self.height)))
+
+    def test_returns_bytearray(self):
+        im = sample_image((self.width, self.height))
+        buf = pack_1bpp(im, self.width, self.height)
+        self.assertIsInstance(buf, bytearray)
+        self.assertEqual(len(buf), self.width * self.height // 8)
+
+    def test_expand_2bpp_to_4bpp_matches_legacy(self):
+        buf = bytes(range(256))
+        self.assertEqual(bytes(expand_2bpp_to_4bpp(buf)), bytes(legacy_expand_2bpp(buf)))
+
+    def test_merge_planes_4bpp_matches_legacy(self):
+        black = pack_1bpp(sample_image((self.width, self.height)), self.width, self.height)
+        red = pack_1bpp(sample_image((self.height, self.width)), self.width, self.height)
+        self.assertEqual(bytes(merge_planes_4bpp(black, red)), bytes(legacy_merge_planes(black, red)))
+
+    def test_as_rows(self):
+        im = sample_image((self.width, self.height))
+        rows = as_rows(pack_1bpp(im, self.width, self.height), self.width)
+        self.assertEqual(rows.shape, (self.height, self.width // 8))
+
+    def test_pack_4bpp_matches_it8951_loader(self):
+        im = sample_image((self.width, self.height))
+        levels = native_gray(im, self.width, self.height)
+        self.assertEqual(bytes(pack_4bpp(levels)), bytes(legacy_it8951_4bpp(im)))
+
+    def test_native_gray_portrait_is_rotated(self):
+        im = sample_image((self.height, self.width))
+        self.assertEqual(bytes(pack_4bpp(native_gray(im, self.width, self.height))),
+                         bytes(legacy_it8951_4bpp(im.rotate(90, expand=True))))
+
+    def test_pack_8bpp(self):
+        levels = native_gray(sample_image((self.width, self.height)), self.width, self.height)
+        buf = pack_8bpp(levels)
+        self.assertEqual(len(buf), self.width * self.height)
+        self.assertEqual(set(buf) - {level << 4 for level in range(16)}, set())
+
+    def test_pack_1bpp_lsb(self):
+        levels = np.full((2, 16), 0xF, dtype=np.uint8)
+        levels[0, 0] = levels[1, 9] = 0x0
+        # black pixels are cleared bits, white ones set bits
+        self.assertEqual(bytes(pack_1bpp_lsb(levels)), bytes([0xFE, 0xFF, 0xFF, 0xFD]))
+
+        levels = native_gray(sample_image((self.width, self.height)), self.width, self.height)
+        self.assertEqual(bytes(pack_1bpp_lsb(levels)), bytes(legacy_it8951_1bpp(levels)))
+
+    def test_changed_boxes(self):
+        previous = np.full((100, 200), 0xF, dtype=np.uint8)
+        current = previous.copy()
+        current[10:12, 20:25] = 0
+        current[10:12, 150:160] = 0
+        current[80:90, 3:5] = 0
+        self.assertEqual(changed_boxes(previous, current),
+                         [(16, 10, 32, 12), (144, 10, 160, 12), (0, 80, 16, 90)])
+        self.assertEqual(changed_boxes(previous, previous), [])
+        self.assertEqual(changed_boxes(previous, current, limit=1), [(0, 10, 160, 90)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,6 +6,7 @@ import numpy as np
 from inkycal.utils.functions import (
     get_system_tz,
     internet_available,
+    ConnectivityCheck,
     draw_border,
     draw_border_2,
     render_line_chart,
@@ -16,7 +17,7 @@ class TestFunctions(unittest.TestCase):
 
     def setUp(self):
         # Patch requests.get globally for all tests in this class
-        self.requests_patcher = patch("inkycal.utils.functions.requests.get")
+        self.requests_patcher = patch("requests.get")
         self.mock_requests_get = self.requests_patcher.start()
         self.addCleanup(self.requests_patcher.stop)
 
@@ -49,6 +50,34 @@ class TestFunctions(unittest.TestCase):
         self.assertFalse(internet_available())
         self.assertEqual(mock_sleep.call_count, 3)
 
+    # -----------------------------
+    # ConnectivityCheck
+    # -----------------------------
+    @patch("inkycal.utils.functions.socket.create_connection")
+    def test_connectivity_check_is_memoized(self, mock_connect):
+        check = ConnectivityCheck(host="example.org", port=53, ttl=60)
+        self.assertTrue(check())
+        self.assertTrue(check())
+        mock_connect.assert_called_once_with(("example.org", 53), timeout=check.timeout)
+
+        check.invalidate()
+        self.assertTrue(check())
+        self.assertTrue(check(force=True))
+        self.assertEqual(mock_connect.call_count, 3)
+        self.mock_requests_get.assert_not_called()
+
+    @patch("inkycal.utils.functions.time.sleep", return_value=None)
+    @patch("inkycal.utils.functions.socket.create_connection", side_effect=OSError("unreachable"))
+    def test_connectivity_check_offline(self, mock_connect, mock_sleep):
+        check = ConnectivityCheck(attempts=2, ttl=0)
+        self.assertFalse(check())
+        self.assertEqual(mock_connect.call_count, 2)
+        self.assertEqual(mock_sleep.call_count, 1)
+
+        # ttl expired, probe again
+        self.assertFalse(check())
+        self.assertEqual(mock_connect.call_count, 4)
+
     # -----------------------------
     # draw_border()
     # -----------------------------
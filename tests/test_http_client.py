@@ -0,0 +1,93 @@
+"""
+Test the shared HTTP client and its conditional GET cache
+"""
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import patch
+
+from inkycal.utils import http_client
+
+BODY = b"BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n"
+ETAG = '"v1"'
+
+
+class ConditionalHandler(BaseHTTPRequestHandler):
+    """Serves BODY with an ETag and answers 304 when it matches."""
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.headers.get("If-None-Match"))
+        if self.path == "/unavailable":
+            self.send_response(503)
+            self.send_header("Content-Length", "4")
+            self.end_headers()
+            self.wfile.write(b"down")
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Type", "text/calendar; charset=utf-8")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpClient(unittest.TestCase):
+
+    def setUp(self):
+        self.server = HTTPServer(("127.0.0.1", 0), ConditionalHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/calendar.ics"
+        ConditionalHandler.requests_seen = []
+
+        self.cache_dir = tempfile.TemporaryDirectory()
+        patcher = patch.object(http_client, "HTTP_CACHE_PATH", self.cache_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.cache_dir.cleanup()
+
+    def test_session_is_shared(self):
+        self.assertIs(http_client.get_session(), http_client.get_session())
+
+    def test_conditional_get(self):
+        first = http_client.get_cached(self.url)
+        self.assertEqual(first.content, BODY)
+        self.assertFalse(first.from_cache)
+
+        second = http_client.get_cached(self.url)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, BODY)
+        self.assertEqual(second.text, BODY.decode())
+        self.assertTrue(second.from_cache)
+
+        self.assertEqual(ConditionalHandler.requests_seen, [None, ETAG])
+
+    def test_cache_is_per_user(self):
+        http_client.get_cached(self.url)
+        http_client.get_cached(self.url, auth=("user", "secret"))
+        self.assertEqual(ConditionalHandler.requests_seen, [None, None])
+
+    def test_retries_return_last_response(self):
+        url = self.url.replace("/calendar.ics", "/unavailable")
+        with patch.object(http_client.Retry, "sleep"):
+            response = http_client.get(url)
+        # callers get the final response instead of a RetryError
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.text, "down")
+        self.assertEqual(len(ConditionalHandler.requests_seen), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,10 +3,15 @@ iCalendar parser test (ical_parser)
 """
 import logging
 import os
+import tempfile
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
 from urllib.request import urlopen
 
 import arrow
+from inkycal.utils import ical_parser
 from inkycal.utils.ical_parser import iCalendar
 from tests import Config
 
@@ -48,3 +53,153 @@ class TestIcalendar(unittest.TestCase):
         logger.info('OK')
         os.remove('dummy.ical')
 
+
+SAMPLE_ICAL = """BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//inkycal//test//EN
+BEGIN:VEVENT
+UID:weekly@inkycal
+DTSTART:20240101T090000Z
+DTEND:20240101T100000Z
+RRULE:FREQ=WEEKLY
+SUMMARY:Weekly standup
+END:VEVENT
+BEGIN:VEVENT
+UID:single@inkycal
+DTSTART:20240110T120000Z
+DTEND:20240110T130000Z
+SUMMARY:Lunch
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+class TestIcalendarCache(unittest.TestCase):
+
+    def setUp(self):
+        ical_parser._parsed_calendars.clear()
+        ical_parser._expanded_windows.clear()
+        ical_parser._window_locks.clear()
+        ical_parser.event_store.clear()
+
+    def _events(self, start, end):
+        parser = iCalendar()
+        parser.icalendars.append(parser._add(SAMPLE_ICAL))
+        return parser.get_events(start, end, 'UTC')
+
+    def test_unchanged_data_is_parsed_once(self):
+        first = ical_parser.parse_ical(SAMPLE_ICAL)
+        second = ical_parser.parse_ical(SAMPLE_ICAL.encode())
+        self.assertIs(first[1], second[1])
+        self.assertNotEqual(first[0], ical_parser.parse_ical(SAMPLE_ICAL.replace("Lunch", "Dinner"))[0])
+
+    def test_cached_events_match_full_expansion(self):
+        start, end = arrow.get('2024-01-01T00:00:00Z'), arrow.get('2024-01-31T00:00:00Z')
+        ical = ical_parser.parse_ical(SAMPLE_ICAL)[1]
+        expected = sorted((e['begin'], e['title']) for _, e in ical_parser._expand(ical, start, end, 'UTC'))
+
+        self.assertEqual(sorted((e['begin'], e['title']) for e in self._events(start, end)), expected)
+        # served from the cached window
+        self.assertEqual(sorted((e['begin'], e['title']) for e in self._events(start, end)), expected)
+        self.assertEqual(len(expected), 6)
+
+    def test_sliding_window_expands_incrementally(self):
+        start = arrow.get('2024-01-01T00:00:00Z')
+        expanded = []
+        original = ical_parser._expand
+
+        def spy(ical, t_start, t_end, timezone):
+            expanded.append((t_start, t_end))
+            return original(ical, t_start, t_end, timezone)
+
+        with patch.object(ical_parser, '_expand', side_effect=spy):
+            self._events(start, start.shift(weeks=4))
+            self._events(start, start.shift(weeks=4))
+            events = self._events(start.shift(days=1), start.shift(weeks=4, days=1))
+
+        self.assertEqual(expanded, [(start, start.shift(weeks=4)),
+                                    (start.shift(weeks=4), start.shift(weeks=4, days=1))])
+        # the standup of Jan 1st lies before the new window
+        self.assertEqual([e['title'] for e in events].count('Weekly standup'), 4)
+
+    def test_unrelated_calendars_expand_concurrently(self):
+        start = arrow.get('2024-01-01T00:00:00Z')
+        both_expanding = threading.Barrier(2, timeout=5)
+        original = ical_parser._expand
+
+        def expand(ical, t_start, t_end, timezone):
+            # fails with BrokenBarrierError if the expansions are serialized
+            both_expanding.wait()
+            return original(ical, t_start, t_end, timezone)
+
+        calendars = [ical_parser.parse_ical(SAMPLE_ICAL), ical_parser.parse_ical(SAMPLE_ICAL.replace('Lunch', 'Dinner'))]
+        with patch.object(ical_parser, '_expand', side_effect=expand):
+            with ThreadPoolExecutor(2) as pool:
+                results = list(pool.map(lambda entry: ical_parser._expand_cached(
+                    *entry, start, start.shift(weeks=1), 'UTC'), calendars))
+        self.assertEqual([len(events) for events in results], [1, 1])
+
+    def test_window_lock_outlives_cache_size(self):
+        start, end = arrow.get('2024-01-01T00:00:00Z'), arrow.get('2024-01-08T00:00:00Z')
+        ical_hash, ical = ical_parser.parse_ical(SAMPLE_ICAL)
+        expanding, release = threading.Event(), threading.Event()
+        expanded = []
+        original = ical_parser._expand
+
+        def expand(ical, t_start, t_end, timezone):
+            expanded.append(timezone)
+            if timezone == 'UTC':
+                expanding.set()
+                release.wait(5)
+            return original(ical, t_start, t_end, timezone)
+
+        with patch.object(ical_parser, '_expand', side_effect=expand), ThreadPoolExecutor(2) as pool:
+            first = pool.submit(ical_parser._expand_cached, ical_hash, ical, start, end, 'UTC')
+            self.assertTrue(expanding.wait(5))
+            # more windows than the caches hold are used while the first one is expanding
+            timezones = [f'Etc/GMT+{hours}' for hours in range(1, 13)] + [f'Etc/GMT-{hours}' for hours in range(1, 15)]
+            for timezone in timezones[:ical_parser.CACHE_SIZE + 4]:
+                ical_parser._expand_cached(ical_hash, ical, start, end, timezone)
+            second = pool.submit(ical_parser._expand_cached, ical_hash, ical, start, end, 'UTC')
+            release.set()
+            self.assertEqual(len(first.result(5)), len(second.result(5)))
+
+        # the second request waited for the first one and reused its window
+        self.assertEqual(expanded.count('UTC'), 1)
+
+    def test_event_store_fetches_shared_url_once(self):
+        response = MagicMock(text=SAMPLE_ICAL)
+        start = arrow.get('2024-01-01T00:00:00Z')
+        with patch.object(ical_parser.http_client, 'get_cached', return_value=response) as get_cached:
+            agenda, calendar = iCalendar(), iCalendar()
+            agenda.load_url('https://example.org/work.ics')
+            calendar.load_url(['https://example.org/work.ics'])
+            self.assertIs(agenda.icalendars[0], calendar.icalendars[0])
+            self.assertEqual(len(agenda.get_events(start, start.shift(weeks=1), 'UTC')), 1)
+            self.assertEqual(len(calendar.get_events(start, start.shift(weeks=2), 'UTC')), 3)
+        get_cached.assert_called_once_with('https://example.org/work.ics', auth=None)
+
+    def test_event_store_reloads_modified_file(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'calendar.ics')
+            with open(path, 'w') as file:
+                file.write(SAMPLE_ICAL)
+            first = ical_parser.event_store.load_file(path)
+            self.assertIs(ical_parser.event_store.load_file(path)[1], first[1])
+
+            with open(path, 'w') as file:
+                file.write(SAMPLE_ICAL.replace('Lunch', 'Dinner'))
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10 ** 9))
+            self.assertNotEqual(ical_parser.event_store.load_file(path)[0], first[0])
+
+    def test_event_store_keeps_one_entry_per_file(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'calendar.ics')
+            with open(path, 'w') as file:
+                file.write(SAMPLE_ICAL)
+            for edit in range(5):
+                os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10 ** 9))
+                ical_parser.event_store.load_file(path)
+            # every edit replaces the entry of the file instead of adding one
+            self.assertEqual(len(ical_parser.event_store._sources), 1)
+            self.assertEqual(len(ical_parser.event_store._locks), 1)
@@ -2,7 +2,12 @@
 inkycal_agenda unittest
 """
 import logging
+import os
+import tempfile
 import unittest
+from unittest.mock import patch
+
+import arrow
 
 from inkycal.modules.inkycal_agenda import Agenda as Module
 from inkycal.utils.inky_image import Inkyimage
@@ -136,6 +141,34 @@ class TestAgenda(unittest.TestCase):
             if Config.USE_PREVIEW:
                 merge(im_black, im_colour).show()
 
+    def test_input_fingerprint(self):
+        """The fingerprint only changes with the events and generate_image() reuses the fetched events"""
+        today = arrow.now().floor('day')
+
+        def write_calendar(path, summary):
+            with open(path, mode="w", encoding="utf-8") as file:
+                file.write("\r\n".join([
+                    "BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//Inkycal//Test//EN", "BEGIN:VEVENT",
+                    "UID:fingerprint@inkycal.test", f"DTSTART:{today.shift(hours=10):YYYYMMDDTHHmmss}",
+                    f"DTEND:{today.shift(hours=11):YYYYMMDDTHHmmss}", f"SUMMARY:{summary}",
+                    "END:VEVENT", "END:VCALENDAR", ""]))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "calendar.ics")
+            write_calendar(path, "Dentist")
+            module = Module({"name": "Agenda", "config": {**tests[0]["config"], "ical_urls": None,
+                                                          "ical_files": path}})
+
+            with patch.object(module, "_load_events", wraps=module._load_events) as load_events:
+                fingerprint = module.input_fingerprint()
+                module.generate_image()
+                self.assertEqual(load_events.call_count, 1)
+
+            self.assertEqual(module.input_fingerprint(), fingerprint)
+            write_calendar(path, "Dentist (moved)")
+            os.utime(path, ns=(0, 0))  # the event store reloads files whose modification time changed
+            self.assertNotEqual(module.input_fingerprint(), fingerprint)
+
     def test_invalid_columns(self):
         for test in invalid_tests:
             logger.info(f'Testing invalid columns: {test["config"]["columns"]}')
@@ -59,3 +59,43 @@ def test_install_wiringpi_runs_clone_and_build(monkeypatch):
     assert run_calls[1][1]["use_sudo"] is True
     assert run_calls[1][1]["cwd"].name == "WiringPi"
     assert saved_state == [("wiringpi", "ok")]
+
+
+def test_build_spi_bulk_helper_compiles_next_to_vendor_library(monkeypatch):
+    ctx = installer.detect_context(Path(__file__).resolve().parent.parent)
+    run_calls = []
+    saved_state = []
+
+    def fake_run_command(command, **kwargs):
+        run_calls.append((command, kwargs))
+        return SimpleNamespace(stdout="", stderr="")
+
+    monkeypatch.setattr(installer.sys, "platform", "linux")
+    monkeypatch.setattr(installer, "run_command", fake_run_command)
+    monkeypatch.setattr(installer, "save_state", lambda _ctx, key, value: saved_state.append((key, value)))
+
+    installer.build_spi_bulk_helper(ctx)
+
+    command, kwargs = run_calls[0]
+    assert command[0] == "gcc"
+    assert command[-3:] == ["-o", "epd_12_in_48_bulk.so", "epd_12_in_48_bulk.c"]
+    assert (kwargs["cwd"] / installer.SPI_BULK_SOURCE).exists()
+    assert (kwargs["cwd"] / "epd_12_in_48_lib_64bit.so").exists()
+    assert saved_state == [("spi_bulk_helper", "ok")]
+
+
+def test_build_spi_bulk_helper_failure_does_not_stop_install(monkeypatch, capsys):
+    ctx = installer.detect_context(Path(__file__).resolve().parent.parent)
+    saved_state = []
+
+    def failing_run_command(command, **kwargs):
+        raise FileNotFoundError("gcc")
+
+    monkeypatch.setattr(installer.sys, "platform", "linux")
+    monkeypatch.setattr(installer, "run_command", failing_run_command)
+    monkeypatch.setattr(installer, "save_state", lambda _ctx, key, value: saved_state.append((key, value)))
+
+    installer.build_spi_bulk_helper(ctx)
+
+    assert "SPI helper build failed" in capsys.readouterr().out
+    assert saved_state == []
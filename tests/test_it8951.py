@@ -0,0 +1,223 @@
+"""
+Tests for the resident IT8951 render service, using the hardware-free stub
+"""
+import os
+import time
+import unittest
+import zlib
+from unittest import mock
+
+from PIL import Image, ImageDraw
+
+from inkycal.display import it8951
+from inkycal.display.it8951 import (
+    RenderService, ParallelEPD, native_levels, pack_frame, plan_update, stub_command
+)
+from inkycal.utils.inkycal_exceptions import RenderServiceError
+
+WIDTH, HEIGHT = 1872, 1404
+
+
+def portrait_frame():
+    im = Image.new("RGB", (HEIGHT, WIDTH), "white")
+    draw = ImageDraw.Draw(im)
+    draw.rectangle((10, 10, 400, 120), fill="black")
+    draw.rectangle((10, 500, 1000, 900), fill=(128, 128, 128))
+    return im
+
+
+class TestPackFrame(unittest.TestCase):
+
+    def test_matches_rotated_bmp(self):
+        im = portrait_frame()
+        frame = pack_frame(im, WIDTH, HEIGHT)
+        self.assertEqual(len(frame.data), WIDTH * HEIGHT // 2)
+        self.assertEqual((frame.x, frame.y, frame.width, frame.height), (0, 0, WIDTH, HEIGHT))
+        levels = native_levels(im, WIDTH, HEIGHT)
+        legacy = im.rotate(90, expand=True).convert("L")
+        self.assertEqual(levels.shape, (HEIGHT, WIDTH))
+        self.assertEqual(levels[HEIGHT - 15, 15], legacy.getpixel((15, HEIGHT - 15)) >> 4)
+
+    def test_mirror(self):
+        im = portrait_frame()
+        plain, mirrored = native_levels(im, WIDTH, HEIGHT), native_levels(im, WIDTH, HEIGHT, mirror=True)
+        self.assertEqual(mirrored.tobytes(), plain[:, ::-1].tobytes())
+
+    def test_wrong_size(self):
+        with self.assertRaises(ValueError):
+            pack_frame(Image.new("RGB", (10, 10)), WIDTH, HEIGHT)
+
+
+class TestPlanUpdate(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = native_levels(portrait_frame(), WIDTH, HEIGHT)
+
+    def changed(self, draw_on):
+        im = portrait_frame()
+        draw = ImageDraw.Draw(im)
+        draw.fontmode = "1"
+        draw_on(draw)
+        return native_levels(im, WIDTH, HEIGHT)
+
+    def test_first_frame_is_full_gc16(self):
+        frames = plan_update(None, self.previous)
+        self.assertEqual([(f.width, f.height, f.bpp, f.mode) for f in frames], [(WIDTH, HEIGHT, 4, it8951.GC16_MODE)])
+
+    def test_identical_frame_sends_nothing(self):
+        self.assertEqual(plan_update(self.previous, self.previous.copy()), [])
+
+    def test_text_delta_uses_a2(self):
+        levels = self.changed(lambda draw: draw.text((20, 1500), "Meeting at 10:00", fill="black"))
+        frames = plan_update(self.previous, levels)
+        self.assertTrue(frames)
+        self.assertEqual({(f.bpp, f.mode) for f in frames}, {(1, it8951.A2_MODE)})
+        self.assertLess(sum(len(f.data) for f in frames), 10_000)
+
+    def test_grey_delta_uses_gc16(self):
+        levels = self.changed(lambda draw: draw.rectangle((20, 1500, 300, 1600), fill=(90, 90, 90)))
+        frames = plan_update(self.previous, levels)
+        self.assertEqual({(f.bpp, f.mode) for f in frames}, {(4, it8951.GC16_MODE)})
+
+    def test_black_over_grey_uses_du(self):
+        levels = self.changed(lambda draw: draw.rectangle((20, 510, 300, 600), fill="black"))
+        frames = plan_update(self.previous, levels)
+        self.assertEqual({(f.bpp, f.mode) for f in frames}, {(4, it8951.DU_MODE)})
+
+    def test_large_change_is_full_frame(self):
+        levels = self.changed(lambda draw: draw.rectangle((0, 0, HEIGHT, WIDTH), fill="black"))
+        frames = plan_update(self.previous, levels)
+        self.assertEqual([(f.width, f.height, f.mode) for f in frames], [(WIDTH, HEIGHT, it8951.GC16_MODE)])
+
+    def test_windows_are_aligned(self):
+        levels = self.changed(lambda draw: draw.text((33, 1217), "x", fill="black"))
+        for frame in plan_update(self.previous, levels):
+            self.assertEqual(frame.x % 16, 0)
+            self.assertEqual(frame.width % 16, 0)
+
+
+class TestRenderService(unittest.TestCase):
+
+    def setUp(self):
+        self.service = RenderService(stub_command(WIDTH, HEIGHT), timeout=10)
+
+    def tearDown(self):
+        self.service.close()
+
+    def test_start_reports_panel_size(self):
+        self.assertEqual(self.service.start(), (WIDTH, HEIGHT))
+        self.assertTrue(self.service.running)
+
+    def test_draw_transfers_frame(self):
+        frame = pack_frame(portrait_frame(), WIDTH, HEIGHT)
+        reply = self.service.draw(frame).split()
+        self.assertEqual(reply[0], "OK")
+        self.assertEqual(reply[1], f"{zlib.crc32(frame.data):08x}")
+
+    def test_service_stays_resident(self):
+        frame = pack_frame(portrait_frame(), WIDTH, HEIGHT)
+        self.service.start()
+        pid = self.service._process.pid
+        start = time.perf_counter()
+        for _ in range(10):
+            self.service.draw(frame)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(self.service._process.pid, pid)
+        self.assertEqual(self.service.frames, 10)
+        self.assertEqual(self.service.bytes_sent, 10 * len(frame.data))
+        print(f"stub throughput: {10 / elapsed:.1f} frames/s")
+
+    def test_window_outside_panel(self):
+        frame = it8951.Frame(bytes(8), WIDTH - 4, 0, 16, 1, 4, it8951.GC16_MODE)
+        with self.assertRaises(RenderServiceError):
+            self.service.draw(frame)
+
+    def test_unaligned_window(self):
+        frame = it8951.Frame(bytes(2), 8, 0, 8, 1, 1, it8951.A2_MODE)
+        with self.assertRaises(RenderServiceError):
+            self.service.draw(frame)
+
+    def test_restarts_after_crash(self):
+        frame = pack_frame(portrait_frame(), WIDTH, HEIGHT)
+        self.service.draw(frame)
+        self.service._process.kill()
+        self.service._process.wait()
+        self.assertTrue(self.service.draw(frame).startswith("OK"))
+
+    def test_close_releases_shared_memory(self):
+        self.service.draw(pack_frame(portrait_frame(), WIDTH, HEIGHT))
+        name = self.service._shm.name
+        self.service.close()
+        self.assertFalse(self.service.running)
+        self.assertFalse(os.path.exists(os.path.join(it8951.SHM_DIR, name)))
+
+    def test_missing_binary(self):
+        service = RenderService(["/nonexistent/epd", "--serve"])
+        with self.assertRaises(RenderServiceError):
+            service.start()
+
+
+class TestParallelEPD(unittest.TestCase):
+
+    class Driver(ParallelEPD):
+        width, height = WIDTH, HEIGHT
+
+    def driver(self):
+        epd = self.Driver()
+        epd.service = RenderService(stub_command(WIDTH, HEIGHT), timeout=10)
+        self.addCleanup(epd.service.close)
+        return epd
+
+    def test_display_uses_service(self):
+        epd = self.driver()
+        epd.display(epd.getbuffer(portrait_frame()))
+        epd.sleep()
+        self.assertEqual(epd.service.frames, 1)
+        self.assertFalse(epd.service_failed)
+
+    def test_region_update_moves_kilobytes(self):
+        epd = self.driver()
+        epd.display(epd.getbuffer(portrait_frame()))
+        full = epd.service.bytes_sent
+
+        im = portrait_frame()
+        draw = ImageDraw.Draw(im)
+        draw.fontmode = "1"
+        draw.text((20, 1500), "Dentist 14:30", fill="black")
+        epd.display(epd.getbuffer(im))
+        self.assertLess(epd.service.bytes_sent - full, 10_000)
+        self.assertEqual(full, WIDTH * HEIGHT // 2)
+
+    def test_full_refresh_interval(self):
+        epd = self.driver()
+        epd.full_refresh_interval = 2
+        for number in range(4):
+            im = portrait_frame()
+            ImageDraw.Draw(im).text((20, 1500), str(number), fill="black")
+            epd.display(epd.getbuffer(im))
+        # full, region, region, full
+        self.assertEqual(epd.service.bytes_sent // (WIDTH * HEIGHT // 2), 2)
+
+    def test_full_refresh_after_restart(self):
+        epd = self.driver()
+        epd.display(epd.getbuffer(portrait_frame()))
+        epd.service._process.kill()
+        epd.service._process.wait()
+        epd.display(epd.getbuffer(portrait_frame()))
+        self.assertEqual(epd.service.bytes_sent, 2 * WIDTH * HEIGHT // 2)
+
+    def test_falls_back_to_bmp(self):
+        epd = self.Driver()
+        epd.service = RenderService(["/nonexistent/epd", "--serve"])
+        with mock.patch.object(it8951.subprocess, "run") as run, \
+                mock.patch.object(Image.Image, "save") as save:
+            epd.display(epd.getbuffer(portrait_frame()))
+            epd.display(epd.getbuffer(portrait_frame()))
+        self.assertTrue(epd.service_failed)
+        self.assertEqual(run.call_count, 2)
+        self.assertEqual(save.call_count, 2)
+        self.assertTrue(run.call_args[0][0][-1].endswith("canvas.bmp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,35 @@
 """
 Test main module
 """
+import asyncio
+import os
+import threading
+import time
 import unittest
+from unittest.mock import patch
+
+from PIL import Image
 
 from inkycal.main import Inkycal
+from inkycal.settings import Settings
+from inkycal.utils.metrics import CycleMetrics
 from tests import Config
 
+settings = Settings()
+
+
+class StubModule:
+    """Module that returns a solid image after a delay."""
+    name = "Stub"
+
+    def __init__(self, colour, delay=0.0):
+        self.colour = colour
+        self.delay = delay
+
+    def generate_image(self):
+        time.sleep(self.delay)
+        return Image.new("RGB", (10, 10), self.colour), Image.new("RGB", (10, 10), "white")
+
 
 class TestMain(unittest.TestCase):
 
@@ -25,6 +49,181 @@ class TestMain(unittest.TestCase):
         inkycal = Inkycal(self.settings_path, render=False)
         inkycal.dry_run()
 
+    def test_assemble_in_memory(self):
+        inkycal = Inkycal(self.settings_path, render=False)
+        inkycal.write_debug_images = False
+        inkycal.info = ""
+        canvas_path = os.path.join(settings.IMAGE_FOLDER, "canvas.png")
+        if os.path.exists(canvas_path):
+            os.remove(canvas_path)
+
+        inkycal._module_images = {1: (Image.new("RGB", (528, 80), "black"), Image.new("RGB", (528, 80), "white"))}
+        inkycal._assemble()
+
+        assert inkycal._canvas_black.getpixel((264, 40)) == (0, 0, 0)
+        assert inkycal._merge_bands().size == inkycal._canvas_black.size
+        assert not os.path.exists(canvas_path)
+
+        # debug images are written in the background
+        inkycal.write_debug_images = True
+        inkycal._assemble()
+        inkycal._image_sink.flush()
+        assert os.path.exists(canvas_path)
+
+    def test_optimized_planes(self):
+        inkycal = Inkycal(self.settings_path, render=False)
+        inkycal.write_debug_images = False
+        inkycal.info = ""
+
+        black = Image.new("RGB", (528, 80), "white")
+        black.paste((200, 200, 200), (0, 0, 10, 10))  # grey -> black
+        black.paste((230, 230, 230), (10, 0, 20, 10))  # light grey -> white
+        colour = Image.new("RGB", (528, 80), "white")
+        colour.paste((0, 0, 0), (20, 0, 30, 10))
+        inkycal._module_images = {1: (black, colour)}
+
+        with patch.object(Inkycal, "_preview") as preview:
+            inkycal._assemble()
+        # nothing consumes the preview without debug images
+        preview.assert_not_called()
+
+        canvas = inkycal._canvas_black
+        assert set(canvas.getdata()) == {(0, 0, 0), (255, 255, 255)}
+        assert canvas.getpixel((5, 5)) == (0, 0, 0)
+        assert canvas.getpixel((15, 5)) == (255, 255, 255)
+        assert inkycal._canvas_colour.getpixel((25, 5)) == (0, 0, 0)
+
+        # black-white displays show the coloured layer in black
+        merged = inkycal._merge_bands()
+        assert [merged.getpixel((x, 5)) for x in (5, 15, 25)] == [(0, 0, 0), (255, 255, 255), (0, 0, 0)]
+
+        preview = Inkycal._preview(canvas, inkycal._canvas_colour, inkycal._planes)
+        assert [preview.getpixel((x, 5)) for x in (5, 15, 25)] == [(0, 0, 0), (255, 255, 255), (255, 0, 0)]
+
+    def test_process_modules_concurrently(self):
+        inkycal = Inkycal(self.settings_path, render=False)
+        inkycal.show_border = False
+        inkycal.module_timeout = 1
+        inkycal._module_number = 4
+        inkycal.module_1 = StubModule("black", delay=0.3)
+        inkycal.module_2 = StubModule("red")
+        inkycal.module_3 = StubModule("blue", delay=0.3)
+
+        start = time.monotonic()
+        assert inkycal.process_modules() == []
+        # modules ran at the same time, not one after the other
+        assert time.monotonic() - start < 0.55
+        assert [inkycal._module_images[n][0].getpixel((0, 0)) for n in (1, 2, 3)] == \
+               [(0, 0, 0), (255, 0, 0), (0, 0, 255)]
+
+        # a module missing its deadline keeps its last good image
+        inkycal.module_timeout = 0.1
+        inkycal.module_1.delay = inkycal.module_3.delay = 0
+        inkycal.module_2 = StubModule("green", delay=0.5)
+        assert inkycal.process_modules() == [2]
+        assert inkycal._module_images[2][0].getpixel((0, 0)) == (255, 0, 0)
+
+    def test_module_memo(self):
+        inkycal = Inkycal(self.settings_path, render=False)
+        inkycal.show_border = False
+        inkycal._module_number = 3
+        inkycal.module_1 = StubModule("black")
+        inkycal.module_2 = StubModule("red")
+        inkycal.module_2.input_fingerprint = lambda: inkycal.module_2.colour
+
+        assert inkycal.process_modules() == []
+        first = inkycal._module_images[2]
+        assert inkycal._metrics.modules["2"]["memo"] == "miss"
+        assert "memo" not in inkycal._metrics.modules["1"]
+
+        # unchanged inputs reuse the images
+        images = StubModule("black").generate_image()
+        with patch.object(StubModule, "generate_image", return_value=images) as generate_image:
+            assert inkycal.process_modules() == []
+        # only module 1 without a fingerprint was generated again
+        generate_image.assert_called_once()
+        assert inkycal._module_images[2][0] is first[0]
+        assert inkycal._metrics.modules["2"]["memo"] == "hit"
+
+        inkycal.module_2.colour = "blue"
+        assert inkycal.process_modules() == []
+        assert inkycal._module_images[2][0].getpixel((0, 0)) == (0, 0, 255)
+        assert inkycal._metrics.modules["2"]["memo"] == "miss"
+
+    def test_render_in_background(self):
+        inkycal = Inkycal(self.settings_path, render=True)
+        inkycal.write_debug_images = False
+        inkycal._module_number = 2
+        inkycal.module_1 = StubModule("black")
+        inkycal.info = ""
+        inkycal.process_modules()
+        inkycal._assemble()
+
+        started, release = threading.Event(), threading.Event()
+        rendered = []
+
+        regions = inkycal._module_regions()
+
+        def render_black(im_black, job_regions):
+            started.set()
+            release.wait(5)
+            # regions come with the frame, the worker does not read the canvas of the next cycle
+            assert job_regions == regions
+            rendered.append(im_black)
+
+        with patch.object(inkycal, "_calibration_check"), patch.object(inkycal, "_render_black", render_black), \
+                patch.object(inkycal._metrics_log, "append") as append:
+            # queueing the frames of a cycle does not wait for the display
+            metrics = [CycleMetrics() for _ in range(3)]
+            first = inkycal._submit_render(inkycal._display_frames(), metrics[0])
+            assert started.wait(5)
+            second, third = (inkycal._submit_render(inkycal._display_frames(), cycle) for cycle in metrics[1:])
+            assert second.cancelled() and not first.done()
+
+            # run_once waits until its own frame is on the display
+            with patch.object(inkycal, "process_modules", return_value=[]):
+                release.set()
+                asyncio.run(inkycal.run(run_once=True))
+
+        assert first.done() and third.done() and inkycal._render_future.done()
+        # the first, the third and the frame of run_once
+        assert len(rendered) == 3
+        assert [cycle.extra["render"] for cycle in metrics] == ["done", "superseded", "done"]
+        assert metrics[2].extra["render"] == "done"
+        assert append.call_count == 4
+
+    def test_render_error_survives_newer_frame(self):
+        inkycal = Inkycal(self.settings_path, render=True)
+        inkycal.write_debug_images = False
+        inkycal._module_number = 2
+        inkycal.module_1 = StubModule("black")
+        inkycal.info = ""
+        inkycal.process_modules()
+        inkycal._assemble()
+
+        started, release = threading.Event(), threading.Event()
+
+        def render_black(im_black, job_regions):
+            if not started.is_set():
+                started.set()
+                release.wait(5)
+                raise OSError("SPI gone")
+
+        with patch.object(inkycal, "_calibration_check"), patch.object(inkycal, "_render_black", render_black), \
+                patch.object(inkycal._metrics_log, "append"), self.assertLogs("inkycal.display.render_worker", "ERROR"):
+            inkycal._render_future = inkycal._submit_render(inkycal._display_frames(), CycleMetrics())
+            assert started.wait(5)
+            # the next cycle submits a frame while the failing one is still rendering
+            inkycal._raise_render_error()
+            inkycal._render_future = inkycal._submit_render(inkycal._display_frames(), CycleMetrics())
+            release.set()
+            assert inkycal._render_future.result(5) is None
+
+        # the failure of the replaced future still stops Inkycal, once
+        with self.assertRaises(OSError):
+            inkycal._raise_render_error()
+        inkycal._raise_render_error()
+
     def test_countdown(self):
         inkycal = Inkycal(self.settings_path, render=False)
 
@@ -0,0 +1,129 @@
+"""
+Tests for the cycle metrics and the /api/metrics endpoint
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import urllib.request
+from http.server import ThreadingHTTPServer
+from unittest.mock import patch
+
+from PIL import Image
+
+from inkycal import webui
+from inkycal.display import Display
+from inkycal.display.drivers import epdconfig
+from inkycal.utils import metrics
+from inkycal.utils.metrics import CycleMetrics, MetricsLog, summarize, timed_fetch
+
+
+class TestCycleMetrics(unittest.TestCase):
+
+    def test_phases_accumulate(self):
+        cycle = CycleMetrics()
+        with cycle.phase("assemble"):
+            time.sleep(0.01)
+        cycle.add("assemble", 1.0)
+        self.assertGreaterEqual(cycle.as_dict()["phases"]["assemble"], 1.01)
+
+    def test_module_fetch_and_render(self):
+        cycle = CycleMetrics()
+        with cycle.module(1, "Agenda"):
+            with timed_fetch():
+                time.sleep(0.02)
+            time.sleep(0.01)
+        record = cycle.as_dict()["modules"]["1"]
+        self.assertEqual(record["name"], "Agenda")
+        self.assertGreaterEqual(record["fetch"], 0.02)
+        self.assertGreaterEqual(record["render"], 0.01)
+        self.assertAlmostEqual(record["fetch"] + record["render"], record["total"], places=4)
+        self.assertIn("rss_delta", record)
+
+    def test_fetch_outside_module_is_ignored(self):
+        # e.g. requests made by the main thread
+        with timed_fetch():
+            pass
+
+    def test_modules_in_threads(self):
+        cycle = CycleMetrics()
+
+        def generate(number):
+            with cycle.module(number, f"module{number}"):
+                with timed_fetch():
+                    time.sleep(0.01 * number)
+
+        threads = [threading.Thread(target=generate, args=(number,)) for number in (1, 2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        modules = cycle.as_dict()["modules"]
+        self.assertGreaterEqual(modules["2"]["fetch"], 0.02)
+        self.assertLess(modules["1"]["fetch"], modules["2"]["fetch"])
+
+    def test_peak_rss(self):
+        self.assertGreater(CycleMetrics().as_dict()["peak_rss"], 0)
+
+
+class TestMetricsLog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "metrics.jsonl")
+
+    def test_rolling_file(self):
+        log = MetricsLog(self.path, max_records=10)
+        for index in range(30):
+            cycle = CycleMetrics()
+            cycle.add("assemble", index)
+            log.append(cycle)
+        with open(self.path) as file:
+            self.assertLessEqual(len(file.readlines()), 11)
+        records = log.read()
+        self.assertEqual(records[-1]["phases"]["assemble"], 29)
+        self.assertEqual([record["phases"]["assemble"] for record in log.read(2)], [28, 29])
+
+    def test_read_missing_file(self):
+        self.assertEqual(MetricsLog(self.path).read(), [])
+
+    def test_summarize(self):
+        records = [{"phases": {"spi": 1.0}, "peak_rss": 10}, {"phases": {"spi": 3.0}, "peak_rss": 30}]
+        self.assertEqual(summarize(records), {"cycles": 2, "phases": {"spi": 2.0}, "peak_rss": 30})
+        self.assertEqual(summarize([])["cycles"], 0)
+
+    def test_api_endpoint(self):
+        log = MetricsLog(self.path)
+        for _ in range(3):
+            log.append(CycleMetrics())
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), webui.InkycalWebUiHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        with patch.object(metrics, "METRICS_FILE", self.path):
+            url = f"http://127.0.0.1:{server.server_port}/api/metrics?limit=2"
+            with urllib.request.urlopen(url) as response:
+                payload = json.load(response)
+        self.assertEqual(len(payload["records"]), 2)
+        self.assertEqual(payload["summary"]["cycles"], 2)
+
+
+class TestDisplayTimings(unittest.TestCase):
+
+    def test_render_timings(self):
+        self.addCleanup(epdconfig.use_implementation, epdconfig.implementation)
+        epdconfig.use_implementation(epdconfig.FakeBackend())
+        display = Display("epd_7_in_5_v2")
+        display.render(Image.new("RGB", (480, 800), "white"))
+        for phase in ("getbuffer", "init", "display", "sleep", "busy", "spi"):
+            self.assertIn(phase, display.timings)
+        self.assertLessEqual(display.timings["spi"], display.timings["display"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tests for the partial (region) refresh pipeline
+"""
+import unittest
+
+from PIL import Image, ImageDraw
+
+from inkycal.display import Display
+from inkycal.display.drivers import epdconfig
+from inkycal.display.framebuffer import native_box
+from inkycal.main import Inkycal
+
+
+class TestPartialRefresh(unittest.TestCase):
+
+    def test_native_box_landscape(self):
+        self.assertEqual(native_box((3, 10, 20, 50), (800, 480), 800, 480), (0, 10, 24, 50))
+
+    def test_native_box_portrait(self):
+        # A horizontal band of a portrait frame is a vertical strip on the panel
+        self.assertEqual(native_box((0, 100, 480, 180), (480, 800), 800, 480), (96, 0, 184, 480))
+
+    def test_native_box_wrong_size(self):
+        with self.assertRaises(ValueError):
+            native_box((0, 0, 1, 1), (10, 10), 800, 480)
+
+    def test_dirty_box(self):
+        regions = [(0, 0, 480, 100), (0, 100, 480, 400), (0, 400, 480, 800)]
+        previous = Image.new("RGB", (480, 800), "white")
+        current = previous.copy()
+        self.assertIsNone(Inkycal._dirty_box(previous, current, regions))
+
+        ImageDraw.Draw(current).rectangle((10, 120, 40, 130), fill="black")
+        self.assertEqual(Inkycal._dirty_box(previous, current, regions), (0, 100, 480, 400))
+
+        ImageDraw.Draw(current).rectangle((10, 20, 40, 30), fill="black")
+        self.assertEqual(Inkycal._dirty_box(previous, current, regions), (0, 0, 480, 400))
+
+        # Changes outside of all known regions force a full refresh
+        self.assertEqual(Inkycal._dirty_box(previous, current, regions[2:]), (0, 0, 480, 800))
+
+    def test_render_region_sends_window_only(self):
+        backend = epdconfig.FakeBackend()
+        self.addCleanup(epdconfig.use_implementation, epdconfig.implementation)
+        epdconfig.use_implementation(backend)
+        display = Display("epd_7_in_5_v2")
+        self.assertTrue(display.supports_partial_refresh)
+
+        im = Image.new("RGB", (480, 800), "white")
+        display.render_region(im, (0, 100, 480, 180))
+
+        window = (180 - 100) * 480 // 8
+        self.assertGreaterEqual(backend.bytes_written, window)
+        self.assertLess(backend.bytes_written, 800 * 480 // 8)
+        self.assertIn("display", display.busy_times())
+
+    def test_render_region_unsupported(self):
+        self.addCleanup(epdconfig.use_implementation, epdconfig.implementation)
+        epdconfig.use_implementation(epdconfig.FakeBackend())
+        display = Display("epd_7_in_5_v3")
+        with self.assertRaises(Exception):
+            display.render_region(Image.new("RGB", (528, 880), "white"), (0, 0, 10, 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
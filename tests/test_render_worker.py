@@ -0,0 +1,72 @@
+"""
+Tests for the background render worker
+"""
+import threading
+import unittest
+
+from inkycal.display.render_worker import RenderWorker
+
+
+class TestRenderWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.worker = RenderWorker(name="test-render")
+        self.addCleanup(self.worker.close)
+
+    def _blocking_job(self):
+        """A job which runs until released, like a panel waiting on BUSY"""
+        started, release = threading.Event(), threading.Event()
+
+        def job():
+            started.set()
+            release.wait(5)
+            return "first"
+
+        return job, started, release
+
+    def test_newer_frame_supersedes_waiting_frame(self):
+        job, started, release = self._blocking_job()
+        rendered = []
+
+        first = self.worker.submit(job)
+        self.assertTrue(started.wait(5))
+        second = self.worker.submit(lambda: rendered.append("second"))
+        third = self.worker.submit(lambda: rendered.append("third"))
+        self.assertFalse(self.worker.idle)
+
+        # the frame being rendered is never interrupted, the waiting one is dropped
+        self.assertTrue(second.cancelled())
+        self.assertFalse(first.done())
+        release.set()
+
+        self.assertTrue(self.worker.wait(5))
+        self.assertTrue(self.worker.idle)
+        self.assertEqual(first.result(), "first")
+        self.assertIsNone(third.result())
+        self.assertEqual(rendered, ["third"])
+
+    def test_errors_are_returned_through_the_future(self):
+        def fail():
+            raise OSError("SPI gone")
+
+        with self.assertLogs("inkycal.display.render_worker", "ERROR"):
+            future = self.worker.submit(fail)
+            self.assertIsInstance(future.exception(5), OSError)
+
+        # the worker keeps running
+        self.assertEqual(self.worker.submit(lambda: 42).result(5), 42)
+
+    def test_wait_timeout_and_close(self):
+        job, started, release = self._blocking_job()
+        self.worker.submit(job)
+        self.assertTrue(started.wait(5))
+        self.assertFalse(self.worker.wait(0.05))
+
+        release.set()
+        self.worker.close()
+        with self.assertRaises(RuntimeError):
+            self.worker.submit(lambda: None)
+
+
+if __name__ == "__main__":
+    unittest.main()
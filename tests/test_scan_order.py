@@ -0,0 +1,103 @@
+"""
+Tests for frames rendered in the displays' native scan order
+"""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from inkycal.display.display import import_driver
+from inkycal.display.supported_models import display_capabilities, is_parallel_display
+from inkycal.main import Inkycal
+from tests import Config
+
+
+def _noise(size, seed):
+    """A frame with black, grey, coloured and white pixels."""
+    rng = np.random.default_rng(seed)
+    palette = np.array([[0, 0, 0], [128, 128, 128], [255, 0, 0], [255, 255, 255]], dtype=np.uint8)
+    return Image.fromarray(palette[rng.integers(0, 4, (size[1], size[0]))])
+
+
+class TestScanOrder(unittest.TestCase):
+
+    def setUp(self):
+        self.inkycal = Inkycal(Config.TEST_SETTINGS_PATH, render=False)
+        self.inkycal.write_debug_images = False
+        self.inkycal.info = "18 Oct @ 09:30"
+        self.inkycal._module_images = {
+            number: (_noise((528, 100), number), _noise((528, 100), 10 + number)) for number in (1, 2, 3)
+        }
+        cwd = os.getcwd()
+        directory = tempfile.TemporaryDirectory()
+        # the image_file drivers write to the working directory
+        os.chdir(directory.name)
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(os.chdir, cwd)
+
+    def _legacy_frames(self, orientation):
+        """The frames run() used to hand over to Display.render()"""
+        inkycal = self.inkycal
+        if inkycal.supports_colour:
+            frames = [inkycal._canvas_black, inkycal._canvas_colour]
+        else:
+            frames = [inkycal._merge_bands()]
+        if orientation == 180:
+            frames = [frame.rotate(180, expand=True) for frame in frames]
+        return frames
+
+    def test_buffers_match_legacy_frames(self):
+        inkycal = self.inkycal
+        for model, capabilities in display_capabilities.items():
+            epd = import_driver(model).EPD()
+            inkycal.settings["model"] = model
+            inkycal.optimize = not is_parallel_display(model)
+            inkycal.supports_colour = capabilities.colour
+            inkycal._assemble()
+
+            for orientation in (0, 180):
+                with self.subTest(model=model, orientation=orientation):
+                    inkycal._scan_turns = Inkycal._native_turns(capabilities, orientation)
+                    frames = inkycal._display_frames()
+                    legacy = self._legacy_frames(orientation)
+                    self.assertEqual(len(frames), len(legacy))
+
+                    for frame, old in zip(frames, legacy):
+                        if capabilities.interface == "file":
+                            self.assertTrue(np.array_equal(np.asarray(frame.convert("1")),
+                                                           np.asarray(old.convert("1"))))
+                            continue
+                        # no transpose left for the driver
+                        self.assertEqual(frame.size, (epd.width, epd.height))
+                        self.assertTrue(np.array_equal(np.asarray(epd.getbuffer(frame)),
+                                                       np.asarray(epd.getbuffer(old))))
+
+    def test_regions_follow_the_scan_order(self):
+        inkycal = self.inkycal
+        capabilities = display_capabilities["epd_7_in_5_v2"]
+        inkycal.settings["model"] = "epd_7_in_5_v2"
+        inkycal.supports_colour = False
+        inkycal._assemble()
+
+        for orientation in (0, 180):
+            with self.subTest(orientation=orientation):
+                inkycal._scan_turns = Inkycal._native_turns(capabilities, orientation)
+                previous, = inkycal._display_frames()
+
+                inkycal._module_images[2] = (_noise((528, 100), 20 + orientation), inkycal._module_images[2][1])
+                inkycal._assemble()
+                current, = inkycal._display_frames()
+
+                box = Inkycal._dirty_box(previous, current, inkycal._module_regions())
+                self.assertIn(box, inkycal._module_regions())
+                changed = np.asarray(previous) != np.asarray(current)
+                left, upper, right, lower = box
+                self.assertTrue(changed[upper:lower, left:right].any())
+                changed[upper:lower, left:right] = False
+                self.assertFalse(changed.any())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Startup-time regression tests: `import inkycal.main` must stay light
+"""
+import os
+import unittest
+
+from inkycal.utils.startup_profile import (
+    HEAVY_IMPORTS, IMPORT_BUDGET, TIME_BUDGET, configured_imports, format_report, parse_importtime,
+    profile_imports, startup_statement
+)
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |       1500 | inkycal.settings
+import time:      1200 |       1200 |   json
+import time:      2000 |       2000 | arrow
+"""
+
+
+class TestStartupProfile(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.profile = profile_imports()
+
+    def test_no_heavy_imports(self):
+        heavy = [name for name in HEAVY_IMPORTS if name in self.profile.modules]
+        self.assertEqual(heavy, [], format_report(self.profile))
+
+    def test_no_unconfigured_modules(self):
+        modules = [name for name in self.profile.modules if name.startswith("inkycal.modules.inkycal_")]
+        self.assertEqual(modules, [])
+
+    def test_import_budget(self):
+        self.assertLessEqual(len(self.profile.records), IMPORT_BUDGET, format_report(self.profile))
+
+    # wall-clock time depends on the machine (CI runs on an emulated Pi), so it is only checked on request
+    @unittest.skipUnless(os.environ.get("INKYCAL_STARTUP_TIMING"), "set INKYCAL_STARTUP_TIMING=1 to check the time budget")
+    def test_time_budget(self):
+        self.assertLessEqual(self.profile.import_seconds, TIME_BUDGET, format_report(self.profile))
+
+    def test_parse_importtime(self):
+        records = parse_importtime(SAMPLE)
+        self.assertEqual([r.name for r in records], ["_io", "inkycal.settings", "json", "arrow"])
+        self.assertEqual([r.depth for r in records], [1, 0, 1, 0])
+        self.assertAlmostEqual(records[1].cumulative_seconds, 0.0015)
+
+    def test_configured_imports(self):
+        settings = {"modules": [{"name": "Calendar"}, {"name": "Unknown"}, {"name": "Stocks"}]}
+        paths = configured_imports(settings)
+        self.assertEqual(paths, ["inkycal.modules.inkycal_calendar", "inkycal.modules.inkycal_stocks"])
+        self.assertEqual(startup_statement(paths[:1]), "import inkycal.main; import inkycal.modules.inkycal_calendar")
+
+    def test_failing_statement(self):
+        with self.assertRaises(RuntimeError):
+            profile_imports("import does_not_exist")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Tests for the display capability registry
+"""
+import inspect
+import unittest
+
+from inkycal.display import Display
+from inkycal.display.display import import_driver
+from inkycal.display.drivers import epdconfig
+from inkycal.display.supported_models import (
+    display_capabilities, get_capabilities, is_parallel_display, supported_models, supports_partial_refresh
+)
+
+
+class TestSupportedModels(unittest.TestCase):
+
+    def test_registry_matches_drivers(self):
+        for model, capabilities in display_capabilities.items():
+            with self.subTest(model=model):
+                driver = import_driver(model)
+                epd = driver.EPD
+                self.assertEqual(supported_models[model], capabilities.resolution)
+                landscape = driver.EPD_WIDTH >= driver.EPD_HEIGHT
+                self.assertEqual(capabilities.native_orientation, "landscape" if landscape else "portrait")
+                if capabilities.interface != "spi":
+                    continue
+
+                display = inspect.signature(epd.display).parameters
+                required = [name for name, parameter in display.items()
+                            if name != "self" and parameter.default is parameter.empty]
+                self.assertEqual(len(required), capabilities.planes)
+                self.assertEqual(capabilities.gray4, hasattr(epd, "getbuffer_4Gray"))
+                if capabilities.partial_refresh:
+                    self.assertTrue(hasattr(epd, "init_part") and hasattr(epd, "display_Partial"))
+
+    def test_lookup_helpers(self):
+        self.assertTrue(get_capabilities("epd5in83b_V2").colour)
+        self.assertFalse(get_capabilities("epd_7_in_5_v3").colour)
+        self.assertTrue(is_parallel_display("10_in_3"))
+        self.assertFalse(is_parallel_display("epd_7_in_5_v2"))
+        self.assertTrue(supports_partial_refresh("epd_7_in_5_v2"))
+        self.assertFalse(supports_partial_refresh("epd_13_in_3"))
+        with self.assertRaises(KeyError):
+            get_capabilities("epd_1_in_0")
+
+    def test_display_uses_capabilities(self):
+        backend = epdconfig.FakeBackend()
+        self.addCleanup(epdconfig.use_implementation, epdconfig.implementation)
+        epdconfig.use_implementation(backend)
+
+        # The colour plane of this panel is not named "colour"
+        display = Display("epd5in83b_V2")
+        self.assertTrue(display.supports_colour)
+        self.assertEqual(backend._spi_hz, get_capabilities("epd5in83b_V2").max_spi_hz)
+        self.assertTrue(Display("epd_4_in_2").supports_4gray)
+
+        with self.assertRaises(Exception):
+            Display("epd_1_in_0")
+
+
+if __name__ == "__main__":
+    unittest.main()